@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_FILE = "data_files/bedrock_cache.sqlite"
+
+
+def cache_key(model_id, prompt, temperature, max_tokens):
+    """Content address of a Bedrock call: sha256 over everything that changes the answer"""
+    payload = json.dumps([model_id, prompt, float(temperature), int(max_tokens)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PromptCache:
+    """On-disk (SQLite) cache of prompt -> response text.
+
+    - `max_entries` / `max_age_days` bound the cache (least recently used rows go first).
+    - `fresh_samples=True` skips lookups for temperature > 0 calls, so sampled generations
+      are always new; deterministic calls (temperature 0) are still served from disk.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_FILE, max_entries=None, max_age_days=None, fresh_samples=False):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.fresh_samples = fresh_samples
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model_id TEXT, response TEXT,"
+            " created_at REAL, last_used_at REAL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used_at)")
+        self.conn.commit()
+        self.evict()
+
+    def get(self, model_id, prompt, temperature, max_tokens):
+        """Return the cached response or None (a bypassed lookup also returns None)"""
+        if self.fresh_samples and temperature > 0:
+            self.bypassed += 1
+            return None
+        key = cache_key(model_id, prompt, temperature, max_tokens)
+        row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (time.time(), key))
+        self.conn.commit()
+        return row[0]
+
+    def put(self, model_id, prompt, temperature, max_tokens, response):
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (cache_key(model_id, prompt, temperature, max_tokens), model_id, response, now, now)
+        )
+        self.conn.commit()
+
+    def delete(self, model_id, prompt, temperature, max_tokens):
+        self.conn.execute("DELETE FROM responses WHERE key = ?", (cache_key(model_id, prompt, temperature, max_tokens),))
+        self.conn.commit()
+
+    def evict(self):
+        """Drop entries older than max_age_days, then the least recently used beyond max_entries"""
+        if self.max_age_days is not None:
+            cutoff = time.time() - self.max_age_days * 86400
+            self.conn.execute("DELETE FROM responses WHERE created_at < ?", (cutoff,))
+        if self.max_entries is not None:
+            self.conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        self.conn.commit()
+
+    def stats(self):
+        size = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self):
+        self.evict()
+        self.conn.close()
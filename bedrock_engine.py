@@ -0,0 +1,225 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bedrock_retry import BedrockCallFailed, RetryPolicy, classify_error
+
+# Placeholder returned by `run` for rows whose call failed (they also go to `on_result` with the error)
+ERROR_MARKER = "ERROR"
+
+
+def estimate_tokens(text):
+    """Cheap token estimate (~4 chars per token) used to reserve TPM budget before a call"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        amount = min(amount, self.capacity)
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def refund(self, amount):
+        """Give back part of a reservation (e.g. when the real token usage was lower)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class AdaptiveConcurrency:
+    """AIMD concurrency limit: halves on throttling, grows by one after a full window of successes"""
+
+    def __init__(self, initial=4, minimum=1, maximum=32):
+        self.limit = max(minimum, min(initial, maximum))
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.successes = 0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, throttled=False):
+        async with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit // 2)
+                self.successes = 0
+            else:
+                self.successes += 1
+                if self.successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self.successes = 0
+            self.condition.notify_all()
+
+
+class BedrockEngine:
+    """Concurrent invoke_model runner with RPM/TPM token buckets and adaptive concurrency.
+
+    `client` only needs an `invoke_model(modelId, body, contentType, accept)` method, so a
+    local fake (see bedrock_test_files/fake_bedrock_client.py) can replace boto3.
+    An optional `cache` (bedrock_cache.PromptCache) answers repeated prompts without a call,
+    and optional `metrics` (bedrock_metrics.BedrockMetrics) records every call under `stage`.
+    Failures are retried following `retry_policy` (bedrock_retry.RetryPolicy) and surface as
+    BedrockCallFailed once they are fatal or out of budget.
+    """
+
+    def __init__(self, client, model_id, max_tokens=250, temperature=0.7,
+                 requests_per_minute=100, tokens_per_minute=None,
+                 initial_concurrency=4, max_concurrency=32, retry_policy=None, cache=None,
+                 metrics=None, stage="bedrock"):
+        self.client = client
+        self.cache = cache
+        self.metrics = metrics
+        self.stage = stage
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.model_id = model_id
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.initial_concurrency = initial_concurrency
+        self.max_concurrency = max_concurrency
+        self.throttles = 0
+        self.retries = 0
+        self.loop = None
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def _ensure_started(self):
+        # asyncio primitives are created inside the running loop (Python 3.8 binds them at creation)
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self.rpm_bucket = TokenBucket(self.requests_per_minute)
+            self.tpm_bucket = TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None
+            self.limiter = AdaptiveConcurrency(self.initial_concurrency, maximum=self.max_concurrency)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def _invoke_sync(self, prompt, max_tokens):
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": self.temperature
+        }
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps(body),
+            contentType="application/json",
+            accept="application/json"
+        )
+        return json.loads(response["body"].read())
+
+    async def invoke(self, prompt, max_tokens=None, validate=None):
+        """Send one prompt and return the response text, retrying per error class.
+
+        `validate(text)` -> bool: only accepted responses are cached, and a cached response it
+        rejects (e.g. stored before validation existed) is evicted and asked again. The text is
+        returned either way; the caller decides what an invalid answer means.
+        """
+        self._ensure_started()
+        max_tokens = max_tokens or self.max_tokens
+        if self.cache:
+            cached = self.cache.get(self.model_id, prompt, self.temperature, max_tokens)
+            if cached is not None:
+                if validate is None or validate(cached):
+                    if self.metrics:
+                        self.metrics.record_cache_hit(self.stage, self.model_id)
+                    return cached
+                self.cache.delete(self.model_id, prompt, self.temperature, max_tokens)
+        reserved = estimate_tokens(prompt) + max_tokens
+        retries = {}
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.rpm_bucket.acquire()
+            if self.tpm_bucket:
+                await self.tpm_bucket.acquire(reserved)
+            await self.limiter.acquire()
+            error_class = None
+            started = time.perf_counter()
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self.executor, self._invoke_sync, prompt, max_tokens
+                )
+            except Exception as e:
+                latency = time.perf_counter() - started  # every attempt is timed, failed ones included
+                error_class = classify_error(e)
+                if self.tpm_bucket:
+                    self.tpm_bucket.refund(reserved)
+                if not self.retry_policy.should_retry(error_class, retries.get(error_class, 0)):
+                    if self.metrics:
+                        self.metrics.record_error(self.stage, self.model_id, error_class, latency)
+                    raise BedrockCallFailed(e, error_class, attempt) from e
+            else:
+                latency = time.perf_counter() - started
+            finally:
+                await self.limiter.release(throttled=error_class == "throttling")
+            if error_class:
+                retries[error_class] = retries.get(error_class, 0) + 1
+                self.retries += 1
+                if self.metrics:
+                    self.metrics.record_retry(self.stage, self.model_id, error_class, latency)
+                if error_class == "throttling":
+                    self.throttles += 1
+                await asyncio.sleep(self.retry_policy.delay(attempt - 1))
+                continue
+            usage = result.get("usage") or {}
+            if self.metrics:
+                self.metrics.record_call(self.stage, self.model_id, latency, usage)
+            if self.tpm_bucket and usage:
+                used = usage.get("input_tokens", 0) + usage.get("output_tokens", 0)
+                self.tpm_bucket.refund(max(0, reserved - used))
+            text = result["content"][0]["text"]
+            if self.cache and (validate is None or validate(text)):
+                self.cache.put(self.model_id, prompt, self.temperature, max_tokens, text)
+            return text
+
+    async def run(self, prompts, on_result=None):
+        """Process all prompts concurrently and return their texts in input order.
+
+        Failed calls yield ERROR_MARKER. `on_result(i, text, error)` is called as each row
+        finishes (in completion order), e.g. to log progress or checkpoint.
+        """
+        prompts = list(prompts)
+        results = [None] * len(prompts)
+        self._ensure_started()
+        pending = iter(enumerate(prompts))
+
+        async def worker():
+            for i, prompt in pending:
+                error = None
+                try:
+                    text = await self.invoke(prompt)
+                except Exception as e:
+                    text, error = ERROR_MARKER, e
+                results[i] = text
+                if on_result:
+                    on_result(i, text, error)
+
+        await asyncio.gather(*(worker() for _ in range(self.max_concurrency)))
+        return results
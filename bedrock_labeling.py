@@ -0,0 +1,106 @@
+import asyncio
+import json
+import re
+
+from bedrock_engine import ERROR_MARKER
+from bedrock_retry import InvalidOutputError
+from prompt_templates import LABEL, LABEL_BATCH
+
+LABELS = ("good risk", "bad risk")
+MAX_TOKENS_PER_ITEM = 12  # '"17": "good risk", ' is ~8 tokens
+# Recorded with every label (batches fall back to the single-item template, so both count)
+TEMPLATE_HASH = f"{LABEL_BATCH.hash}+{LABEL.hash}"
+
+
+def build_prompt(description):
+    return LABEL.render({"description": description})
+
+
+def build_batch_prompt(descriptions):
+    """One prompt for several assessments, answered as a JSON object keyed by item id (1..N)"""
+    items = "\n".join(f"[{n}] \"{description}\"" for n, description in enumerate(descriptions, start=1))
+    return LABEL_BATCH.render({"items": items})
+
+
+def normalize_label(text):
+    label = str(text).strip().strip(".'\"").lower()
+    return label if label in LABELS else None
+
+
+def parse_batch_response(text, size):
+    """Return {item_number: label} for the items of the batch that came back valid"""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        answer = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    labels = {}
+    for key, value in answer.items():
+        try:
+            number = int(str(key).strip("[] "))
+        except ValueError:
+            continue
+        label = normalize_label(value)
+        if 1 <= number <= size and label:
+            labels[number] = label
+    return labels
+
+
+async def classify_one(engine, description, max_tokens=None):
+    """Single-item request; returns (label, error) where error is the exception or None"""
+    try:
+        text = await engine.invoke(build_prompt(description), max_tokens=max_tokens,
+                                   validate=lambda text: normalize_label(text) is not None)
+    except Exception as e:
+        return ERROR_MARKER, e
+    label = normalize_label(text)
+    if label is None:
+        return ERROR_MARKER, InvalidOutputError(f"unexpected output: {text.strip().lower()}")
+    return label, None
+
+
+async def classify_batch(engine, descriptions):
+    """Classify a batch in one request; items that are missing or invalid are retried one by one.
+
+    Returns a list of (label, error, attempts) aligned with `descriptions`, where attempts is 1
+    for items answered by the batch call and 2 for items that needed the single-item fallback.
+    """
+    if len(descriptions) == 1:
+        return [(*await classify_one(engine, descriptions[0]), 1)]
+    size = len(descriptions)
+    try:
+        # only complete batch answers are cached: a partial one is asked again on the next run
+        text = await engine.invoke(build_batch_prompt(descriptions), max_tokens=20 + MAX_TOKENS_PER_ITEM * size,
+                                   validate=lambda text: len(parse_batch_response(text, size)) == size)
+        labels = parse_batch_response(text, size)
+    except Exception:
+        labels = {}
+    results = [(labels[n], None, 1) if n in labels else None for n in range(1, len(descriptions) + 1)]
+    missing = [k for k, result in enumerate(results) if result is None]
+    retried = await asyncio.gather(*(classify_one(engine, descriptions[k]) for k in missing))
+    for k, (label, error) in zip(missing, retried):
+        results[k] = (label, error, 2)
+    return results
+
+
+async def classify_all(engine, descriptions, batch_size=20, concurrency=8, on_result=None):
+    """Label all descriptions in batches of `batch_size`, keeping input order.
+
+    `on_result(i, label, error)` is called for every item as its batch finishes.
+    """
+    descriptions = list(descriptions)
+    results = [None] * len(descriptions)
+    batches = iter(range(0, len(descriptions), batch_size))
+
+    async def worker():
+        for start in batches:
+            labeled = await classify_batch(engine, descriptions[start:start + batch_size])
+            for offset, (label, error, _) in enumerate(labeled):
+                results[start + offset] = label
+                if on_result:
+                    on_result(start + offset, label, error)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
@@ -0,0 +1,217 @@
+import bisect
+import json
+import os
+import threading
+import time
+
+# On-demand USD prices per 1K tokens (input, output); update when AWS pricing changes
+PRICES_PER_1K_TOKENS = {
+    "anthropic.claude-3-5-haiku-20241022-v1:0": (0.0008, 0.004),
+    "anthropic.claude-3-5-sonnet-20240620-v1:0": (0.003, 0.015),
+    "anthropic.claude-instant-v1": (0.0008, 0.0024),
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+# Latency histogram upper bounds in seconds (Prometheus `le`): memory per series is fixed however
+# long the run, and the percentiles are estimated from the bucket counts
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, float("inf"))
+
+
+def percentile(counts, q):
+    """q-quantile of a latency histogram (counts per LATENCY_BUCKETS bucket), interpolated linearly
+    inside its bucket as Prometheus' histogram_quantile does (the +Inf bucket gives its lower bound)"""
+    total = sum(counts)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(counts):
+        if count and seen + count >= rank:
+            lower = LATENCY_BUCKETS[i - 1] if i else 0.0
+            upper = LATENCY_BUCKETS[i]
+            if upper == float("inf"):
+                return lower
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return LATENCY_BUCKETS[-2]
+
+
+class _Series:
+    def __init__(self):
+        self.calls = 0
+        self.errors = {}
+        self.retries = {}
+        self.cache_hits = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        # every attempt, by outcome ("ok" or the attempt's error class): [counts per bucket, sum]
+        self.latency = {}
+        self.first_call = None
+
+    def observe(self, latency, outcome="ok"):
+        histogram = self.latency.get(outcome)
+        if histogram is None:
+            histogram = self.latency[outcome] = [[0] * len(LATENCY_BUCKETS), 0.0]
+        histogram[0][bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        histogram[1] += latency
+
+
+class BedrockMetrics:
+    """Per-call metrics for Bedrock, grouped by (stage, model_id).
+
+    Records the latency of every attempt (fixed-bucket histograms by outcome: "ok" or the error class
+    of a throttled, retried or failed attempt), token usage (from the response `usage` block), retries/throttles per error class, final errors and cache hits; `summary()` adds
+    p50/p95/p99, effective RPM/TPM and estimated cost. `dump()` writes it as JSON plus a Prometheus
+    text file (.prom).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+        self.started = time.time()
+        self.stop_event = None
+        self.dump_thread = None
+
+    def _get(self, stage, model_id):
+        key = (stage, model_id)
+        if key not in self.series:
+            self.series[key] = _Series()
+        return self.series[key]
+
+    def record_call(self, stage, model_id, latency, usage=None):
+        with self.lock:
+            series = self._get(stage, model_id)
+            series.calls += 1
+            series.observe(latency)
+            if series.first_call is None:
+                series.first_call = time.time() - latency
+            if usage:
+                series.input_tokens += usage.get("input_tokens", 0)
+                series.output_tokens += usage.get("output_tokens", 0)
+
+    def record_retry(self, stage, model_id, error_class, latency=None):
+        """A failed attempt that will be retried; its `latency` is observed under its error class"""
+        with self.lock:
+            series = self._get(stage, model_id)
+            series.retries[error_class] = series.retries.get(error_class, 0) + 1
+            if latency is not None:
+                series.observe(latency, error_class)
+
+    def record_error(self, stage, model_id, error_class, latency=None):
+        """A call that failed for good; the `latency` of its last attempt is observed under its error class"""
+        with self.lock:
+            series = self._get(stage, model_id)
+            series.errors[error_class] = series.errors.get(error_class, 0) + 1
+            if latency is not None:
+                series.observe(latency, error_class)
+
+    def record_cache_hit(self, stage, model_id):
+        with self.lock:
+            self._get(stage, model_id).cache_hits += 1
+
+    def summary(self):
+        now = time.time()
+        result = []
+        with self.lock:
+            for (stage, model_id), s in sorted(self.series.items()):
+                ok_counts, ok_sum = s.latency.get("ok", ([0] * len(LATENCY_BUCKETS), 0.0))
+                observed = sum(ok_counts)
+                minutes = max((now - (s.first_call or now)) / 60, 1e-9)
+                price_in, price_out = PRICES_PER_1K_TOKENS.get(model_id, (0.0, 0.0))
+                result.append({
+                    "stage": stage,
+                    "model_id": model_id,
+                    "calls": s.calls,
+                    "cache_hits": s.cache_hits,
+                    "retries": dict(s.retries),
+                    "throttles": s.retries.get("throttling", 0),
+                    "errors": dict(s.errors),
+                    "latency_seconds": {  # successful attempts
+                        f"p{int(q * 100)}": round(percentile(ok_counts, q), 4) for q in QUANTILES
+                    },
+                    "latency_mean_seconds": round(ok_sum / observed, 4) if observed else 0.0,
+                    "latency_by_outcome": {
+                        outcome: {
+                            "count": sum(counts),
+                            **{f"p{int(q * 100)}": round(percentile(counts, q), 4) for q in QUANTILES},
+                            "sum_seconds": round(total, 4),
+                            "buckets": {  # cumulative, as Prometheus
+                                ("+Inf" if bound == float("inf") else str(bound)): sum(counts[:i + 1])
+                                for i, bound in enumerate(LATENCY_BUCKETS)
+                            },
+                        }
+                        for outcome, (counts, total) in sorted(s.latency.items())
+                    },
+                    "input_tokens": s.input_tokens,
+                    "output_tokens": s.output_tokens,
+                    "requests_per_minute": round(s.calls / minutes, 2) if s.calls else 0.0,
+                    "tokens_per_minute": round((s.input_tokens + s.output_tokens) / minutes, 2) if s.calls else 0.0,
+                    "estimated_cost_usd": round(s.input_tokens / 1000 * price_in + s.output_tokens / 1000 * price_out, 6),
+                })
+        return {"elapsed_seconds": round(now - self.started, 2), "series": result}
+
+    def to_prometheus(self):
+        summary = self.summary()
+        lines = [
+            "# HELP bedrock_request_latency_seconds Latency of every invoke_model attempt by outcome (ok or error class)",
+            "# TYPE bedrock_request_latency_seconds histogram",
+        ]
+        counters = []
+        for s in summary["series"]:
+            labels = f'stage="{s["stage"]}",model_id="{s["model_id"]}"'
+            for outcome, latency in s["latency_by_outcome"].items():
+                outcome_labels = labels + f',outcome="{outcome}"'
+                for bound, count in latency["buckets"].items():
+                    lines.append(f'bedrock_request_latency_seconds_bucket{{{outcome_labels},le="{bound}"}} {count}')
+                lines.append(f"bedrock_request_latency_seconds_sum{{{outcome_labels}}} {latency['sum_seconds']}")
+                lines.append(f"bedrock_request_latency_seconds_count{{{outcome_labels}}} {latency['count']}")
+            counters.append(("bedrock_requests_total", labels, s["calls"]))
+            counters.append(("bedrock_cache_hits_total", labels, s["cache_hits"]))
+            counters.append(("bedrock_tokens_total", labels + ',direction="input"', s["input_tokens"]))
+            counters.append(("bedrock_tokens_total", labels + ',direction="output"', s["output_tokens"]))
+            counters.append(("bedrock_estimated_cost_usd_total", labels, s["estimated_cost_usd"]))
+            for error_class, count in s["retries"].items():
+                counters.append(("bedrock_retries_total", labels + f',error_class="{error_class}"', count))
+            for error_class, count in s["errors"].items():
+                counters.append(("bedrock_errors_total", labels + f',error_class="{error_class}"', count))
+        for name in dict.fromkeys(name for name, _, _ in counters):
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{n}{{{labels}}} {value}" for n, labels, value in counters if n == name)
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write `path` (JSON) and the same path with a .prom extension (Prometheus text), each to a
+        .tmp file renamed over it: a scraper never reads half a file"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        for out_path, text in ((path, json.dumps(self.summary(), indent=2)),
+                               (os.path.splitext(path)[0] + ".prom", self.to_prometheus())):
+            with open(out_path + ".tmp", "w") as f:
+                f.write(text)
+            os.replace(out_path + ".tmp", out_path)
+
+    def start_periodic_dump(self, path, interval=60):
+        """Dump every `interval` seconds from a daemon thread until `stop_periodic_dump`"""
+        self.stop_event = threading.Event()
+
+        def loop():
+            while not self.stop_event.wait(interval):
+                self.dump(path)
+
+        self.dump_thread = threading.Thread(target=loop, daemon=True)
+        self.dump_thread.start()
+
+    def stop_periodic_dump(self):
+        """Stop the periodic dumps and wait for one in progress: a final dump() cannot race it"""
+        if self.stop_event:
+            self.stop_event.set()
+        if self.dump_thread:
+            self.dump_thread.join()
+            self.dump_thread = None
+
+    def print_summary(self):
+        for s in self.summary()["series"]:
+            lat = s["latency_seconds"]
+            print(f"📊 [{s['stage']}] {s['model_id']}: {s['calls']} calls, {s['cache_hits']} cache hits, "
+                  f"p50/p95/p99 {lat['p50']}/{lat['p95']}/{lat['p99']}s, "
+                  f"{s['requests_per_minute']} RPM, {s['tokens_per_minute']} TPM, "
+                  f"retries {s['retries']}, errors {s['errors']}, ~${s['estimated_cost_usd']}")
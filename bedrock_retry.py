@@ -0,0 +1,108 @@
+import random
+
+from progress_journal import ProgressJournal
+
+# AWS error codes -> error class. Classes with a retry budget are retriable, the rest are fatal.
+ERROR_CLASSES = {
+    "ThrottlingException": "throttling",
+    "TooManyRequestsException": "throttling",
+    "ServiceUnavailableException": "unavailable",
+    "InternalServerException": "server",
+    "ModelNotReadyException": "unavailable",
+    "ModelTimeoutException": "timeout",
+    "ReadTimeoutError": "timeout",
+    "ConnectTimeoutError": "connection",
+    "EndpointConnectionError": "connection",
+    "ConnectionClosedError": "connection",
+    "ConnectionError": "connection",
+    "InvalidOutputError": "invalid_output",
+    "ValidationException": "validation",
+    "AccessDeniedException": "access_denied",
+    "ResourceNotFoundException": "not_found",
+    "ModelErrorException": "model_error",
+}
+
+DEFAULT_BUDGETS = {
+    "throttling": 8,
+    "unavailable": 5,
+    "server": 3,
+    "timeout": 3,
+    "connection": 5,
+    "invalid_output": 0,  # temperature 0 gives the same answer again, dead-letter it directly
+}
+
+
+class InvalidOutputError(Exception):
+    """The model answered, but not with something we can use (e.g. 'moderate risk')"""
+
+
+class BedrockCallFailed(Exception):
+    """A call that was not retried (fatal) or ran out of retries for its error class"""
+
+    def __init__(self, error, error_class, attempts):
+        super().__init__(f"{error_class} after {attempts} attempt(s): {error}")
+        self.error = error
+        self.error_class = error_class
+        self.attempts = attempts
+
+
+def error_code(error):
+    """Return the AWS error code of a botocore ClientError (or the exception class name)"""
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") or type(error).__name__
+
+
+def classify_error(error):
+    return ERROR_CLASSES.get(error_code(error), "unknown")
+
+
+class RetryPolicy:
+    """Per-error-class retry budgets with exponential backoff and full jitter"""
+
+    def __init__(self, budgets=None, base_delay=0.5, max_delay=30.0, seed=None):
+        self.budgets = dict(DEFAULT_BUDGETS, **(budgets or {}))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.random = random.Random(seed)
+
+    def should_retry(self, error_class, retries):
+        """`retries` is how many times this error class was already retried for the call"""
+        return retries < self.budgets.get(error_class, 0)
+
+    def delay(self, attempt):
+        return self.random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class DeadLetterStore(ProgressJournal):
+    """JSONL store of rows that failed for good, with their error payload.
+
+    Same append-only format as the progress journal: the last record per row id wins, so
+    `resolve` (after a successful repair) simply appends a tombstone. Dead letters are few, so
+    their full records (error class, resolved) stay in `records`.
+    """
+
+    def __init__(self, path, key="row_id"):
+        self.records = {}
+        super().__init__(path, key)
+
+    def _index(self, record, offset):
+        super()._index(record, offset)
+        self.records[record[self.key]] = record
+
+    def add(self, row_id, stage, error, **payload):
+        error_class = getattr(error, "error_class", None) or classify_error(error)
+        cause = getattr(error, "error", error)
+        self.record(
+            row_id, None, stage=stage, error_class=error_class, error_code=error_code(cause),
+            error=str(cause), attempts=getattr(error, "attempts", 1), resolved=False, **payload
+        )
+
+    def resolve(self, row_id):
+        if row_id in self and not self.records[row_id].get("resolved"):
+            self.record(row_id, None, resolved=True)
+
+    def unresolved(self, stage=None):
+        return [
+            row_id for row_id, record in self.records.items()
+            if not record.get("resolved") and (stage is None or record.get("stage") == stage)
+        ]
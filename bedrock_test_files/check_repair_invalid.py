@@ -0,0 +1,42 @@
+import os
+import tempfile
+
+import pandas as pd
+
+from bedrock_cache import PromptCache
+from bedrock_engine import BedrockEngine
+from bedrock_labeling import LABELS, build_prompt
+from bedrock_retry import DeadLetterStore, InvalidOutputError
+from bedrock_test_files.fake_bedrock_client import FakeBedrockClient
+from progress_journal import ProgressJournal
+from repair_dead_letters import repair_targets
+
+# Quick check that repairing an invalid_output dead letter asks the model again instead of
+# replaying the cached bad answer (run from the repo root:
+# python -m bedrock_test_files.check_repair_invalid)
+
+MODEL_ID = "fake-model"
+DESCRIPTION = "A 35-year-old skilled worker asking for a small 24-month loan."
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        df = pd.DataFrame({"description": [DESCRIPTION]})
+        cache = PromptCache(os.path.join(tmp, "cache.sqlite"))
+        cache.put(MODEL_ID, build_prompt(DESCRIPTION), 0.0, 10, "moderate risk")  # what the first run got
+        journal = ProgressJournal(os.path.join(tmp, "targets.journal.jsonl"))
+        dead_letters = DeadLetterStore(os.path.join(tmp, "targets.dead_letters.jsonl"))
+        dead_letters.add(0, "target", InvalidOutputError("unexpected output: moderate risk"))
+
+        client = FakeBedrockClient(latency=0.0, responder=lambda prompt: "bad risk")
+        engine = BedrockEngine(client, MODEL_ID, max_tokens=10, temperature=0.0, requests_per_minute=60000,
+                               cache=cache, stage="targets")
+        repair_targets(df, [0], engine, journal, dead_letters, invalid_as=None, concurrency=1)
+        engine.close()
+
+        assert client.calls == 1, f"expected 1 Bedrock call, got {client.calls} (cached answer replayed)"
+        assert journal.value(0) in LABELS, journal.read(0)
+        assert not dead_letters.unresolved(), dead_letters.unresolved()
+        assert cache.get(MODEL_ID, build_prompt(DESCRIPTION), 0.0, 10) == "bad risk"
+        for store in (journal, dead_letters, cache):
+            store.close()
+    print("✅ Invalid-output dead letter repaired with a fresh Bedrock call")
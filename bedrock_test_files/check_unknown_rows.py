@@ -0,0 +1,38 @@
+import numpy as np
+
+import train_logreg
+from inference_metrics import METRICS
+
+# Quick check that the kernel and the preprocessor path of predict_fn count the same unknown_category_rows
+# (unseen categories and missing numerics) and score the same request alike (run from the repo root:
+# python -m bedrock_test_files.check_unknown_rows)
+
+MODEL_DIR = "downloaded_artifacts"
+REQUEST = "\n".join([
+    "Age,Sex,Job,Housing,Saving accounts,Checking account,Credit amount,Duration,Purpose",
+    "21,male,0,rent,unknown,little,12000,48,radio/TV",     # known
+    ",female,1,free,little,little,9500,36,car",            # missing Age
+    "35,male,2,own,little,moderate,,,business",            # missing Credit amount and Duration
+    "40,male,2,own,little,moderate,3000,12,spaceship",     # unseen Purpose
+    ",male,2,castle,little,moderate,3000,12,car",          # missing Age and unseen Housing
+    "52,female,3,own,rich,moderate,5000,24,car",           # known
+])
+EXPECTED_UNKNOWN = 4
+
+
+def score(artifacts):
+    METRICS.reset()
+    prediction = train_logreg.predict_fn(train_logreg.input_fn(REQUEST, "text/csv"), artifacts)
+    return prediction, METRICS.snapshot()["counters"]["unknown_category_rows"]
+
+
+if __name__ == "__main__":
+    artifacts = train_logreg.model_fn(MODEL_DIR)
+    assert "kernel" in artifacts, f"no matching scoring_kernel.npz in {MODEL_DIR} (python export_scoring_kernel.py)"
+    kernel_prediction, kernel_unknown = score(artifacts)
+    preprocessor_prediction, preprocessor_unknown = score({"model_dir": MODEL_DIR})  # no kernel: sklearn path
+
+    assert kernel_unknown == preprocessor_unknown == EXPECTED_UNKNOWN, (kernel_unknown, preprocessor_unknown)
+    assert np.allclose(kernel_prediction["probability"], preprocessor_prediction["probability"])
+    assert (kernel_prediction["prediction"] == preprocessor_prediction["prediction"]).all()
+    print(f"✅ Both predict_fn paths count {kernel_unknown} unknown rows and score the request alike")
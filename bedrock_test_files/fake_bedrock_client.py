@@ -0,0 +1,79 @@
+import io
+import json
+import random
+import threading
+import time
+
+
+class FakeThrottlingException(Exception):
+    """Mimics botocore's ClientError for a Bedrock ThrottlingException"""
+
+    def __init__(self):
+        super().__init__("Rate exceeded")
+        self.response = {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}
+
+
+class FakeBedrockClient:
+    """Local stand-in for boto3's bedrock-runtime client.
+
+    Sleeps `latency` seconds per call (plus `token_latency` per output token), throttles when
+    more than `max_in_flight` calls are concurrent (like a per-account quota) or with
+    probability `throttle_rate`, and answers with `responder(prompt)` (an echo of the prompt by
+    default) plus a `usage` block.
+    """
+
+    def __init__(self, latency=0.05, max_in_flight=None, throttle_rate=0.0, responder=None, seed=42, token_latency=0.0):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.max_in_flight = max_in_flight
+        self.throttle_rate = throttle_rate
+        self.responder = responder or (lambda prompt: f"echo: {prompt}")
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.calls = 0
+        self.throttled = 0
+
+    def invoke_model(self, modelId, body, contentType="application/json", accept="application/json"):
+        request = json.loads(body)
+        prompt = request["messages"][0]["content"]
+        with self.lock:
+            self.calls += 1
+            over_quota = self.max_in_flight is not None and self.in_flight >= self.max_in_flight
+            if over_quota or self.random.random() < self.throttle_rate:
+                self.throttled += 1
+                raise FakeThrottlingException()
+            self.in_flight += 1
+        try:
+            text = self.responder(prompt)
+            output_tokens = min(len(text) // 4, request["max_tokens"])
+            time.sleep(self.latency + self.token_latency * output_tokens)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        payload = {
+            "content": [{"type": "text", "text": text}],
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": output_tokens},
+        }
+        return {"body": io.BytesIO(json.dumps(payload).encode("utf-8"))}
+
+
+if __name__ == "__main__":
+    # Quick check of the async engine against the fake client (run from the repo root:
+    # python -m bedrock_test_files.fake_bedrock_client)
+    import asyncio
+    from bedrock_engine import BedrockEngine
+
+    NUM_PROMPTS = 300
+    client = FakeBedrockClient(latency=0.05, max_in_flight=12, throttle_rate=0.02)
+    engine = BedrockEngine(client, "fake-model", requests_per_minute=60000, max_concurrency=32)
+    prompts = [f"row {i}" for i in range(NUM_PROMPTS)]
+
+    start = time.time()
+    results = asyncio.run(engine.run(prompts))
+    elapsed = time.time() - start
+    engine.close()
+
+    assert results == [f"echo: {p}" for p in prompts], "results came back out of order"
+    print(f"✅ {NUM_PROMPTS} prompts in {elapsed:.2f}s (serial would take {NUM_PROMPTS * client.latency:.1f}s)")
+    print(f"🚦 Throttled calls: {client.throttled} | final concurrency limit: {engine.limiter.limit}")
@@ -0,0 +1,105 @@
+"""Batched vs single-item labeling: speed-up and agreement rate.
+
+Run from the repo root:
+    python -m benchmarks.batched_labels --rows 200 --batch-size 20          # real Bedrock
+    python -m benchmarks.batched_labels --rows 200 --batch-size 20 --fake   # local fake client
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import zlib
+
+from bedrock_engine import BedrockEngine
+from bedrock_labeling import classify_all
+from data_access import load_dataset
+
+INPUT_FILE = "data_files/credit_risk_with_descriptions_cleaned.csv"
+REGION = "us-west-2"
+MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
+BAD_WORDS = ("caution", "concern", "risk", "limited", "young", "unstable")
+
+
+def fake_label(description):
+    return "bad risk" if sum(word in description.lower() for word in BAD_WORDS) >= 2 else "good risk"
+
+
+def fake_responder(prompt):
+    """Answers single prompts with a label and batch prompts with JSON (dropping ~5% of items)"""
+    items = re.findall(r"^\[(\d+)\] \"(.*)\"$", prompt, re.MULTILINE)
+    if not items:
+        return fake_label(re.search(r"Assessment: \"(.*)\"", prompt, re.DOTALL).group(1))
+    answer = {n: fake_label(d) for n, d in items if zlib.crc32(d.encode()) % 20}
+    return json.dumps(answer)
+
+
+def make_client(fake):
+    if fake:
+        from bedrock_test_files.fake_bedrock_client import FakeBedrockClient
+        # ~0.4s fixed overhead per request + ~10ms per output token (Haiku-like)
+        return FakeBedrockClient(latency=0.4, token_latency=0.01, responder=fake_responder)
+    import boto3
+    return boto3.client("bedrock-runtime", region_name=REGION)
+
+
+class CountingClient:
+    """Wraps a bedrock-runtime client to count invoke_model calls"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        self.calls += 1
+        return self.client.invoke_model(**kwargs)
+
+
+def run_mode(client, descriptions, batch_size, concurrency):
+    client = CountingClient(client)
+    engine = BedrockEngine(client, MODEL_ID, max_tokens=10, temperature=0.0,
+                           requests_per_minute=6000, max_concurrency=concurrency * 2)
+    start = time.perf_counter()
+    labels = asyncio.run(classify_all(engine, descriptions, batch_size=batch_size, concurrency=concurrency))
+    elapsed = time.perf_counter() - start
+    engine.close()
+    return labels, elapsed, client.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fake", action="store_true", help="use the local fake Bedrock client")
+    parser.add_argument("--output", default="benchmarks/batched_labels.json")
+    args = parser.parse_args()
+
+    descriptions = load_dataset(INPUT_FILE, columns=["description"])["description"].head(args.rows).tolist()
+    client = make_client(args.fake)
+
+    single, single_time, single_requests = run_mode(client, descriptions, 1, args.concurrency)
+    batched, batched_time, batched_requests = run_mode(client, descriptions, args.batch_size, args.concurrency)
+
+    valid = [(a, b) for a, b in zip(single, batched) if a != "ERROR" and b != "ERROR"]
+    report = {
+        "rows": len(descriptions),
+        "batch_size": args.batch_size,
+        "single": {"seconds": round(single_time, 2), "requests": single_requests},
+        "batched": {"seconds": round(batched_time, 2), "requests": batched_requests},
+        "speed_up": round(single_time / batched_time, 2),
+        "request_reduction": round(single_requests / batched_requests, 2),
+        "agreement_rate": round(sum(a == b for a, b in valid) / len(valid), 4) if valid else None,
+        "compared_rows": len(valid),
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"⏱️ Single : {report['single']['seconds']}s, {single_requests} requests")
+    print(f"⏱️ Batched: {report['batched']['seconds']}s, {batched_requests} requests (batch size {args.batch_size})")
+    print(f"⚡ Speed-up: x{report['speed_up']} | 🤝 Agreement: {report['agreement_rate']} over {len(valid)} rows")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
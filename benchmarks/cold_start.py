@@ -0,0 +1,118 @@
+"""Cold start of the inference handlers: import time and time to first prediction, lazy vs eager.
+
+Run from the repo root:
+    python -m benchmarks.cold_start [--runs 5]
+
+Each run is a fresh interpreter (as a new serving worker) that imports the handlers, calls model_fn on
+downloaded_artifacts and scores one CSV request (input_fn -> predict_fn -> output_fn):
+  - lazy: train_logreg.py as is: numpy-only imports, scoring_kernel.npz memory-mapped and checked by
+    its model.joblib fingerprint, no sklearn artifacts loaded
+  - eager: the previous handlers: pandas / scipy / joblib / sklearn imported with the module, and
+    model_fn unpickling model.joblib + tabular_preprocessor.joblib and np.load-ing the kernel
+Reported: median import / model_fn / first prediction milliseconds inside the worker, whole process
+wall time (interpreter start to exit, `python -c pass` shown for reference) and whether sklearn ended
+up imported. Also in-process: kernel load with np.load vs the memory map. Files are in the page cache
+after the first run (warm-cache cold start).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+
+from scoring_kernel import KERNEL_FILE, ScoringKernel
+
+MODEL_DIR = "downloaded_artifacts"
+INPUT_FILE = "test_data_for_inference.csv"
+
+WORKER = """
+import json, os, sys, time, warnings
+warnings.filterwarnings("ignore")
+start = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+artifacts = {model_fn}
+loaded = time.perf_counter()
+body = open("{input_file}").read()
+train_logreg.output_fn(train_logreg.predict_fn(train_logreg.input_fn(body, "text/csv"), artifacts), "application/json")
+predicted = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1e3, "model_fn_ms": (loaded - imported) * 1e3,
+    "first_prediction_ms": (predicted - loaded) * 1e3, "sklearn_imported": "sklearn" in sys.modules,
+}}))
+"""
+
+VARIANTS = {
+    "lazy": {
+        "imports": "import train_logreg",
+        "model_fn": "train_logreg.model_fn(\"{model_dir}\")",
+    },
+    "eager": {
+        "imports": "import numpy as np, pandas, scipy.sparse, joblib, sklearn.metrics\nimport train_logreg\n"
+                   "from scoring_kernel import ScoringKernel",
+        "model_fn": "{{\"model_dir\": \"{model_dir}\", \"model\": joblib.load(\"{model_dir}/model.joblib\"), "
+                    "\"preprocessor\": joblib.load(\"{model_dir}/tabular_preprocessor.joblib\"), "
+                    "\"kernel\": ScoringKernel.load(\"{model_dir}/" + KERNEL_FILE + "\")}}",
+    },
+}
+
+
+def run_worker(variant):
+    code = WORKER.format(
+        imports=VARIANTS[variant]["imports"],
+        model_fn=VARIANTS[variant]["model_fn"].format(model_dir=MODEL_DIR),
+        input_file=INPUT_FILE,
+    )
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1e3
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/cold_start.json")
+    args = parser.parse_args()
+
+    interpreter = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        interpreter.append((time.perf_counter() - start) * 1e3)
+
+    results = {}
+    for variant in VARIANTS:
+        runs = [run_worker(variant) for _ in range(args.runs)]
+        results[variant] = {
+            metric: round(statistics.median(run[metric] for run in runs), 1)
+            for metric in ("import_ms", "model_fn_ms", "first_prediction_ms", "process_ms")
+        }
+        results[variant]["sklearn_imported"] = runs[0]["sklearn_imported"]
+
+    kernel_path = f"{MODEL_DIR}/{KERNEL_FILE}"
+    load_us = {
+        mode: min(timeit.repeat(lambda: ScoringKernel.load(kernel_path, mmap=mode == "mmap"), number=200, repeat=3))
+        / 200 * 1e6
+        for mode in ("np.load", "mmap")
+    }
+
+    report = {"runs": args.runs, "interpreter_ms": round(statistics.median(interpreter), 1), "workers": results,
+              "kernel_load_us": {mode: round(us, 1) for mode, us in load_us.items()}}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"🧊 Cold start, median of {args.runs} fresh workers (python -c pass: {report['interpreter_ms']} ms)")
+    print(f"{'handlers':>9} {'import ms':>10} {'model_fn ms':>12} {'1st pred ms':>12} {'process ms':>11} {'sklearn':>8}")
+    for variant, r in results.items():
+        print(f"{variant:>9} {r['import_ms']:>10} {r['model_fn_ms']:>12} {r['first_prediction_ms']:>12} "
+              f"{r['process_ms']:>11} {str(r['sklearn_imported']):>8}")
+    print(f"   {KERNEL_FILE} load: {load_us['np.load']:.0f} us np.load, {load_us['mmap']:.0f} us memory-mapped")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
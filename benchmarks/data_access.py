@@ -0,0 +1,104 @@
+"""Load time and memory: pandas readers vs the Parquet cache of data_access.py.
+
+Run from the repo root:
+    python -m benchmarks.data_access [--repeat 5] [--scale 100]
+
+--scale N also benchmarks a synthetic CSV with the rows of the targets file repeated N times.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import data_access
+from data_access import load_dataset
+
+FILES = [
+    "data_files/credir_risk_reto.xlsx",
+    "data_files/credit_risk_with_descriptions_cleaned.csv",
+    "data_files/credit_risk_with_targets_cleaned_final.csv",
+]
+FEATURES = ["Age", "Sex", "Job", "Housing", "Saving accounts", "Checking account",
+            "Credit amount", "Duration", "Purpose"]
+
+
+def pandas_read(path):
+    return pd.read_excel(path) if path.endswith(".xlsx") else pd.read_csv(path)
+
+
+def best_of(repeat, load):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = load()
+        times.append(time.perf_counter() - start)
+    return min(times), df
+
+
+def megabytes(df):
+    return round(df.memory_usage(deep=True).sum() / 1e6, 3)
+
+
+def benchmark(path, repeat):
+    # Cold: source hash + parse + Parquet write (paid once per source version)
+    for old in os.listdir(data_access.CACHE_DIR) if os.path.isdir(data_access.CACHE_DIR) else []:
+        if old.startswith(os.path.basename(path) + "."):
+            os.remove(os.path.join(data_access.CACHE_DIR, old))
+    start = time.perf_counter()
+    load_dataset(path)
+    cold = time.perf_counter() - start
+
+    pandas_time, pandas_df = best_of(repeat, lambda: pandas_read(path))
+    cached_time, cached_df = best_of(repeat, lambda: load_dataset(path))
+    category_time, category_df = best_of(repeat, lambda: load_dataset(path, categorical=True, memory_map=True))
+    columns = [c for c in FEATURES if c in pandas_df.columns]
+    projected_time, projected_df = best_of(repeat, lambda: load_dataset(path, columns=columns, categorical=True))
+    return {
+        "file": path,
+        "rows": len(pandas_df),
+        "source_mb": round(os.path.getsize(path) / 1e6, 3),
+        "parquet_mb": round(os.path.getsize(data_access.cached_parquet_path(path)) / 1e6, 3),
+        "cold_conversion_s": round(cold, 4),
+        "pandas_reader": {"seconds": round(pandas_time, 4), "memory_mb": megabytes(pandas_df)},
+        "parquet": {"seconds": round(cached_time, 4), "memory_mb": megabytes(cached_df)},
+        "parquet_categorical_mmap": {"seconds": round(category_time, 4), "memory_mb": megabytes(category_df)},
+        "parquet_projected_features": {"seconds": round(projected_time, 4), "memory_mb": megabytes(projected_df)},
+        "speed_up": round(pandas_time / cached_time, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=0)
+    parser.add_argument("--output", default="benchmarks/data_access.json")
+    args = parser.parse_args()
+
+    files = list(FILES)
+    if args.scale:
+        big = pd.concat([pd.read_csv(FILES[-1])] * args.scale, ignore_index=True)
+        scaled_path = os.path.join(tempfile.mkdtemp(), f"credit_risk_x{args.scale}.csv")
+        big.to_csv(scaled_path, index=False)
+        files.append(scaled_path)
+
+    results = [benchmark(path, args.repeat) for path in files]
+    if args.scale:
+        for old in os.listdir(data_access.CACHE_DIR):
+            if old.startswith(os.path.basename(scaled_path) + "."):
+                os.remove(os.path.join(data_access.CACHE_DIR, old))
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'file':<55} {'rows':>8} {'pandas s':>9} {'parquet s':>10} {'x':>6} {'pandas MB':>10} {'cat MB':>8} {'proj MB':>8}")
+    for r in results:
+        print(f"{os.path.basename(r['file']):<55} {r['rows']:>8} {r['pandas_reader']['seconds']:>9} "
+              f"{r['parquet']['seconds']:>10} {r['speed_up']:>6} {r['pandas_reader']['memory_mb']:>10} "
+              f"{r['parquet_categorical_mmap']['memory_mb']:>8} {r['parquet_projected_features']['memory_mb']:>8}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
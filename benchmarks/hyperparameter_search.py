@@ -0,0 +1,73 @@
+"""Hyperparameter search (hyperparameter_search.py): warm-started vs cold C paths, 1 vs all cores.
+
+Run from the repo root (after preprocess_for_sagemaker.py):
+    python -m benchmarks.hyperparameter_search [--scale 10] [--folds 5]
+
+--scale N stacks the training matrix N times (rows jittered by dropping ~5% of the one-hot entries,
+so the copies are not identical). Same grid and folds in every run: total wall time, summed fit
+time and solver iterations, and whether the selected configuration is the same.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from hyperparameter_search import search
+from train_logreg import load_split
+
+TRAIN_DIR = "dataset_for_sagemaker/train"
+
+
+def scaled(X, y, scale, seed=42):
+    if scale == 1:
+        return X, y
+    rng = np.random.default_rng(seed)
+    copies = []
+    for _ in range(scale):
+        copy = X.copy()
+        copy.data = copy.data * (rng.random(len(copy.data)) > 0.05)
+        copy.eliminate_zeros()
+        copies.append(copy)
+    return sp.vstack(copies, format="csr"), np.tile(np.asarray(y), scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/hyperparameter_search.json")
+    args = parser.parse_args()
+
+    X, y = load_split(TRAIN_DIR, "train_data_sagemaker")
+    X, y = scaled(X, y, args.scale)
+
+    runs = {}
+    for name, warm_start, n_jobs in [("cold_1_core", False, 1), ("warm_1_core", True, 1), ("warm_all_cores", True, -1)]:
+        start = time.perf_counter()
+        selected, _, folds = search(X, y, folds=args.folds, n_jobs=n_jobs, warm_start=warm_start)
+        runs[name] = {
+            "wall_seconds": round(time.perf_counter() - start, 3),
+            "fit_seconds": round(sum(f["seconds"] for f in folds), 3),
+            "solver_iterations": sum(f["n_iter"] for f in folds),
+            "fits": len(folds),
+            "selected": selected,
+        }
+
+    report = {"rows": X.shape[0], "features": X.shape[1], "cpu_count": os.cpu_count(), "runs": runs}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"🔎 {X.shape[0]} rows x {X.shape[1]} features, {args.folds} folds, {os.cpu_count()} CPUs")
+    print(f"{'run':>15} {'wall s':>8} {'fit s':>8} {'iterations':>11}  selected")
+    for name, r in runs.items():
+        s = r["selected"]
+        print(f"{name:>15} {r['wall_seconds']:>8} {r['fit_seconds']:>8} {r['solver_iterations']:>11}  "
+              f"C={s['C']} {s['penalty']} {s['class_weight']} (AUC {s['mean_auc']})")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
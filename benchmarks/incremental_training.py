@@ -0,0 +1,72 @@
+"""Incremental update (train_incremental.py) vs full LogisticRegression refit as the history grows.
+
+Run from the repo root (after preprocess_for_sagemaker.py):
+    python -m benchmarks.incremental_training [--history 1 10 50] [--batch-size 1000]
+
+For each history size (train split stacked N times, see benchmarks/hyperparameter_search.py) the
+SGD model is initialized on the history, then one new batch arrives: time of the partial_fit update
+vs a full refit on history + batch, and test metrics of both.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+import train_incremental
+from benchmarks.hyperparameter_search import scaled
+from hyperparameter_search import make_model
+from train_logreg import load_split
+
+DATA_DIR = "dataset_for_sagemaker"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--history", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", default="benchmarks/incremental_training.json")
+    args = parser.parse_args()
+
+    X_train, y_train = load_split(f"{DATA_DIR}/train", "train_data_sagemaker")
+    X_test, y_test = load_split(f"{DATA_DIR}/test", "test_data_sagemaker")
+    X_batch, y_batch = scaled(X_train, y_train, -(-args.batch_size // X_train.shape[0]), seed=7)
+    X_batch, y_batch = X_batch[:args.batch_size], y_batch[:args.batch_size]
+
+    results = []
+    for copies in args.history:
+        X_hist, y_hist = scaled(X_train, y_train, copies)
+        model = train_incremental.partial_fit_epochs(
+            train_incremental.new_model(train_incremental.balanced_weights(y_hist)), X_hist, y_hist,
+            train_incremental.INIT_EPOCHS)
+
+        start = time.perf_counter()
+        train_incremental.partial_fit_epochs(model, X_batch, y_batch, train_incremental.UPDATE_EPOCHS)
+        update_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        refit = make_model().fit(sp.vstack([X_hist, X_batch], format="csr"), np.concatenate([y_hist, y_batch]))
+        refit_s = time.perf_counter() - start
+
+        results.append({
+            "history_rows": X_hist.shape[0],
+            "batch_rows": X_batch.shape[0],
+            "update_seconds": round(update_s, 4),
+            "refit_seconds": round(refit_s, 4),
+            "incremental": train_incremental.metrics(model, X_test, y_test),
+            "refit": train_incremental.metrics(refit, X_test, y_test),
+        })
+
+    with open(args.output, "w") as f:
+        json.dump({"results": results}, f, indent=2)
+
+    print(f"{'history':>9} {'update s':>9} {'refit s':>8} {'AUC incr':>9} {'AUC refit':>10}")
+    for r in results:
+        print(f"{r['history_rows']:>9} {r['update_seconds']:>9} {r['refit_seconds']:>8} "
+              f"{r['incremental']['auc']:>9} {r['refit']['auc']:>10}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Local, offline comparison of the candidate models on the dataset_for_sagemaker splits.
+
+Run from the repo root (after preprocess_for_sagemaker.py):
+    python -m benchmarks.model_comparison [--scale 1 10 50]
+
+Models:
+  logreg           train_logreg.py's LogisticRegression (hyperparameter_search.make_model defaults)
+  sgd_incremental  train_incremental.py's SGD logistic model
+  hist_gb          sklearn HistGradientBoostingClassifier with the XGBoost job's hyperparameters
+                   (train_model_sagemaker.py: 20 rounds, depth 3, eta 0.1); dense input, no class
+                   weights (as the XGBoost job), so at 0.5 it trades bad-risk recall for accuracy
+  xgboost          XGBClassifier with the same hyperparameters, only if xgboost is installed
+
+--scale N trains on the train split stacked N times (see benchmarks/hyperparameter_search.py);
+quality is always measured on the real test split (evaluation.py, bootstrap intervals), throughput
+on the test split tiled to --throughput-rows rows. Peak memory is tracemalloc during fit: numpy and
+Python allocations, not the native buffers of xgboost.
+"""
+import argparse
+import json
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier
+
+import evaluation
+import train_incremental
+from benchmarks.hyperparameter_search import scaled
+from hyperparameter_search import make_model
+from train_logreg import load_split
+
+try:
+    from xgboost import XGBClassifier
+except ImportError:  # optional: compared only where it is installed
+    XGBClassifier = None
+
+DATA_DIR = "dataset_for_sagemaker"
+LATENCY_CALLS = 1000
+
+
+def candidates():
+    models = {
+        "logreg": (lambda y: make_model(), False),
+        "sgd_incremental": (lambda y: train_incremental.new_model(train_incremental.balanced_weights(y)), False),
+        "hist_gb": (lambda y: HistGradientBoostingClassifier(max_iter=20, max_depth=3, learning_rate=0.1,
+                                                             random_state=42), True),
+    }
+    if XGBClassifier is not None:
+        models["xgboost"] = (lambda y: XGBClassifier(n_estimators=20, max_depth=3, learning_rate=0.1,
+                                                     objective="binary:logistic", eval_metric="auc"), False)
+    return models
+
+
+def fit(model, X, y):
+    if isinstance(model, SGDClassifier):  # trained as train_incremental.py initializes it
+        return train_incremental.partial_fit_epochs(model, X, y, train_incremental.INIT_EPOCHS)
+    return model.fit(X, y)
+
+
+def run(name, make, dense, X_train, y_train, X_test, y_test, throughput_rows):
+    if dense:
+        X_train, X_test = X_train.toarray(), X_test.toarray()
+    model = make(y_train)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    fit(model, X_train, y_train)
+    fit_s = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    reps = -(-throughput_rows // X_test.shape[0])
+    X_bulk = np.tile(X_test, (reps, 1)) if dense else sp.vstack([X_test] * reps, format="csr")
+    model.predict_proba(X_test)  # warm-up (lazy imports, first-call allocations)
+    start = time.perf_counter()
+    model.predict_proba(X_bulk)
+    throughput = X_bulk.shape[0] / (time.perf_counter() - start)
+
+    latencies = np.empty(LATENCY_CALLS)
+    for i in range(LATENCY_CALLS):
+        row = X_test[i % X_test.shape[0]:i % X_test.shape[0] + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        latencies[i] = time.perf_counter() - start
+
+    report = evaluation.evaluate(y_test, model.predict_proba(X_test)[:, 1], resamples=2000)
+    return {
+        "model": name,
+        "train_rows": X_train.shape[0],
+        "fit_seconds": round(fit_s, 4),
+        "fit_peak_mb": round(peak / 1e6, 2),
+        "predict_rows_per_s": round(throughput),
+        "p50_latency_ms": round(float(np.percentile(latencies, 50)) * 1e3, 4),
+        "p99_latency_ms": round(float(np.percentile(latencies, 99)) * 1e3, 4),
+        "artifact_bytes": len(pickle.dumps(model, protocol=4)),
+        "auc": report["auc"],
+        "bad_risk_recall": report["bad_risk_recall"],
+        "good_risk_precision": report["good_risk_precision"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--throughput-rows", type=int, default=100_000)
+    parser.add_argument("--output", default="benchmarks/model_comparison.json")
+    args = parser.parse_args()
+
+    X_train, y_train = load_split(f"{DATA_DIR}/train", "train_data_sagemaker")
+    X_test, y_test = load_split(f"{DATA_DIR}/test", "test_data_sagemaker")
+    y_train, y_test = np.asarray(y_train), np.asarray(y_test)
+
+    results = []
+    for scale in args.scale:
+        X, y = scaled(X_train, y_train, scale)
+        for name, (make, dense) in candidates().items():
+            results.append(run(name, make, dense, X, y, X_test, y_test, args.throughput_rows))
+
+    with open(args.output, "w") as f:
+        json.dump({"xgboost_installed": XGBClassifier is not None, "results": results}, f, indent=2)
+
+    print(f"{'model':>16} {'rows':>7} {'fit s':>8} {'fit MB':>7} {'pred rows/s':>12} {'p99 ms':>8} "
+          f"{'bytes':>8}  AUC [95% CI]          bad recall  good precision")
+    for r in results:
+        print(f"{r['model']:>16} {r['train_rows']:>7} {r['fit_seconds']:>8} {r['fit_peak_mb']:>7} "
+              f"{r['predict_rows_per_s']:>12} {r['p99_latency_ms']:>8} {r['artifact_bytes']:>8}  "
+              f"{r['auc']['estimate']:.4f} [{r['auc']['low']:.3f}, {r['auc']['high']:.3f}]  "
+              f"{r['bad_risk_recall']['estimate']:>10.4f}  {r['good_risk_precision']['estimate']:>14.4f}")
+    if XGBClassifier is None:
+        print("ℹ️ xgboost is not installed: hist_gb stands in for the SageMaker XGBoost job")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Scaling of the partitioned transform (parallel_transform.py) with 1/2/4/8 worker processes.
+
+Run from the repo root:
+    python -m benchmarks.parallel_transform [--scale 1000] [--workers 1 2 4 8] [--partitions 16]
+
+--scale N repeats the rows of the targets file N times (1000 rows -> N * 1000).
+The speed-up is bounded by the CPU count of the machine (reported in the output).
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+import pandas as pd
+
+from data_access import load_dataset
+from parallel_transform import transform_frame
+
+INPUT_FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
+PREPROCESSOR = "artifacts/tabular_preprocessor.joblib"
+FEATURES = ["Age", "Sex", "Job", "Housing", "Saving accounts", "Checking account",
+            "Credit amount", "Duration", "Purpose"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--output", default="benchmarks/parallel_transform.json")
+    args = parser.parse_args()
+
+    preprocessor = joblib.load(PREPROCESSOR)
+    df = load_dataset(INPUT_FILE)
+    df[["Saving accounts", "Checking account"]] = df[["Saving accounts", "Checking account"]].fillna("unknown")
+    df = pd.concat([df] * args.scale, ignore_index=True)
+    X_raw, y = df[FEATURES], df["target"].map({"good risk": 1, "bad risk": 0})
+
+    work_dir = tempfile.mkdtemp()
+    results = []
+    for workers in args.workers:
+        start = time.perf_counter()
+        rows = transform_frame(preprocessor, X_raw, y, work_dir, "train_data_sagemaker", args.partitions, workers)
+        seconds = time.perf_counter() - start
+        results.append({"workers": workers, "seconds": round(seconds, 3), "rows_per_s": round(rows / seconds)})
+    shutil.rmtree(work_dir)
+    for r in results:
+        r["speed_up"] = round(results[0]["seconds"] / r["seconds"], 2)
+
+    report = {"rows": len(df), "partitions": args.partitions, "cpu_count": os.cpu_count(), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"⚙️ {len(df)} rows, {args.partitions} partitions, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'seconds':>9} {'rows/s':>10} {'x':>6}")
+    for r in results:
+        print(f"{r['workers']:>8} {r['seconds']:>9} {r['rows_per_s']:>10} {r['speed_up']:>6}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Prompt rendering time: the old per-row build_prompt(df.loc[i]) vs prompt_templates.py.
+
+Run from the repo root:
+    python -m benchmarks.prompt_rendering [--scale 100] [--repeat 3]
+
+--scale N repeats the rows of the xlsx N times (1000 rows -> N * 1000 prompts).
+"""
+import argparse
+import json
+import time
+
+import pandas as pd
+
+from data_access import load_dataset
+from prompt_templates import DESCRIPTION
+
+INPUT_FILE = "data_files/credir_risk_reto.xlsx"
+
+
+def per_row(df):
+    """What the generation scripts did before: one pandas Series per row"""
+    return [DESCRIPTION.render(df.loc[i]) for i in df.index]
+
+
+def best_of(repeat, render):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        prompts = render()
+        times.append(time.perf_counter() - start)
+    return min(times), prompts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/prompt_rendering.json")
+    args = parser.parse_args()
+
+    df = pd.concat([load_dataset(INPUT_FILE)] * args.scale, ignore_index=True)
+    row_time, row_prompts = best_of(args.repeat, lambda: per_row(df))
+    column_time, column_prompts = best_of(args.repeat, lambda: DESCRIPTION.render_column(df).tolist())
+    lazy_time, lazy_prompts = best_of(args.repeat, lambda: [p for _, p in DESCRIPTION.iter_render(df)])
+    assert row_prompts == column_prompts == lazy_prompts, "renderers disagree"
+
+    result = {
+        "rows": len(df),
+        "template": DESCRIPTION.hash,
+        "per_row_seconds": round(row_time, 4),
+        "render_column_seconds": round(column_time, 4),
+        "iter_render_seconds": round(lazy_time, 4),
+        "speed_up": round(row_time / column_time, 1),
+    }
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"🧩 {result['rows']} prompts ({result['template']})")
+    print(f"   per row (df.loc[i]): {result['per_row_seconds']}s")
+    print(f"   render_column:       {result['render_column_seconds']}s  (x{result['speed_up']})")
+    print(f"   iter_render:         {result['iter_render_seconds']}s")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
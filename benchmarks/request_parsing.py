@@ -0,0 +1,82 @@
+"""Per-request latency of the inference handlers: pandas chain vs inference_io.parse_csv (+ scoring kernel).
+
+Run from the repo root:
+    python -m benchmarks.request_parsing [--requests 2000] [--batch-sizes 1 100]
+
+Chains, each timed from the CSV body to the predicted classes:
+  pandas          previous handlers: pd.read_csv -> preprocessor.transform -> model.predict
+  fast_parse      parse_csv -> pd.DataFrame -> preprocessor.transform -> model.predict (no kernel packaged)
+  fast_kernel     parse_csv -> ScoringKernel.predict (current predict_fn with scoring_kernel.npz)
+Bodies are built from the rows of the targets file (quoted descriptions included) with a header.
+Blank accounts are written as "unknown": pd.read_csv types an all-blank column of a 1-row request
+as float, which the one-hot encoder rejects (the pandas chain fails on such requests).
+"""
+import argparse
+import io
+import json
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from inference_io import parse_csv
+from scoring_kernel import KERNEL_FILE, ScoringKernel
+
+INPUT_FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
+MODEL_DIR = "downloaded_artifacts"
+PREPROCESSOR = "artifacts/tabular_preprocessor.joblib"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--output", default="benchmarks/request_parsing.json")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")  # sklearn version warnings when unpickling
+    model = joblib.load(f"{MODEL_DIR}/model.joblib")
+    preprocessor = joblib.load(PREPROCESSOR)
+    kernel = ScoringKernel.load(f"{MODEL_DIR}/{KERNEL_FILE}")
+    rows = pd.read_csv(INPUT_FILE).drop(columns="target")
+    rows[["Saving accounts", "Checking account"]] = rows[["Saving accounts", "Checking account"]].fillna("unknown")
+
+    chains = {
+        "pandas": lambda body: model.predict(preprocessor.transform(pd.read_csv(io.StringIO(body)))),
+        "fast_parse": lambda body: model.predict(preprocessor.transform(pd.DataFrame(parse_csv(body)))),
+        "fast_kernel": lambda body: kernel.predict(parse_csv(body)),
+    }
+
+    results = []
+    for batch_size in args.batch_sizes:
+        bodies = [rows.iloc[(i * batch_size) % len(rows):][:batch_size].to_csv(index=False)
+                  for i in range(args.requests)]
+        expected = [chains["pandas"](body) for body in bodies[:50]]  # also warms up
+        for name, chain in chains.items():
+            assert all((chain(body) == e).all() for body, e in zip(bodies, expected)), name
+            latencies = np.empty(len(bodies))
+            for i, body in enumerate(bodies):
+                start = time.perf_counter()
+                chain(body)
+                latencies[i] = time.perf_counter() - start
+            results.append({
+                "chain": name,
+                "batch_size": batch_size,
+                "p50_ms": round(float(np.percentile(latencies, 50)) * 1e3, 4),
+                "p99_ms": round(float(np.percentile(latencies, 99)) * 1e3, 4),
+                "rows_per_s": round(batch_size * len(bodies) / latencies.sum()),
+            })
+
+    with open(args.output, "w") as f:
+        json.dump({"requests": args.requests, "results": results}, f, indent=2)
+
+    print(f"{'chain':>12} {'batch':>6} {'p50 ms':>8} {'p99 ms':>8} {'rows/s':>9}")
+    for r in results:
+        print(f"{r['chain']:>12} {r['batch_size']:>6} {r['p50_ms']:>8} {r['p99_ms']:>8} {r['rows_per_s']:>9}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Scoring latency: sklearn path (preprocessor.transform + predict_proba) vs the lookup-table kernel.
+
+Run from the repo root (after python export_scoring_kernel.py):
+    python -m benchmarks.scoring_kernel [--sizes 1 10 100 1000 10000 100000]
+"""
+import argparse
+import json
+import time
+import warnings
+
+import joblib
+import numpy as np
+
+from data_access import load_dataset
+from scoring_kernel import ScoringKernel
+
+MODEL_DIR = "downloaded_artifacts"
+PREPROCESSOR = "artifacts/tabular_preprocessor.joblib"
+INPUT_FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
+FEATURES = ["Age", "Sex", "Job", "Housing", "Saving accounts", "Checking account",
+            "Credit amount", "Duration", "Purpose"]
+
+
+def median_latency(score, min_seconds=0.5, max_calls=1000):
+    """Median seconds per call, calling `score` until min_seconds or max_calls"""
+    times = []
+    start = time.perf_counter()
+    while len(times) < 3 or (time.perf_counter() - start < min_seconds and len(times) < max_calls):
+        t0 = time.perf_counter()
+        score()
+        times.append(time.perf_counter() - t0)
+    return float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000, 100000])
+    parser.add_argument("--output", default="benchmarks/scoring_kernel.json")
+    args = parser.parse_args()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # model pickled with a nearby sklearn version
+        model = joblib.load(f"{MODEL_DIR}/model.joblib")
+    preprocessor = joblib.load(PREPROCESSOR)
+    kernel = ScoringKernel.load(f"{MODEL_DIR}/scoring_kernel.npz")
+
+    data = load_dataset(INPUT_FILE, columns=FEATURES)
+    data[["Saving accounts", "Checking account"]] = data[["Saving accounts", "Checking account"]].fillna("unknown")
+    rng = np.random.default_rng(42)
+
+    results = []
+    for size in args.sizes:
+        df = data.iloc[rng.integers(0, len(data), size)].reset_index(drop=True)
+        columns = {column: df[column].to_numpy() for column in FEATURES}
+        expected = model.predict_proba(preprocessor.transform(df))[:, 1]
+        assert np.allclose(kernel.predict_proba(columns), expected, rtol=0, atol=1e-9), "kernel disagrees"
+
+        sklearn_s = median_latency(lambda: model.predict_proba(preprocessor.transform(df))[:, 1])
+        kernel_s = median_latency(lambda: kernel.predict_proba(columns))
+        results.append({
+            "batch_size": size,
+            "sklearn_ms": round(sklearn_s * 1000, 4),
+            "kernel_ms": round(kernel_s * 1000, 4),
+            "sklearn_rows_per_s": round(size / sklearn_s),
+            "kernel_rows_per_s": round(size / kernel_s),
+            "speed_up": round(sklearn_s / kernel_s, 1),
+        })
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"{'batch':>8} {'sklearn ms':>12} {'kernel ms':>11} {'x':>7} {'kernel rows/s':>15}")
+    for r in results:
+        print(f"{r['batch_size']:>8} {r['sklearn_ms']:>12} {r['kernel_ms']:>11} {r['speed_up']:>7} {r['kernel_rows_per_s']:>15}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Request/response formats of the inference handlers (inference_io.py): round-trip checks + cost.
+
+Run from the repo root:
+    python -m benchmarks.serialization [--batch-sizes 1 100 10000] [--with-description]
+
+For each format and batch size (rows of the targets file with blanks; the 9 request columns of
+test_data_for_inference.csv, --with-description adds the quoted text column, which .npy stores at
+fixed width: 4 bytes per character of the longest description):
+  - round trip: encode_request -> parse_request gives the same typed columns as the CSV path, and the
+    kernel predictions agree; format_response -> decode_response gives back the exact classes and
+    probabilities (fails loudly otherwise)
+  - cost: mean microseconds per call of the client encode, server parse, server format and client
+    decode, and body sizes in bytes
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from inference_io import PARSERS, decode_response, encode_request, format_response, parse_csv, parse_request
+from scoring_kernel import KERNEL_FILE, ScoringKernel
+
+INPUT_FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
+KERNEL = f"downloaded_artifacts/{KERNEL_FILE}"
+
+
+def same_columns(got, expected):
+    if list(got) != list(expected):
+        return False
+    for column, values in expected.items():
+        if values.dtype.kind == "f":
+            if not np.array_equal(np.asarray(got[column], dtype=float), values, equal_nan=True):
+                return False
+        elif not (np.asarray(got[column], dtype=str) == values).all():
+            return False
+    return True
+
+
+def mean_us(run, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = run()
+    return (time.perf_counter() - start) / repeats * 1e6, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--with-description", action="store_true")
+    parser.add_argument("--output", default="benchmarks/serialization.json")
+    args = parser.parse_args()
+
+    kernel = ScoringKernel.load(KERNEL)
+    rows = pd.read_csv(INPUT_FILE).drop(columns=["target"] if args.with_description else ["target", "description"])
+
+    results = []
+    for batch_size in args.batch_sizes:
+        frame = pd.concat([rows] * -(-batch_size // len(rows)), ignore_index=True).iloc[:batch_size]
+        repeats = max(3, 2000 // batch_size)
+        expected = parse_csv(frame.to_csv(index=False))
+        logit = kernel.decision_function(expected)
+        prediction = {"prediction": (logit > 0).astype(np.int64), "probability": 1.0 / (1.0 + np.exp(-logit))}
+
+        for content_type in PARSERS:
+            encode_us, request = mean_us(lambda: encode_request(frame, content_type), repeats)
+            parse_us, parsed = mean_us(lambda: parse_request(request, content_type), repeats)
+            assert same_columns(parsed, expected), f"request round trip failed: {content_type}"
+            assert (kernel.predict(parsed) == prediction["prediction"]).all(), content_type
+
+            format_us, (response, accept) = mean_us(lambda: format_response(prediction, content_type), repeats)
+            decode_us, decoded = mean_us(lambda: decode_response(response, accept), repeats)
+            assert (decoded["prediction"] == prediction["prediction"]).all(), f"response round trip: {accept}"
+            assert np.array_equal(decoded["probability"], prediction["probability"]), f"response round trip: {accept}"
+
+            results.append({
+                "format": content_type,
+                "batch_size": batch_size,
+                "request_bytes": len(request),
+                "response_bytes": len(response),
+                "encode_us": round(encode_us, 1),
+                "parse_us": round(parse_us, 1),
+                "format_us": round(format_us, 1),
+                "decode_us": round(decode_us, 1),
+            })
+
+    with open(args.output, "w") as f:
+        json.dump({"results": results}, f, indent=2)
+
+    print("✅ Round trips OK (request columns, predictions, response classes and probabilities)")
+    print(f"{'format':>22} {'batch':>6} {'req bytes':>10} {'resp bytes':>10} {'encode us':>10} {'parse us':>10} "
+          f"{'format us':>10} {'decode us':>10}")
+    for r in results:
+        print(f"{r['format']:>22} {r['batch_size']:>6} {r['request_bytes']:>10} {r['response_bytes']:>10} "
+              f"{r['encode_us']:>10} {r['parse_us']:>10} {r['format_us']:>10} {r['decode_us']:>10}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
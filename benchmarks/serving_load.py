@@ -0,0 +1,122 @@
+"""Concurrent load on serve_local.py: throughput and latency with and without micro-batching.
+
+Run from the repo root:
+    python -m benchmarks.serving_load [--concurrency 1 8 32] [--requests 400] [--max-wait-ms 0]
+
+For each server mode (--max-batch-rows 0 = one predict_fn per request, as the container; the
+default MAX_BATCH_ROWS = micro-batching) a server process is started on a free port and C client
+threads each send --requests single-row CSV requests over a keep-alive connection. Reported per
+(mode, concurrency):
+requests/s, client-side p50/p99 latency and the mean rows per predict_fn call (X-Batch-Rows).
+Clients and server share the machine's CPUs (count in the report).
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from serve_local import MAX_BATCH_ROWS, MAX_WAIT_MS
+
+INPUT_FILE = "test_data_for_inference.csv"
+MODEL_DIR = "downloaded_artifacts"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, max_batch_rows, max_wait_ms):
+    process = subprocess.Popen(
+        [sys.executable, "serve_local.py", "--model-dir", MODEL_DIR, "--port", str(port),
+         "--max-batch-rows", str(max_batch_rows), "--max-wait-ms", str(max_wait_ms)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(200):
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/ping")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("server did not start")
+
+
+def client(port, bodies, latencies, batch_rows):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    for body in bodies:
+        start = time.perf_counter()
+        connection.request("POST", "/invocations", body, {"Content-Type": "text/csv", "Accept": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        batch_rows.append(int(response.getheader("X-Batch-Rows", 1)))
+    connection.close()
+
+
+def run_load(port, concurrency, requests, rows):
+    bodies = [rows.iloc[[i % len(rows)]].to_csv(index=False) for i in range(requests)]
+    latencies, batch_rows = [], []
+    threads = [threading.Thread(target=client, args=(port, bodies, latencies, batch_rows)) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies = np.array(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / elapsed),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1e3, 3),
+        "p99_ms": round(float(np.percentile(latencies, 99)) * 1e3, 3),
+        "mean_batch_rows": round(float(np.mean(batch_rows)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=400, help="per client")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--output", default="benchmarks/serving_load.json")
+    args = parser.parse_args()
+
+    rows = pd.read_csv(INPUT_FILE)
+    results = []
+    for mode, max_batch_rows in (("unbatched", 0), ("micro_batched", MAX_BATCH_ROWS)):
+        port = free_port()
+        server = start_server(port, max_batch_rows, args.max_wait_ms)
+        try:
+            run_load(port, 1, 50, rows)  # warm-up
+            for concurrency in args.concurrency:
+                results.append({"mode": mode, **run_load(port, concurrency, args.requests, rows)})
+        finally:
+            server.terminate()
+            server.wait()
+
+    with open(args.output, "w") as f:
+        json.dump({"cpu_count": os.cpu_count(), "max_wait_ms": args.max_wait_ms, "results": results}, f, indent=2)
+
+    print(f"🛰️ {os.cpu_count()} CPUs, single-row CSV requests, max wait {args.max_wait_ms} ms")
+    print(f"{'mode':>14} {'clients':>8} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'rows/batch':>11}")
+    for r in results:
+        print(f"{r['mode']:>14} {r['concurrency']:>8} {r['requests_per_s']:>7} {r['p50_ms']:>8} {r['p99_ms']:>8} "
+              f"{r['mean_batch_rows']:>11}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
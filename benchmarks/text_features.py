@@ -0,0 +1,110 @@
+"""Hashed description features (risk_features.text_features) vs a fitted TF-IDF vocabulary.
+
+Run from the repo root:
+    python -m benchmarks.text_features [--scale 100]
+
+Throughput/memory: --scale N builds N * 1000 descriptions, the originals plus copies with the words of
+each description shuffled (new bigrams, so the TF-IDF vocabulary keeps growing as on real text).
+Fit + transform peak memory (tracemalloc), docs/s and pickled artifact size per vectorizer.
+Quality: 5-fold stratified CV AUC of the logistic regression on the original rows, one-hot only
+vs one-hot + each text branch.
+"""
+import argparse
+import json
+import pickle
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from data_access import load_dataset
+from risk_features import TEXT_COLUMN, QuantileBinner, text_features
+
+INPUT_FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
+CATEGORICAL = ["Sex", "Job", "Housing", "Saving accounts", "Checking account", "Purpose",
+               "Credit_bin", "Age_bin", "Duration_bin"]
+
+VECTORIZERS = {
+    "hashing": text_features,
+    "tfidf_300": lambda: TfidfVectorizer(max_features=300),  # as artifacts/tfidf_vectorizer.joblib
+    "tfidf_full": lambda: TfidfVectorizer(ngram_range=(1, 2)),  # same n-grams as the hashing branch
+}
+
+
+def synthetic_corpus(docs, scale, seed=42):
+    rng = np.random.default_rng(seed)
+    corpus = list(docs)
+    words = [doc.split() for doc in docs]
+    for _ in range(scale - 1):
+        corpus.extend(" ".join(rng.permutation(w)) for w in words)
+    return corpus
+
+
+def measure(run):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = run()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak / 1e6
+
+
+def cv_auc(df, y, text=None):
+    transformers = [("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL)]
+    if text is not None:
+        transformers.append(("text", text, TEXT_COLUMN))
+    model = Pipeline([
+        ("bins", QuantileBinner()),
+        ("onehot", ColumnTransformer(transformers=transformers)),
+        ("logreg", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+    scores = cross_val_score(model, df, y, scoring="roc_auc", cv=StratifiedKFold(5, shuffle=True, random_state=42))
+    return round(float(scores.mean()), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--output", default="benchmarks/text_features.json")
+    args = parser.parse_args()
+
+    df = load_dataset(INPUT_FILE)
+    df[["Saving accounts", "Checking account"]] = df[["Saving accounts", "Checking account"]].fillna("unknown")
+    df[TEXT_COLUMN] = df[TEXT_COLUMN].fillna("")
+    y = df["target"].map({"good risk": 1, "bad risk": 0})
+    corpus = synthetic_corpus(df[TEXT_COLUMN].tolist(), args.scale)
+
+    results = {"one_hot_only": {"cv_auc": cv_auc(df, y)}}
+    for name, make in VECTORIZERS.items():
+        vectorizer = make()
+        X, seconds, peak_mb = measure(lambda: vectorizer.fit_transform(corpus))
+        results[name] = {
+            "features": X.shape[1],
+            "fit_transform_seconds": round(seconds, 3),
+            "docs_per_s": round(len(corpus) / seconds),
+            "peak_mb": round(peak_mb, 1),
+            "artifact_bytes": len(pickle.dumps(vectorizer, protocol=4)),
+            "cv_auc": cv_auc(df, y, make()),
+        }
+
+    report = {"documents": len(corpus), "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"📝 {len(corpus)} descriptions")
+    print(f"{'branch':>12} {'features':>9} {'docs/s':>9} {'peak MB':>8} {'artifact':>10} {'CV AUC':>7}")
+    for name, r in results.items():
+        print(f"{name:>12} {r.get('features', '-'):>9} {r.get('docs_per_s', '-'):>9} {r.get('peak_mb', '-'):>8} "
+              f"{r.get('artifact_bytes', '-'):>10} {r['cv_auc']:>7}")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
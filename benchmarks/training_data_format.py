@@ -0,0 +1,99 @@
+"""Training data on disk and in RAM: dense CSV (old) vs sparse CSR .npz (preprocess_for_sagemaker.py).
+
+Run from the repo root (after python preprocess_for_sagemaker.py):
+    python -m benchmarks.training_data_format [--scale 1000] [--repeat 3]
+
+--scale N stacks the training rows N times (800 rows -> N * 800) to see how it grows.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from train_logreg import load_split
+from training_data import save_sparse
+
+TRAIN_DIR = "dataset_for_sagemaker/train"
+NAME = "train_data_sagemaker"
+
+
+def best_of(repeat, load):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        X, y = load()
+        times.append(time.perf_counter() - start)
+    return min(times), X
+
+
+def in_memory_mb(X):
+    if sp.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1e6
+    return X.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmarks/training_data_format.json")
+    args = parser.parse_args()
+
+    X, y = load_split(TRAIN_DIR, NAME)
+    X = sp.vstack([X] * args.scale, format="csr")
+    y = np.tile(y.values, args.scale)
+
+    # Write both formats the way preprocess_for_sagemaker.py does
+    work_dir = tempfile.mkdtemp()
+    csv_dir, npz_dir = os.path.join(work_dir, "csv"), os.path.join(work_dir, "npz")
+    os.makedirs(csv_dir)
+    os.makedirs(npz_dir)
+    dense = pd.DataFrame(X.toarray())
+    dense["target"] = y
+    dense.to_csv(os.path.join(csv_dir, f"{NAME}.csv"), index=False, header=False)
+    del dense
+    save_sparse(os.path.join(npz_dir, f"{NAME}.npz"), X, y)
+
+    csv_time, csv_X = best_of(args.repeat, lambda: load_split(csv_dir, NAME))
+    npz_time, npz_X = best_of(args.repeat, lambda: load_split(npz_dir, NAME))
+    assert np.array_equal(csv_X.values, npz_X.toarray()), "formats disagree"
+
+    result = {
+        "rows": X.shape[0],
+        "columns": X.shape[1],
+        "density": round(X.nnz / (X.shape[0] * X.shape[1]), 4),
+        "dense_csv": {
+            "disk_mb": round(os.path.getsize(os.path.join(csv_dir, f"{NAME}.csv")) / 1e6, 3),
+            "load_seconds": round(csv_time, 4),
+            "memory_mb": round(in_memory_mb(csv_X), 3),
+        },
+        "sparse_npz": {
+            "disk_mb": round(os.path.getsize(os.path.join(npz_dir, f"{NAME}.npz")) / 1e6, 3),
+            "load_seconds": round(npz_time, 4),
+            "memory_mb": round(in_memory_mb(npz_X), 3),
+        },
+    }
+    shutil.rmtree(work_dir)
+    for key in ("disk_mb", "load_seconds", "memory_mb"):
+        result[f"{key}_ratio"] = round(result["dense_csv"][key] / max(result["sparse_npz"][key], 1e-9), 1)
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+
+    print(f"📦 {result['rows']} rows x {result['columns']} one-hot columns (density {result['density']})")
+    print(f"{'format':<12} {'disk MB':>10} {'load s':>10} {'RAM MB':>10}")
+    for name in ("dense_csv", "sparse_npz"):
+        r = result[name]
+        print(f"{name:<12} {r['disk_mb']:>10} {r['load_seconds']:>10} {r['memory_mb']:>10}")
+    print(f"⚡ CSV / npz: {result['disk_mb_ratio']}x disk, {result['load_seconds_ratio']}x load time, "
+          f"{result['memory_mb_ratio']}x RAM")
+    print(f"💾 Report saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import tempfile
+import warnings
+from contextlib import contextmanager
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # no Parquet cache, every load parses the source file
+    pa = pq = None
+try:
+    import fcntl
+except ImportError:  # Windows: no build lock, concurrent builds still never see each other's files
+    fcntl = None
+
+CACHE_DIR = "data_files/.parquet_cache"
+
+# Explicit schema for the credit risk columns: fixed-width ints and dictionary-encoded strings.
+# Columns not listed here keep the type Arrow infers.
+COLUMN_TYPES = {
+    "Age": "int16",
+    "Sex": "category",
+    "Job": "int8",
+    "Housing": "category",
+    "Saving accounts": "category",
+    "Checking account": "category",
+    "Credit amount": "int32",
+    "Duration": "int16",
+    "Purpose": "category",
+    "description": "string",
+    "target": "category",
+}
+
+
+def _arrow_type(kind):
+    if kind == "category":
+        return pa.dictionary(pa.int32(), pa.string())
+    if kind == "string":
+        return pa.string()
+    return pa.from_numpy_dtype(kind)
+
+
+def _read_source(path):
+    if path.endswith((".xlsx", ".xls")):
+        return pd.read_excel(path)
+    return pd.read_csv(path)
+
+
+def _atomic_write(path, write):
+    """write(tmp_path) to a unique temp file next to `path`, then rename it over `path`"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix="." + os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def _build_lock(stem):
+    """Exclusive lock per source file: one process builds its cache while the others wait for it"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, stem + ".lock"), "w") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+def source_hash(path):
+    """sha256 of the file contents, memoized on (size, mtime) in a sidecar so it is hashed once"""
+    stat = os.stat(path)
+    meta_path = os.path.join(CACHE_DIR, os.path.basename(path) + ".meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get("path") == os.path.abspath(path) and meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+            return meta["sha256"]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump({"path": os.path.abspath(path), "size": stat.st_size,
+                       "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}, f)
+
+    _atomic_write(meta_path, write)
+    return digest.hexdigest()
+
+
+def to_arrow(df):
+    """DataFrame -> Arrow table with COLUMN_TYPES applied"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fields = [
+        pa.field(field.name, _arrow_type(COLUMN_TYPES[field.name])) if field.name in COLUMN_TYPES else field
+        for field in table.schema
+    ]
+    return table.cast(pa.schema(fields))
+
+
+def cached_parquet_path(path):
+    """Parquet copy of `path`, (re)built when the source content hash changes.
+
+    Safe with several processes loading the same file (e.g. the shards of a run): the build is
+    done under a per-file lock by the first one, the others wait and reuse it.
+    """
+    stem = os.path.basename(path)
+    with _build_lock(stem):
+        digest = source_hash(path)
+        parquet_path = os.path.join(CACHE_DIR, f"{stem}.{digest[:16]}.parquet")
+        if not os.path.exists(parquet_path):
+            for old in os.listdir(CACHE_DIR):
+                if old.startswith(stem + ".") and old.endswith(".parquet"):
+                    os.remove(os.path.join(CACHE_DIR, old))
+            table = to_arrow(_read_source(path))
+            _atomic_write(parquet_path, lambda tmp_path: pq.write_table(table, tmp_path, compression="zstd"))
+    return parquet_path
+
+
+def load_dataset(path, columns=None, memory_map=False, categorical=False):
+    """Load a CSV/Excel data file through its Parquet cache.
+
+    - columns: only read these columns (projection happens in the Parquet reader).
+    - memory_map: memory-map the Parquet file instead of reading it into a buffer.
+    - categorical: return dictionary-encoded columns as pandas `category` (less memory);
+      by default they come back as plain strings, like pd.read_csv gives them.
+    """
+    if pq is None:
+        warnings.warn("pyarrow is not installed, reading the source file without the Parquet cache")
+        df = _read_source(path)
+        return df[columns] if columns else df
+    table = pq.read_table(cached_parquet_path(path), columns=columns, memory_map=memory_map)
+    if not categorical:
+        table = table.cast(pa.schema([
+            pa.field(f.name, f.type.value_type) if pa.types.is_dictionary(f.type) else f
+            for f in table.schema
+        ]))
+    df = table.to_pandas()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), float("nan"))  # None -> NaN, as read_csv
+    return df
+
+
+def iter_chunks(path, chunk_size=100_000, columns=None):
+    """Stream a CSV or Parquet file as DataFrames of `chunk_size` rows (memory bounded by the chunk).
+
+    No Parquet cache here (building it needs the whole file in memory); the index holds the
+    global row number, so row ids are the same as with load_dataset.
+    """
+    if path.endswith(".parquet"):
+        chunks = (batch.to_pandas() for batch in pq.ParquetFile(path).iter_batches(chunk_size, columns=columns))
+    else:
+        dtypes = {c: t for c, t in COLUMN_TYPES.items() if t not in ("category", "string") and (not columns or c in columns)}
+        chunks = pd.read_csv(path, usecols=columns, dtype=dtypes, chunksize=chunk_size)
+    offset = 0
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield chunk
+
+
+def iter_dataset(path, chunk_size=100_000, columns=None, max_rows=None):
+    """Stream a CSV/Excel data file in chunks through its Parquet cache (iter_chunks over the cached copy).
+
+    Building the cache parses the source once (an Excel file can only be read whole); every later
+    run reads it `chunk_size` rows at a time. `max_rows` stops after the first rows, like df.head.
+    """
+    if pq is None:
+        warnings.warn("pyarrow is not installed, reading the source file without the Parquet cache")
+        df = _read_source(path)
+        df = df[columns] if columns else df
+        chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+    else:
+        chunks = iter_chunks(cached_parquet_path(path), chunk_size, columns)
+    for chunk in chunks:
+        if max_rows is not None and chunk.index[-1] >= max_rows:
+            yield chunk.iloc[:max(0, max_rows - chunk.index[0])]
+            return
+        yield chunk
+
+
+def dataset_rows(path):
+    """Number of rows of a CSV/Excel data file (from the Parquet cache's metadata, nothing is read)"""
+    if pq is None:
+        return len(_read_source(path))
+    return pq.ParquetFile(cached_parquet_path(path)).metadata.num_rows
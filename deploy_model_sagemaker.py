@@ -17,6 +17,10 @@ model = SKLearnModel(
     model_data=model_s3_uri,
     role=role,
     entry_point="train_logreg.py", 
+    # risk_features.py: needed to unpickle tabular_preprocessor.joblib; inference_io.py + scoring_kernel.py:
+    # pandas-free request parsing and scoring (scoring_kernel.npz in model.tar.gz); inference_metrics.py:
+    # stage timers / counters (INFERENCE_METRICS_FILE, INFERENCE_LOG_SAMPLE_RATE in `env` to dump / log more)
+    dependencies=["risk_features.py", "inference_io.py", "scoring_kernel.py", "inference_metrics.py"],
     framework_version="1.2-1",
     sagemaker_session=sagemaker_session
 )
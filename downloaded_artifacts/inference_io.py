@@ -0,0 +1,196 @@
+import csv
+import functools
+import io
+import json
+
+import numpy as np
+
+# Request/response (de)serialization for train_logreg.py's input_fn/output_fn without pandas.
+#
+# Requests become a dict column -> numpy array, which scoring_kernel.py scores directly (predict_fn)
+# and which pd.DataFrame() accepts as is for the preprocessor fallback:
+#   text/csv               header + rows; the header -> column index mapping is cached per distinct
+#                          header line (clients send the same header on every call)
+#   application/json       columnar: {"Age": [67, 22], "Sex": ["male", "female"], ...}
+#   application/jsonlines  one record per line: {"Age": 67, "Sex": "male", ...}
+#   application/x-npy      np.save of a structured array (one field per column, no pickle): float64
+#                          and str fields are views on the request buffer, other field types are
+#                          cast to those (in the request thread, so a bad field fails that request)
+# Typing as pd.read_csv would do for the request columns: numeric columns -> float64 (empty/null ->
+# NaN), everything else -> str (empty/null -> "", unknown to the one-hot/kernel, like pandas' NaN).
+#
+# Responses: predicted class and P(good risk) per row in the same four formats (csv with header,
+# columnar json, one record per line, structured npy). encode_request/decode_response are the client
+# side (invoke_endpoint.py, benchmarks/serialization.py).
+
+NUMERIC_COLUMNS = {"Age", "Job", "Credit amount", "Duration"}
+RESPONSE_FIELDS = ("prediction", "probability")
+_NPY_HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def _media_type(content_type):
+    return content_type.split(";")[0].strip().lower()
+
+
+@functools.lru_cache(maxsize=64)
+def column_index(header):
+    """(column names, positions of the numeric ones) for a header line"""
+    columns = tuple(next(csv.reader([header])))
+    return columns, tuple(i for i, column in enumerate(columns) if column in NUMERIC_COLUMNS)
+
+
+def _to_float(values):
+    return np.array([float(v) if v else np.nan for v in values], dtype=np.float64)
+
+
+def _typed(column, values):
+    """JSON values of one column -> float64 (null -> NaN) or str (null -> "") array"""
+    if column in NUMERIC_COLUMNS:
+        try:
+            return np.array(values, dtype=np.float64)  # numbers and nulls
+        except (TypeError, ValueError):
+            return _to_float(["" if v is None else v for v in values])  # numbers sent as strings
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+
+def _canonical(column, values):
+    """npy field -> float64 (numeric columns, numbers sent as strings are parsed) or str array"""
+    if column in NUMERIC_COLUMNS:
+        if values.dtype.kind in "US":
+            return _to_float(values.astype(str).tolist())
+        return values.astype(np.float64, copy=False)
+    return values if values.dtype.kind == "U" else values.astype(str)
+
+
+def parse_csv(body):
+    """CSV body with a header line -> {column: array}. Quoted fields (e.g. descriptions) go through csv"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    header, _, rows = body.strip("\r\n").partition("\n")
+    columns, numeric = column_index(header.rstrip("\r"))
+    if '"' in rows:
+        records = [record for record in csv.reader(io.StringIO(rows)) if record]
+    else:
+        records = [line.split(",") for line in rows.splitlines() if line]
+    if any(len(record) != len(columns) for record in records):
+        raise ValueError(f"CSV rows do not match the {len(columns)} header columns")
+    values = list(zip(*records)) if records else [()] * len(columns)
+    return {column: _to_float(values[i]) if i in numeric else np.array(values[i], dtype=str)
+            for i, column in enumerate(columns)}
+
+
+def parse_json(body):
+    """Columnar JSON object: {column: [values]}, all lists of the same length"""
+    data = json.loads(body)
+    if not isinstance(data, dict) or len({len(values) for values in data.values()}) > 1:
+        raise ValueError("application/json requests must be {column: [values]} with equal-length lists")
+    return {column: _typed(column, values) for column, values in data.items()}
+
+
+def parse_jsonlines(body):
+    """One JSON object per line, every line with the keys of the first one"""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    records = [json.loads(line) for line in body.splitlines() if line.strip()]
+    columns = list(records[0]) if records else []
+    return {column: _typed(column, [record.get(column) for record in records]) for column in columns}
+
+
+def parse_npy(body):
+    """Structured .npy payload -> {field: float64 / str array}, views on the payload when already typed (no pickle)"""
+    buffer = io.BytesIO(body)
+    version = np.lib.format.read_magic(buffer)
+    if version not in _NPY_HEADER_READERS:
+        raise ValueError(f"Unsupported .npy format version {version}")
+    shape, fortran_order, dtype = _NPY_HEADER_READERS[version](buffer)
+    if dtype.names is None or dtype.hasobject or fortran_order or len(shape) != 1:
+        raise ValueError("application/x-npy requests must be a 1-d structured array without objects")
+    array = np.frombuffer(body, dtype=dtype, count=shape[0], offset=buffer.tell())
+    return {name: _canonical(name, array[name]) for name in dtype.names}
+
+
+PARSERS = {
+    "text/csv": parse_csv,
+    "application/json": parse_json,
+    "application/jsonlines": parse_jsonlines,
+    "application/x-npy": parse_npy,
+}
+
+
+def parse_request(body, content_type):
+    parser = PARSERS.get(_media_type(content_type))
+    if parser is None:
+        raise ValueError(f"Unsupported content type: {content_type}")
+    return parser(body)
+
+
+def format_response(prediction, accept):
+    """{"prediction": classes, "probability": P(good risk)} -> (body, content type)"""
+    accept = _media_type(accept)
+    labels = np.asarray(prediction["prediction"]).astype(np.int64).tolist()
+    probs = np.asarray(prediction["probability"], dtype=np.float64)
+    if accept == "application/json":
+        return json.dumps({"prediction": labels, "probability": probs.tolist()}), accept
+    if accept == "application/jsonlines":
+        lines = (f'{{"prediction": {label}, "probability": {prob!r}}}\n' for label, prob in zip(labels, probs.tolist()))
+        return "".join(lines), accept
+    if accept == "text/csv":
+        lines = (f"{label},{prob!r}\n" for label, prob in zip(labels, probs.tolist()))
+        return "prediction,probability\n" + "".join(lines), accept
+    if accept == "application/x-npy":
+        array = np.empty(len(labels), dtype=[("prediction", np.int8), ("probability", np.float64)])
+        array["prediction"], array["probability"] = labels, probs
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        return buffer.getvalue(), accept
+    raise ValueError(f"Unsupported response type: {accept}")
+
+
+def num_rows(columns):
+    return len(next(iter(columns.values()))) if columns else 0
+
+
+# --- client side ---
+
+def encode_request(frame, content_type):
+    """DataFrame of request columns -> body in `content_type` (what parse_request reads back)"""
+    content_type = _media_type(content_type)
+    if content_type == "text/csv":
+        return frame.to_csv(index=False)
+    nullable = frame.astype(object).where(frame.notna(), None)  # NaN -> JSON null
+    if content_type == "application/json":
+        return json.dumps({column: nullable[column].tolist() for column in frame.columns})
+    if content_type == "application/jsonlines":
+        return nullable.to_json(orient="records", lines=True)
+    if content_type == "application/x-npy":
+        columns = {column: frame[column].to_numpy(dtype=np.float64) if column in NUMERIC_COLUMNS
+                   else frame[column].fillna("").to_numpy(dtype=str) for column in frame.columns}
+        array = np.empty(len(frame), dtype=[(column, values.dtype) for column, values in columns.items()])
+        for column, values in columns.items():
+            array[column] = values
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        return buffer.getvalue()
+    raise ValueError(f"Unsupported content type: {content_type}")
+
+
+def decode_response(body, content_type):
+    """Response body -> {"prediction": int64 array, "probability": float64 array}"""
+    content_type = _media_type(content_type)
+    if content_type == "application/x-npy":
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+        return {"prediction": array["prediction"].astype(np.int64), "probability": array["probability"]}
+    if isinstance(body, bytes):
+        body = body.decode("utf-8")
+    if content_type == "application/json":
+        data = json.loads(body)
+    elif content_type == "application/jsonlines":
+        records = [json.loads(line) for line in body.splitlines() if line]
+        data = {field: [record[field] for record in records] for field in RESPONSE_FIELDS}
+    elif content_type == "text/csv":
+        rows = [line.split(",") for line in body.splitlines()[1:] if line]
+        data = {"prediction": [row[0] for row in rows], "probability": [row[1] for row in rows]}
+    else:
+        raise ValueError(f"Unsupported response type: {content_type}")
+    return {"prediction": np.array(data["prediction"], dtype=np.int64),
+            "probability": np.array(data["probability"], dtype=np.float64)}
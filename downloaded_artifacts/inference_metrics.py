@@ -0,0 +1,138 @@
+import collections
+import json
+import os
+import random
+import threading
+import time
+
+# Lightweight instrumentation for the serving path (train_logreg.py's input_fn/predict_fn/output_fn):
+#   - per-stage timers: parse (input_fn), bin (numeric columns -> quantile bins), transform (one-hot /
+#     kernel lookups), predict (model / logit -> class + probability), serialize (output_fn);
+#     count, mean and max per stage plus p50/p99 from power-of-two nanosecond buckets (a percentile
+#     is reported as its bucket's upper bound, i.e. within 2x)
+#   - counters: requests, rows, errors and unknown_category_rows (rows with a category never seen in
+#     training or a missing numeric, which the one-hot encoder's handle_unknown="ignore" silently
+#     scores as all zeros; same count on the kernel and the preprocessor path)
+#   - sampled structured logs: one JSON line for LOG_SAMPLE_RATE of the requests instead of
+#     unconditional reprs
+#   - dumps: snapshot() as a dict (serve_local.py's GET /metrics), and every DUMP_EVERY requests to
+#     the JSON file INFERENCE_METRICS_FILE if it is set (e.g. inside the serving container)
+# Recording takes one lock acquisition per request: predict_fn's record() updates the stats under the
+# lock, input_fn and output_fn only queue their timing with defer() (a deque append, atomic under the
+# GIL), which the next record() or snapshot() folds in. benchmarks/serving_metrics.py measures the
+# per-request overhead (~3 us, a quarter of it the clock reads themselves).
+
+STAGES = ("parse", "bin", "transform", "predict", "serialize")
+COUNTERS = ("requests", "rows", "unknown_category_rows", "errors")
+LOG_SAMPLE_RATE = float(os.environ.get("INFERENCE_LOG_SAMPLE_RATE", 0.01))
+METRICS_FILE = os.environ.get("INFERENCE_METRICS_FILE")
+DUMP_EVERY = int(os.environ.get("INFERENCE_METRICS_DUMP_EVERY", 1000))
+_BUCKETS = 64  # ns.bit_length() (< 64 for any perf_counter_ns difference): bucket k holds [2**(k-1), 2**k) ns
+
+
+class ServingMetrics:
+    """Thread-safe stage timers and counters of one serving process"""
+
+    def __init__(self, sample_rate=LOG_SAMPLE_RATE, metrics_file=METRICS_FILE, dump_every=DUMP_EVERY,
+                 enabled=True):
+        self.sample_rate = sample_rate
+        self.metrics_file = metrics_file
+        self.dump_every = dump_every
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters = dict.fromkeys(COUNTERS, 0)
+            # per stage: [total ns, max ns, bucket counts...]
+            self.stages = {stage: [0] * (2 + _BUCKETS) for stage in STAGES}
+            self._predict_stages = (self.stages["bin"], self.stages["transform"], self.stages["predict"])
+            self._pending = collections.deque()
+
+    def record(self, bin_ns, transform_ns, predict_ns, rows=0, unknown_category_rows=0):
+        """predict_fn: add its stage timings (time.perf_counter_ns() differences) and the row counters,
+        plus the stages deferred so far: the one lock acquisition of a request"""
+        if not self.enabled:
+            return
+        with self._lock:
+            counters = self.counters
+            requests = counters["requests"]
+            for stats, elapsed in zip(self._predict_stages, (bin_ns, transform_ns, predict_ns)):
+                stats[0] += elapsed
+                if elapsed > stats[1]:
+                    stats[1] = elapsed
+                stats[2 + elapsed.bit_length()] += 1
+            self._drain()
+            counters["rows"] += rows
+            counters["unknown_category_rows"] += unknown_category_rows
+            dump = self.metrics_file and requests // self.dump_every < counters["requests"] // self.dump_every
+        if dump:
+            self.dump(self.metrics_file)
+
+    def defer(self, stage, elapsed):
+        """input_fn / output_fn: queue one stage timing without the lock (a "parse" counts a request)"""
+        if self.enabled:
+            self._pending.append((stage, elapsed))
+
+    def error(self, request=False):
+        """A failed handler call; request=True from input_fn, whose request has no "parse" timing"""
+        if self.enabled:
+            with self._lock:
+                self.counters["errors"] += 1
+                self.counters["requests"] += request
+
+    def _drain(self):
+        """Fold the deferred stage timings in (caller holds the lock)"""
+        pending = self._pending
+        while pending:
+            stage, elapsed = pending.popleft()
+            stats = self.stages[stage]
+            stats[0] += elapsed
+            if elapsed > stats[1]:
+                stats[1] = elapsed
+            stats[2 + elapsed.bit_length()] += 1
+            if stage == "parse":
+                self.counters["requests"] += 1
+
+    def sampled(self):
+        """True for ~sample_rate of the calls: emit the structured log line of this request"""
+        return self.enabled and random.random() < self.sample_rate
+
+    def snapshot(self):
+        with self._lock:
+            self._drain()
+            counters = dict(self.counters)
+            stages = {}
+            for stage, (total_ns, max_ns, *histogram) in self.stages.items():
+                count = sum(histogram)
+                stages[stage] = {
+                    "count": count,
+                    "mean_us": round(total_ns / count / 1e3, 3) if count else None,
+                    "p50_us": _percentile_us(histogram, count, 0.50),
+                    "p99_us": _percentile_us(histogram, count, 0.99),
+                    "max_us": round(max_ns / 1e3, 3),
+                }
+        return {"uptime_s": round(time.time() - self.started, 3), "counters": counters, "stages": stages}
+
+    def dump(self, path):
+        """snapshot() to `path` as JSON (written to a temp file and renamed: readers never see half a file)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+
+def _percentile_us(histogram, count, q):
+    if not count:
+        return None
+    seen = 0
+    for bucket, n in enumerate(histogram):
+        seen += n
+        if seen >= q * count:
+            return round(2 ** bucket / 1e3, 3)
+
+
+# One instance per serving process, shared by the handlers
+METRICS = ServingMetrics()
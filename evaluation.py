@@ -0,0 +1,155 @@
+import argparse
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Bootstrap confidence intervals for the test metrics (200 test rows: a single AUC is too noisy to
+# decide whether to promote a model). Fully vectorized:
+#   - scores are sorted once and grouped by distinct value (ties count 1/2 in the AUC)
+#   - a block of resamples is an index matrix -> per-row counts (bincount), so resample b is a vector
+#     of weights over the sorted rows
+#   - per group positives/negatives (reduceat) + cumulative sums give, for every resample at once,
+#     the AUC and the confusion matrix at every threshold of the sweep
+# Class 1 = good risk (as in preprocess_for_sagemaker.py), predicted good when P(good) > threshold
+# (= model.predict at 0.5).
+#
+#   python evaluation.py downloaded_artifacts/predictions.csv   # -> downloaded_artifacts/evaluation.json
+
+RESAMPLES = 10_000
+CONFIDENCE = 0.95
+THRESHOLD = 0.5
+THRESHOLDS = np.round(np.arange(0.05, 0.951, 0.05), 2)
+BLOCK_ELEMENTS = 2 ** 22  # resamples x rows per block (bounds the index matrix memory)
+METRICS = ["bad_risk_recall", "good_risk_precision", "good_risk_recall", "bad_risk_precision", "accuracy"]
+
+
+def bootstrap_counts(n, resamples, rng):
+    """(resamples, n) matrix: how many times each row is drawn in each resample"""
+    idx = rng.integers(0, n, size=(resamples, n)) + np.arange(resamples)[:, None] * n
+    return np.bincount(idx.ravel(), minlength=resamples * n).reshape(resamples, n)
+
+
+def _metrics(weights, positive, starts, cuts):
+    """AUC (per resample) and threshold metrics (per resample x threshold) for weighted sorted rows"""
+    P = np.add.reduceat(weights * positive, starts, axis=1)
+    N = np.add.reduceat(weights * ~positive, starts, axis=1)
+    cP, cN = np.cumsum(P, axis=1), np.cumsum(N, axis=1)
+    total_P, total_N = cP[:, -1], cN[:, -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # each negative: positives with a higher score + half of the tied ones
+        auc = (N * (cP - P + 0.5 * P)).sum(axis=1) / (total_P * total_N)
+        # rows predicted good at each threshold = groups with score > threshold (a prefix of the sorted groups)
+        zero = np.zeros((len(weights), 1))
+        tp = np.hstack([zero, cP])[:, cuts]       # good predicted good
+        fp = np.hstack([zero, cN])[:, cuts]       # bad predicted good
+        tn, fn = total_N[:, None] - fp, total_P[:, None] - tp
+        values = {
+            "bad_risk_recall": tn / (tn + fp),
+            "good_risk_precision": tp / (tp + fp),
+            "good_risk_recall": tp / (tp + fn),
+            "bad_risk_precision": tn / (tn + fn),
+            "accuracy": (tp + tn) / (tp + tn + fp + fn),
+        }
+    return auc, values
+
+
+def _interval(estimate, samples, confidence):
+    tail = 100 * (1 - confidence) / 2
+    with warnings.catch_warnings():  # undefined in every resample (e.g. precision when nothing is predicted good)
+        warnings.simplefilter("ignore", RuntimeWarning)
+        low, high = np.nanpercentile(samples, [tail, 100 - tail], axis=0)
+        std = np.nanstd(samples, axis=0)
+    return {"estimate": estimate, "low": low, "high": high, "std": std}
+
+
+def _round(value):
+    return None if np.isnan(value) else round(float(value), 5)
+
+
+def evaluate(y_true, y_prob, resamples=RESAMPLES, thresholds=THRESHOLDS, threshold=THRESHOLD,
+             confidence=CONFIDENCE, seed=42):
+    """Point estimates + percentile bootstrap intervals: AUC, metrics at `threshold` and the threshold sweep"""
+    score = np.asarray(y_prob, dtype=float)
+    order = np.argsort(-score, kind="mergesort")
+    score, positive = score[order], np.asarray(y_true)[order] == 1
+    new_group = np.r_[True, score[1:] != score[:-1]]
+    starts = np.flatnonzero(new_group)
+    levels = score[starts]  # distinct scores, descending
+    thresholds = np.union1d(thresholds, [threshold])
+    cuts = np.searchsorted(-levels, -thresholds, side="left")  # groups with score > threshold
+
+    n = len(score)
+    auc, values = _metrics(np.ones((1, n)), positive, starts, cuts)
+    estimates = {"auc": auc}
+    estimates.update(values)
+
+    rng = np.random.default_rng(seed)
+    block = max(1, BLOCK_ELEMENTS // n)
+    samples = {name: [] for name in estimates}
+    for start in range(0, resamples, block):
+        auc, values = _metrics(bootstrap_counts(n, min(block, resamples - start), rng), positive, starts, cuts)
+        samples["auc"].append(auc)
+        for name, value in values.items():
+            samples[name].append(value)
+    intervals = {name: _interval(estimates[name][0], np.concatenate(samples[name]), confidence)
+                 for name in estimates}
+
+    at = int(np.searchsorted(thresholds, threshold))
+    report = {
+        "rows": n,
+        "positives_good_risk": int(positive.sum()),
+        "resamples": resamples,
+        "confidence": confidence,
+        "seed": seed,
+        "threshold": threshold,
+        "auc": {key: _round(value) for key, value in intervals["auc"].items()},
+    }
+    for name in ["bad_risk_recall", "good_risk_precision"]:
+        report[name] = {key: _round(value[at]) for key, value in intervals[name].items()}
+    report["threshold_sweep"] = [
+        {"threshold": float(t), **{name: {key: _round(value[i]) for key, value in intervals[name].items()}
+                                  for name in METRICS}}
+        for i, t in enumerate(thresholds)
+    ]
+    return report
+
+
+def save_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def _format(value):
+    """Metric for the summary: None (undefined, e.g. AUC with a single class) -> n/a"""
+    return "n/a" if value is None else f"{value:.4f}"
+
+
+def format_summary(report):
+    lines = [f"📏 {report['rows']} test rows, {report['resamples']} bootstrap resamples, "
+             f"{report['confidence']:.0%} intervals"]
+    for name in ["auc", "bad_risk_recall", "good_risk_precision"]:
+        m = report[name]
+        lines.append(f"   {name}: {_format(m['estimate'])} [{_format(m['low'])}, {_format(m['high'])}]")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap evaluation of a predictions.csv (y_true, y_prob)")
+    parser.add_argument("predictions", nargs="?", default="downloaded_artifacts/predictions.csv")
+    parser.add_argument("--output", help="default: evaluation.json next to the predictions")
+    parser.add_argument("--resamples", type=int, default=RESAMPLES)
+    args = parser.parse_args()
+
+    predictions = pd.read_csv(args.predictions)
+    report = evaluate(predictions["y_true"], predictions["y_prob"], args.resamples)
+    output = args.output or os.path.join(os.path.dirname(args.predictions), "evaluation.json")
+    save_report(report, output)
+    print(format_summary(report))
+    print(f"💾 Report saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
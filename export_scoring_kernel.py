@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from data_access import load_dataset
+from scoring_kernel import KERNEL_FILE, ScoringKernel, file_sha256
+
+# Builds the lookup-table scoring kernel (scoring_kernel.py) from the trained model and the fitted
+# preprocessor, saves it next to model.joblib and checks it against the sklearn path
+# (preprocessor.transform + model.predict_proba) before it is packaged: on CHECK_FILES and on
+# edge-case rows (unseen and over-long categories, missing numerics).
+#
+#   python export_scoring_kernel.py                        # downloaded_artifacts/scoring_kernel.npz
+#   python export_scoring_kernel.py --model-dir other_dir
+
+CHECK_FILES = ["data_files/credit_risk_with_targets_cleaned_final.csv", "test_data_for_inference.csv"]
+TOLERANCE = 1e-9
+
+
+def check(kernel, preprocessor, model, df):
+    """Max |kernel - sklearn| probability difference and whether every predicted class agrees"""
+    X = preprocessor.transform(df)
+    expected = model.predict_proba(X)[:, 1]
+    got = kernel.predict_proba({column: df[column].to_numpy() for column in df.columns})
+    return float(np.abs(got - expected).max()), bool((kernel.predict(df) == model.predict(X)).all())
+
+
+def edge_cases(kernel, df):
+    """Rows the check files do not have, built from the first row of `df`: per categorical column an
+    unseen category and one longer than every known value (a lookup that cut it to the vocabulary's
+    width would hit a known one), and per binned column a missing (NaN) value"""
+    base = df.iloc[[0]]
+    rows = []
+    for column, values, _ in kernel.categorical:
+        if values.dtype.kind == "U":
+            unseen = ("unseen-category", max(values.tolist(), key=len) + "x")
+        else:  # e.g. Job
+            unseen = (values.max() + 1,)
+        for value in unseen:
+            rows.append(base.assign(**{column: value}))
+    for column, _, _ in kernel.binned:
+        rows.append(base.assign(**{column: np.nan}))
+    return pd.concat(rows, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export and verify the lookup-table scoring kernel")
+    parser.add_argument("--model-dir", default="downloaded_artifacts", help="folder with model.joblib")
+    parser.add_argument("--preprocessor", default="artifacts/tabular_preprocessor.joblib")
+    args = parser.parse_args()
+
+    model_path = os.path.join(args.model_dir, "model.joblib")
+    model = joblib.load(model_path)
+    preprocessor = joblib.load(args.preprocessor)
+    kernel = ScoringKernel.from_artifacts(preprocessor, model)
+    kernel.model_sha256 = file_sha256(model_path)  # model_fn uses the kernel without unpickling the model
+    path = os.path.join(args.model_dir, KERNEL_FILE)
+    kernel.save(path)
+    kernel = ScoringKernel.load(path, mmap=True)  # check what was written, as model_fn loads it
+
+    checks = []
+    for file in CHECK_FILES:
+        df = load_dataset(file) if file.startswith("data_files/") else pd.read_csv(file)
+        df[["Saving accounts", "Checking account"]] = df[["Saving accounts", "Checking account"]].fillna("unknown")
+        checks.append((file, df))
+    checks.append(("edge cases (unseen / over-long categories, NaN numerics)", edge_cases(kernel, checks[-1][1])))
+
+    ok = True
+    for name, df in checks:
+        max_diff, same_classes = check(kernel, preprocessor, model, df)
+        passed = max_diff <= TOLERANCE and same_classes
+        ok = ok and passed
+        print(f"{'✅' if passed else '❌'} {name}: {len(df)} rows, max |Δp| = {max_diff:.2e}, same classes: {same_classes}")
+
+    if not ok:
+        os.remove(path)
+        print("⛔ Kernel does not match the sklearn pipeline, not exported")
+        sys.exit(1)
+    print(f"✅ Saved {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import argparse
+import asyncio
+import time
+from bedrock_cache import PromptCache
+from bedrock_engine import BedrockEngine
+from bedrock_labeling import classify_batch, TEMPLATE_HASH as LABEL_TEMPLATE
+from bedrock_metrics import BedrockMetrics
+from data_access import dataset_rows, iter_dataset
+from bedrock_retry import DeadLetterStore
+from progress_journal import ProgressJournal
+from prompt_templates import DESCRIPTION
+from sharding import add_shard_arguments, compact_shard, shard_path, shard_rows
+
+# Streaming version of generate_descriptions.py + generate_risk_targets.py:
+# every row's description goes to the labeling stage as soon as it is produced, so wall-clock
+# time is ~max(stage) instead of sum(stages). Bounded queues give backpressure (a slow label
+# stage pauses the description stage) and keep the in-flight rows constant.
+# Neither the input nor the descriptions are held in memory: the input is read CHUNK_SIZE rows at a
+# time (from its Parquet cache), once to generate and once to compact, and the journals only index
+# row id -> (file offset, template), ~170 B per row. Descriptions are read back from disk when a
+# resumed row needs one and when the output is written.
+
+# Config
+NUM_ROWS = 1000   # Test 10 vs 1000 for the whole xslx
+INPUT_FILE = "data_files/credir_risk_reto.xlsx"
+OUTPUT_FILE = f"data_files/credit_risk_with_targets_pipeline_{NUM_ROWS}.csv"
+DESCRIPTIONS_JOURNAL = f"data_files/credit_risk_pipeline_descriptions_{NUM_ROWS}.journal.jsonl"
+TARGETS_JOURNAL = f"data_files/credit_risk_pipeline_targets_{NUM_ROWS}.journal.jsonl"
+DEAD_LETTERS_FILE = f"data_files/credit_risk_pipeline_{NUM_ROWS}.dead_letters.jsonl"
+METRICS_FILE = f"data_files/credit_risk_pipeline_{NUM_ROWS}.metrics.json"  # + .prom
+METRICS_EVERY = 60  # seconds between metric dumps during the run
+REGION = "us-west-2"
+MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
+CACHE_FILE = "data_files/bedrock_cache.sqlite"
+
+# Stage 1: descriptions
+DESCRIPTION_MAX_TOKENS = 250
+DESCRIPTION_TEMPERATURE = 0.7
+DESCRIPTION_CONCURRENCY = 16
+DESCRIPTION_RPM = 100
+
+# Stage 2: labels (batched, see bedrock_labeling.py)
+LABEL_MAX_TOKENS = 10
+LABEL_TEMPERATURE = 0.0
+LABEL_CONCURRENCY = 4
+LABEL_RPM = 100
+BATCH_SIZE = 20
+BATCH_WAIT = 2.0  # max seconds a partial batch waits for more descriptions
+
+QUEUE_SIZE = 64  # bounded queues between stages (backpressure)
+CHUNK_SIZE = 10_000  # input rows read at a time
+TOKENS_PER_MINUTE = 200_000
+
+
+# Template hashes recorded with every journaled row (a new template version redoes the rows)
+DESCRIPTION_TEMPLATE = DESCRIPTION.hash
+TARGET_TEMPLATE = f"{DESCRIPTION.hash}|{LABEL_TEMPLATE}"
+
+
+async def take_batch(queue, size, wait):
+    """Take up to `size` items, waiting at most `wait` seconds after the first one.
+
+    Returns (items, finished) where finished means the end-of-stream marker was reached.
+    """
+    first = await queue.get()
+    if first is None:
+        return [], True
+    items = [first]
+    deadline = asyncio.get_running_loop().time() + wait
+    while len(items) < size:
+        timeout = deadline - asyncio.get_running_loop().time()
+        if timeout <= 0:
+            break
+        try:
+            item = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            break
+        if item is None:
+            return items, True
+        items.append(item)
+    return items, False
+
+
+def input_chunks(path, total_rows, shard, shards, chunk_size=CHUNK_SIZE):
+    """The first `total_rows` input rows that belong to the shard, `chunk_size` rows at a time"""
+    for chunk in iter_dataset(path, chunk_size, max_rows=total_rows):
+        yield chunk.loc[shard_rows(chunk.index, shard, shards)] if shards > 1 else chunk
+
+
+async def run_pipeline(chunks, total, description_engine, label_engine, descriptions, targets, dead_letters,
+                       row_ids=None):
+    """Run both stages over the rows of `chunks` (DataFrames, read lazily) that are in `row_ids`
+    (default: rows not labeled yet and not dead-lettered); `total` is only for the progress lines"""
+    row_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    label_queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    start_time = time.time()
+    counters = {"described": 0, "labeled": 0}
+
+    async def produce():
+        dead = set(dead_letters.unresolved())
+        wanted = None if row_ids is None else set(row_ids)
+        for chunk in chunks:
+            if wanted is None:
+                pending = [i for i in targets.pending(chunk.index, template=TARGET_TEMPLATE) if i not in dead]
+            else:
+                pending = [i for i in chunk.index if i in wanted]
+            for item in DESCRIPTION.iter_render(chunk.loc[pending], chunk_size=QUEUE_SIZE):  # lazily
+                await row_queue.put(item)
+        for _ in range(DESCRIPTION_CONCURRENCY):
+            await row_queue.put(None)
+
+    async def describe():
+        while True:
+            item = await row_queue.get()
+            if item is None:
+                return
+            i, prompt = item
+            if not descriptions.pending([i], template=DESCRIPTION_TEMPLATE):
+                await label_queue.put((i, descriptions.value(i)))
+                continue
+            try:
+                desc = await description_engine.invoke(prompt)
+                descriptions.record(i, desc, template=DESCRIPTION_TEMPLATE)
+                counters["described"] += 1
+                print(f"[{i+1}/{total}] 📝 {desc}")
+                await label_queue.put((i, desc))
+            except Exception as e:
+                dead_letters.add(i, "description", e)
+                print(f"[{i+1}/{total}] ❌ Description ERROR: {e}")
+
+    async def label():
+        finished = False
+        while not finished:
+            batch, finished = await take_batch(label_queue, BATCH_SIZE, BATCH_WAIT)
+            if not batch:
+                continue
+            results = await classify_batch(label_engine, [desc for _, desc in batch])
+            for (i, _), (target, error, _) in zip(batch, results):
+                if error is None:
+                    targets.record(i, target, template=TARGET_TEMPLATE)
+                    dead_letters.resolve(i)
+                    print(f"[{i+1}/{total}] ✅ {target}")
+                else:
+                    dead_letters.add(i, "target", error)
+                    print(f"[{i+1}/{total}] ❌ Label ERROR: {error}")
+                counters["labeled"] += 1
+            elapsed = time.time() - start_time
+            print(f"⏳ {counters['labeled']} labeled, {counters['described']} described in {round(elapsed / 60, 1)} min "
+                  f"| queues: rows={row_queue.qsize()} labels={label_queue.qsize()}")
+
+    describers = [asyncio.ensure_future(describe()) for _ in range(DESCRIPTION_CONCURRENCY)]
+    labelers = [asyncio.ensure_future(label()) for _ in range(LABEL_CONCURRENCY)]
+    await produce()
+    await asyncio.gather(*describers)
+    for _ in range(LABEL_CONCURRENCY):
+        await label_queue.put(None)
+    await asyncio.gather(*labelers)
+
+
+if __name__ == "__main__":
+    # Sharding: python generate_dataset_pipeline.py --shard 0/4 [--region ...] [--model-id ...]
+    args = add_shard_arguments(argparse.ArgumentParser(description="Descriptions + labels in one streaming run")).parse_args()
+    shard, shards = args.shard
+    region = args.region or REGION
+    model_id = args.model_id or MODEL_ID
+    output_file, descriptions_journal, targets_journal, dead_letters_file, metrics_file = (
+        shard_path(path, shard, shards)
+        for path in (OUTPUT_FILE, DESCRIPTIONS_JOURNAL, TARGETS_JOURNAL, DEAD_LETTERS_FILE, METRICS_FILE)
+    )
+
+    # Client (throttling retries are handled by the engines, not botocore). The AWS SDK is imported
+    # here so run_pipeline can be imported (repair_dead_letters.py, local checks) without it.
+    import boto3
+    from botocore.config import Config
+    client = boto3.client(
+        "bedrock-runtime",
+        region_name=region,
+        config=Config(
+            max_pool_connections=DESCRIPTION_CONCURRENCY + LABEL_CONCURRENCY * 2,
+            retries={"max_attempts": 1, "mode": "standard"}
+        )
+    )
+    cache = PromptCache(CACHE_FILE)
+    metrics = BedrockMetrics()
+    description_engine = BedrockEngine(
+        client, model_id, max_tokens=DESCRIPTION_MAX_TOKENS, temperature=DESCRIPTION_TEMPERATURE,
+        requests_per_minute=DESCRIPTION_RPM, tokens_per_minute=TOKENS_PER_MINUTE,
+        max_concurrency=DESCRIPTION_CONCURRENCY, cache=cache, metrics=metrics, stage="descriptions"
+    )
+    label_engine = BedrockEngine(
+        client, model_id, max_tokens=LABEL_MAX_TOKENS, temperature=LABEL_TEMPERATURE,
+        requests_per_minute=LABEL_RPM, tokens_per_minute=TOKENS_PER_MINUTE,
+        max_concurrency=LABEL_CONCURRENCY * 2, cache=cache, metrics=metrics, stage="targets"
+    )
+
+    total_rows = min(NUM_ROWS, dataset_rows(INPUT_FILE))
+    if shards > 1:
+        print(f"🧱 Shard {shard}/{shards} of {total_rows} rows ({region}, {model_id})")
+
+    descriptions = ProgressJournal(descriptions_journal)
+    targets = ProgressJournal(targets_journal)
+    dead_letters = DeadLetterStore(dead_letters_file)
+    print(f"🔄 {len(targets)} rows already labeled, {len(descriptions)} already described")
+
+    start_time = time.time()
+    metrics.start_periodic_dump(metrics_file, METRICS_EVERY)
+    asyncio.run(run_pipeline(input_chunks(INPUT_FILE, total_rows, shard, shards), total_rows,
+                             description_engine, label_engine, descriptions, targets, dead_letters))
+    description_engine.close()
+    label_engine.close()
+    metrics.stop_periodic_dump()
+    metrics.dump(metrics_file)
+    metrics.print_summary()
+
+    # Final save: descriptions + targets in original row order, a second pass over the input chunks
+    def with_descriptions(chunks):
+        for chunk in chunks:
+            yield chunk.assign(description=descriptions.values(chunk.index))
+
+    chunks = with_descriptions(input_chunks(INPUT_FILE, total_rows, shard, shards))
+    saved = compact_shard(targets, chunks, "target", output_file, shard, shards, total_rows)
+    descriptions.close()
+    targets.close()
+    failed = len(dead_letters.unresolved())
+    dead_letters.close()
+
+    print(f"🗃️ Cache: {cache.stats()}")
+    cache.close()
+    print(f"\n✅ Done. Final file: {output_file} ({saved} rows)")
+    if failed:
+        print(f"☠️ {failed} rows dead-lettered in {dead_letters_file} -> python repair_dead_letters.py pipeline"
+              + (f" --shard {shard}/{shards}" if shards > 1 else ""))
+    if shards > 1:
+        print(f"🧱 When every shard is done: python merge_shards.py {OUTPUT_FILE} {shards}")
+    print(f"⚡ Total time: {round((time.time() - start_time)/60, 2)} minutes")
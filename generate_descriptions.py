@@ -1,117 +1,151 @@
+import argparse
+import asyncio
 import boto3
-import pandas as pd
-import json
 import time
+from botocore.config import Config
+from bedrock_cache import PromptCache
+from bedrock_engine import BedrockEngine
+from bedrock_metrics import BedrockMetrics
+from data_access import load_dataset
+from bedrock_retry import DeadLetterStore, RetryPolicy
+from progress_journal import ProgressJournal
+from sharding import add_shard_arguments, compact_shard, shard_path, shard_rows
+from prompt_templates import DESCRIPTION
 
 # Configuration variables
 NUM_ROWS = 1000   # Test 10 vs 1000 for the whole xslx
 
 INPUT_FILE = "data_files/credir_risk_reto.xlsx"
 OUTPUT_CSV = f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.csv"
+JOURNAL_FILE = f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.journal.jsonl"
+DEAD_LETTERS_FILE = f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.dead_letters.jsonl"
+METRICS_FILE = f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.metrics.json"  # + .prom
+METRICS_EVERY = 60  # seconds between metric dumps during the run
 
 REGION = "us-west-2"
 # MODEL_ID = "anthropic.claude-instant-v1"
 MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0" # Cheaper, faster and better for structured generation than instant
 
 MAX_TOKENS = 250
-# SLEEP_TIME = 0.7  # (100 RPM as an initial value)
-SLEEP_TIME = 0  # (incremented to 1M RPM)
-
-# AWS Bedrock Client
-client = boto3.client("bedrock-runtime", region_name=REGION)
-
-# Prompt generator
-def build_prompt(row):
-    return (
-        "Write a short, fluent sentence that assesses the applicant's creditworthiness. "
-        "Avoid starting with generic phrases like 'Based on the information'. "
-        "Be clear, direct, and sound like a human credit analyst.\n\n"
-        "Here are the applicant’s details:\n"
-        f"- Age: {row['Age']}\n"
-        f"- Sex: {row['Sex']}\n"
-        f"- Job: {row['Job']}\n"
-        f"- Housing: {row['Housing']}\n"
-        f"- Saving accounts: {row['Saving accounts']}\n"
-        f"- Checking account: {row['Checking account']}\n"
-        f"- Credit amount: {row['Credit amount']}\n"
-        f"- Duration: {row['Duration']}\n"
-        f"- Purpose: {row['Purpose']}"
-    )
-
-# Bedrock Call
-def query_bedrock(prompt):
-    body = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "messages": [
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": MAX_TOKENS,
-        "temperature": 0.7
-    }
-
-    response = client.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(body),
-        contentType="application/json",
-        accept="application/json"
-    )
-
-    result = json.loads(response["body"].read())
-    return result["content"][0]["text"]
+TEMPERATURE = 0.7
+
+# Rate limits (set them to the account quotas of MODEL_ID)
+REQUESTS_PER_MINUTE = 100
+TOKENS_PER_MINUTE = 200_000
+INITIAL_CONCURRENCY = 4
+MAX_CONCURRENCY = 32
+
+# Prompt/response cache (FRESH_SAMPLES=True forces new generations at TEMPERATURE > 0)
+CACHE_FILE = "data_files/bedrock_cache.sqlite"
+CACHE_MAX_ENTRIES = 1_000_000
+CACHE_MAX_AGE_DAYS = 90
+FRESH_SAMPLES = False
+
+# Retries per error class (throttling, unavailable, server, timeout, connection, ...);
+# rows that exhaust them go to DEAD_LETTERS_FILE -> python repair_dead_letters.py descriptions
+RETRY_BUDGETS = {"throttling": 8, "unavailable": 5, "server": 3, "timeout": 3, "connection": 5}
+
+# Sharding across processes/machines (e.g. one region or account per shard):
+#   python generate_descriptions.py --shard 0/4 [--region us-east-1] [--model-id ...]
+# then merge the parts: python merge_shards.py <OUTPUT_CSV> 4
+args = add_shard_arguments(argparse.ArgumentParser(description="Generate the 'description' column with Bedrock")).parse_args()
+SHARD, SHARDS = args.shard
+REGION = args.region or REGION
+MODEL_ID = args.model_id or MODEL_ID
+MERGED_CSV = OUTPUT_CSV
+OUTPUT_CSV, JOURNAL_FILE, DEAD_LETTERS_FILE, METRICS_FILE = (
+    shard_path(path, SHARD, SHARDS) for path in (OUTPUT_CSV, JOURNAL_FILE, DEAD_LETTERS_FILE, METRICS_FILE)
+)
+
+# AWS Bedrock Client (throttling retries are handled by the engine, not botocore)
+client = boto3.client(
+    "bedrock-runtime",
+    region_name=REGION,
+    config=Config(max_pool_connections=MAX_CONCURRENCY, retries={"max_attempts": 1, "mode": "standard"})
+)
+
+# Bedrock engine (async, rate-limited and adaptive)
+metrics = BedrockMetrics()
+cache = PromptCache(CACHE_FILE, max_entries=CACHE_MAX_ENTRIES, max_age_days=CACHE_MAX_AGE_DAYS, fresh_samples=FRESH_SAMPLES)
+engine = BedrockEngine(
+    client,
+    MODEL_ID,
+    max_tokens=MAX_TOKENS,
+    temperature=TEMPERATURE,
+    requests_per_minute=REQUESTS_PER_MINUTE,
+    tokens_per_minute=TOKENS_PER_MINUTE,
+    initial_concurrency=INITIAL_CONCURRENCY,
+    max_concurrency=MAX_CONCURRENCY,
+    retry_policy=RetryPolicy(RETRY_BUDGETS),
+    cache=cache,
+    metrics=metrics,
+    stage="descriptions"
+)
 
 # Processing
-df = pd.read_excel(INPUT_FILE)
+df = load_dataset(INPUT_FILE)  # Parquet cache of the xlsx (parsed once)
 
 if NUM_ROWS < len(df):
     df = df.head(NUM_ROWS)
 
-descriptions = []
 df_len = len(df)
+if SHARDS > 1:
+    df = df.loc[shard_rows(df.index, SHARD, SHARDS)]  # keeps the original row ids
+    print(f"🧱 Shard {SHARD}/{SHARDS}: {len(df)} of {df_len} rows ({REGION}, {MODEL_ID})")
 
 start_time = time.time()
-checkpoints = [20 * i for i in range(1, (df_len // 20) + 2)]
-
-# Load saved progress if file exists
-try:
-    existing_df = pd.read_csv(OUTPUT_CSV)
-    existing_descriptions = existing_df["description"].tolist()
-    start_index = len(existing_descriptions)
-    print(f"🔄 Resuming from row {start_index}")
-except FileNotFoundError:
-    existing_descriptions = []
-    start_index = 0
-    print("🔄 No existing CSV found, starting from scratch.")
-
-# Main loop
-
-for i in range(start_index, df_len):
-    row = df.iloc[i]
-    prompt = build_prompt(row)
-    try:
-        desc = query_bedrock(prompt)
+
+# Load saved progress (exact by row id) from the journal
+journal = ProgressJournal(JOURNAL_FILE)
+dead_letters = DeadLetterStore(DEAD_LETTERS_FILE)
+dead = set(dead_letters.unresolved())  # left to repair_dead_letters.py
+row_ids = [i for i in journal.pending(df.index.tolist(), template=DESCRIPTION.hash) if i not in dead]
+if len(journal):
+    print(f"🔄 Resuming: {len(journal)} rows already done, {len(row_ids)} pending")
+else:
+    print("🔄 No journal found, starting from scratch.")
+print(f"🧩 Prompt template: {DESCRIPTION.hash}")
+
+# Main loop (each finished row is appended to the journal as soon as it completes)
+prompts = DESCRIPTION.render_column(df.loc[row_ids]).tolist()
+done = 0
+
+def on_result(j, desc, error):
+    global done
+    i = row_ids[j]
+    done += 1
+    if error is None:
         print(f"[{i+1}/{df_len}] ✅ {desc}")
-    except Exception as e:
-        desc = "ERROR"
-        print(f"[{i+1}/{df_len}] ❌ ERROR: {e}")
-    existing_descriptions.append(desc)
-
-    # Save progress every 20 rows
-    if (i + 1) % 20 == 0 or (i + 1) == df_len:
-        df_partial = df.head(i + 1).copy()
-        df_partial["description"] = existing_descriptions
-        df_partial.to_csv(OUTPUT_CSV, index=False)
-        print(f"💾 Autosaved {i+1} rows to: {OUTPUT_CSV}")
+        journal.record(i, desc, template=DESCRIPTION.hash)
+    else:
+        print(f"[{i+1}/{df_len}] ❌ ERROR: {error}")
+        dead_letters.add(i, "description", error)
 
     # Estimate remaining time
     elapsed = time.time() - start_time
-    avg_time = elapsed / (i - start_index + 1)
-    est_remaining = avg_time * (df_len - (i + 1))
+    est_remaining = elapsed / done * (len(row_ids) - done)
     print(f"⏳ Estimated time remaining: {round(est_remaining / 60, 1)} minutes")
 
-# Final save
-df["description"] = descriptions
-df.to_csv(OUTPUT_CSV, index=False)
+metrics.start_periodic_dump(METRICS_FILE, METRICS_EVERY)
+asyncio.run(engine.run(prompts, on_result=on_result))
+engine.close()
+metrics.stop_periodic_dump()
+metrics.dump(METRICS_FILE)
+metrics.print_summary()
+print(f"🗃️ Cache: {cache.stats()}")
+cache.close()
+
+# Final save (compact the journal into the output CSV)
+saved = compact_shard(journal, df, "description", OUTPUT_CSV, SHARD, SHARDS, df_len)
+journal.close()
+failed = len(dead_letters.unresolved())
+dead_letters.close()
 
 end_time = time.time()
-print(f"\n✅ Saved final file as: {OUTPUT_CSV}")
+print(f"\n✅ Saved final file as: {OUTPUT_CSV} ({saved} rows)")
+if failed:
+    print(f"☠️ {failed} rows dead-lettered in {DEAD_LETTERS_FILE} -> python repair_dead_letters.py descriptions"
+          + (f" --shard {SHARD}/{SHARDS}" if SHARDS > 1 else ""))
+if SHARDS > 1:
+    print(f"🧱 When every shard is done: python merge_shards.py {MERGED_CSV} {SHARDS}")
 print(f"⚡ Total time: {round((end_time - start_time)/60, 2)} minutes")
\ No newline at end of file
@@ -1,96 +1,132 @@
+import argparse
+import asyncio
 import boto3
-import pandas as pd
-import json
 import time
-import os
+from botocore.config import Config
+from bedrock_cache import PromptCache
+from bedrock_engine import BedrockEngine
+from bedrock_labeling import classify_all, TEMPLATE_HASH as LABEL_TEMPLATE
+from bedrock_metrics import BedrockMetrics
+from data_access import load_dataset
+from bedrock_retry import DeadLetterStore
+from progress_journal import ProgressJournal
+from sharding import add_shard_arguments, compact_shard, shard_path, shard_rows
 
 # Config
 NUM_ROWS = 1000   # Test 10 vs 1000 for the whole xslx
 INPUT_FILE = "data_files/credit_risk_with_descriptions_cleaned.csv"
 OUTPUT_FILE = f"data_files/credit_risk_with_targets_{NUM_ROWS}.csv"
+JOURNAL_FILE = f"data_files/credit_risk_with_targets_{NUM_ROWS}.journal.jsonl"
+DEAD_LETTERS_FILE = f"data_files/credit_risk_with_targets_{NUM_ROWS}.dead_letters.jsonl"
+METRICS_FILE = f"data_files/credit_risk_with_targets_{NUM_ROWS}.metrics.json"  # + .prom
+METRICS_EVERY = 60  # seconds between metric dumps during the run
 REGION = "us-west-2"
 MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
-MAX_TOKENS = 10  # keep small
+MAX_TOKENS = 10  # keep small (single-item requests)
 TEMPERATURE = 0.0
-SAVE_EVERY = 20
+CACHE_FILE = "data_files/bedrock_cache.sqlite"  # TEMPERATURE=0.0 -> labels are served from disk on reruns
 
-# Client
-client = boto3.client("bedrock-runtime", region_name=REGION)
+# Batching: BATCH_SIZE descriptions per request (1 = one request per description).
+# Items missing/invalid in a batched answer are retried one by one.
+# Speed-up and agreement vs single-item labeling: python -m benchmarks.batched_labels
+BATCH_SIZE = 20
+REQUESTS_PER_MINUTE = 100
+TOKENS_PER_MINUTE = 200_000
+MAX_CONCURRENCY = 8
 
-# Prompt builder
-def build_prompt(description):
-    return (
-        "Read this creditworthiness assessment and classify it as either 'good risk' or 'bad risk'. "
-        "Respond with ONLY one of those two labels.\n\n"
-        "Be very critic, you are the most experienced risk evaluator in the world. Your decision is the final one."
-        f"Assessment: \"{description}\"\n\n"
-        "Label:"
-    )
+# Sharding across processes/machines (e.g. one region or account per shard):
+#   python generate_risk_targets.py --shard 0/4 [--region us-east-1] [--model-id ...]
+# then merge the parts: python merge_shards.py <OUTPUT_FILE> 4
+args = add_shard_arguments(argparse.ArgumentParser(description="Generate the 'target' column (good/bad risk) with Bedrock")).parse_args()
+SHARD, SHARDS = args.shard
+REGION = args.region or REGION
+MODEL_ID = args.model_id or MODEL_ID
+MERGED_FILE = OUTPUT_FILE
+OUTPUT_FILE, JOURNAL_FILE, DEAD_LETTERS_FILE, METRICS_FILE = (
+    shard_path(path, SHARD, SHARDS) for path in (OUTPUT_FILE, JOURNAL_FILE, DEAD_LETTERS_FILE, METRICS_FILE)
+)
 
-# Bedrock call
-def classify_description(prompt):
-    body = {
-        "anthropic_version": "bedrock-2023-05-31",
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": MAX_TOKENS,
-        "temperature": TEMPERATURE
-    }
-    response = client.invoke_model(
-        modelId=MODEL_ID,
-        body=json.dumps(body),
-        contentType="application/json",
-        accept="application/json"
-    )
-    result = json.loads(response["body"].read())
-    return result["content"][0]["text"].strip().lower()
+# Client (throttling retries are handled by the engine, not botocore)
+client = boto3.client(
+    "bedrock-runtime",
+    region_name=REGION,
+    config=Config(max_pool_connections=MAX_CONCURRENCY * 2, retries={"max_attempts": 1, "mode": "standard"})
+)
+cache = PromptCache(CACHE_FILE)
+metrics = BedrockMetrics()
+engine = BedrockEngine(
+    client,
+    MODEL_ID,
+    max_tokens=MAX_TOKENS,
+    temperature=TEMPERATURE,
+    requests_per_minute=REQUESTS_PER_MINUTE,
+    tokens_per_minute=TOKENS_PER_MINUTE,
+    max_concurrency=MAX_CONCURRENCY * 2,
+    cache=cache,
+    metrics=metrics,
+    stage="targets"
+)
 
 # Load original file
-df = pd.read_csv(INPUT_FILE)
-descriptions = df["description"].tolist()
-total = len(descriptions)
+df = load_dataset(INPUT_FILE)
+total = len(df)
+if SHARDS > 1:
+    df = df.loc[shard_rows(df.index, SHARD, SHARDS)]  # keeps the original row ids
+    print(f"🧱 Shard {SHARD}/{SHARDS}: {len(df)} of {total} rows ({REGION}, {MODEL_ID})")
 
-# Resume if possible
-if os.path.exists(OUTPUT_FILE):
-    existing = pd.read_csv(OUTPUT_FILE)
-    targets = existing["target"].tolist()
-    start = len(targets)
-    print(f"🔄 Resuming from row {start}")
+# Resume if possible (exact by row id)
+journal = ProgressJournal(JOURNAL_FILE)
+dead_letters = DeadLetterStore(DEAD_LETTERS_FILE)
+dead = set(dead_letters.unresolved())  # left to repair_dead_letters.py
+row_ids = [i for i in journal.pending(df.index.tolist(), template=LABEL_TEMPLATE) if i not in dead]
+if len(journal):
+    print(f"🔄 Resuming: {len(journal)} rows already done, {len(row_ids)} pending")
 else:
-    targets = []
-    start = 0
     print("🆕 Starting from scratch")
 
 start_time = time.time()
+done = 0
 
-# Main loop
-for i in range(start, total):
-    prompt = build_prompt(descriptions[i])
-    try:
-        label = classify_description(prompt)
-        if label not in ["good risk", "bad risk"]:
-            print(f"[{i+1}/{total}] ⚠️ Unexpected output: {label}")
-            label = "ERROR"
-        else:
-            print(f"[{i+1}/{total}] ✅ {label}")
-    except Exception as e:
-        label = "ERROR"
-        print(f"[{i+1}/{total}] ❌ ERROR: {e}")
-    targets.append(label)
-
-    # Save every 20 rows
-    if (i + 1) % SAVE_EVERY == 0 or (i + 1) == total:
-        df_partial = df.iloc[:i+1].copy()
-        df_partial["target"] = targets
-        df_partial.to_csv(OUTPUT_FILE, index=False)
-        print(f"💾 Saved {i+1} rows to: {OUTPUT_FILE}")
+# One fsync'd journal record per row, as each batch comes back
+def on_result(j, label, error):
+    global done
+    i = row_ids[j]
+    done += 1
+    if error is None:
+        print(f"[{i+1}/{total}] ✅ {label}")
+        journal.record(i, label, template=LABEL_TEMPLATE)
+    else:
+        print(f"[{i+1}/{total}] ❌ ERROR: {error}")
+        dead_letters.add(i, "target", error)
 
     # Estimate time
     elapsed = time.time() - start_time
-    avg = elapsed / (i - start + 1)
-    eta = avg * (total - (i + 1))
+    eta = elapsed / done * (len(row_ids) - done)
     print(f"⏳ ETA: {round(eta/60, 1)} min")
 
+# Main loop
+descriptions = df.loc[row_ids, "description"].tolist()
+metrics.start_periodic_dump(METRICS_FILE, METRICS_EVERY)
+asyncio.run(classify_all(engine, descriptions, batch_size=BATCH_SIZE, concurrency=MAX_CONCURRENCY, on_result=on_result))
+engine.close()
+metrics.stop_periodic_dump()
+metrics.dump(METRICS_FILE)
+
+# Final save (compact the journal into the output CSV)
+saved = compact_shard(journal, df, "target", OUTPUT_FILE, SHARD, SHARDS, total)
+journal.close()
+failed = len(dead_letters.unresolved())
+dead_letters.close()
+
 # Final log
+metrics.print_summary()
+print(f"🗃️ Cache: {cache.stats()}")
+cache.close()
 end_time = time.time()
-print(f"\n✅ Done. Final file: {OUTPUT_FILE}")
-print(f"⚡ Total time: {round((end_time - start_time)/60, 2)} minutes")
\ No newline at end of file
+print(f"\n✅ Done. Final file: {OUTPUT_FILE} ({saved} rows)")
+if failed:
+    print(f"☠️ {failed} rows dead-lettered in {DEAD_LETTERS_FILE} -> python repair_dead_letters.py targets"
+          + (f" --shard {SHARD}/{SHARDS}" if SHARDS > 1 else ""))
+if SHARDS > 1:
+    print(f"🧱 When every shard is done: python merge_shards.py {MERGED_FILE} {SHARDS}")
+print(f"⚡ Total time: {round((end_time - start_time)/60, 2)} minutes")
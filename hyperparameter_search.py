@@ -0,0 +1,85 @@
+import time
+import warnings
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+# Search over C x penalty x class_weight for train_logreg.py (--search true), stratified K-fold CV.
+# One task = one (penalty, class_weight, fold): it walks the C values from the strongest to the
+# weakest regularization with warm_start, so each fit starts from the previous solution (few
+# iterations per step) instead of from zero. Tasks run in parallel with joblib (n_jobs cores).
+
+C_VALUES = [0.001, 0.003, 0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0]
+PENALTIES = ["l2", "l1"]
+CLASS_WEIGHTS = ["balanced", None]
+SOLVERS = {"l2": "lbfgs", "l1": "saga"}  # both support warm_start (liblinear does not)
+
+
+def make_model(C=1.0, penalty="l2", class_weight="balanced", max_iter=1000, warm_start=False):
+    return LogisticRegression(C=C, penalty=penalty, solver=SOLVERS[penalty], class_weight=class_weight,
+                              max_iter=max_iter, warm_start=warm_start)
+
+
+def regularization_path(X, y, train, valid, penalty, class_weight, c_values, max_iter, warm_start=True):
+    """Validation AUC, fit time and iterations for each C (ascending) on one fold"""
+    model = make_model(penalty=penalty, class_weight=class_weight, max_iter=max_iter, warm_start=warm_start)
+    path = []
+    for C in sorted(c_values):
+        model.set_params(C=C)
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ConvergenceWarning)
+            start = time.perf_counter()
+            model.fit(X[train], y[train])
+            seconds = time.perf_counter() - start
+        path.append({
+            "C": C,
+            "seconds": round(seconds, 4),
+            "n_iter": int(model.n_iter_[0]),
+            "converged": not any(issubclass(w.category, ConvergenceWarning) for w in caught),
+            "auc": float(roc_auc_score(y[valid], model.decision_function(X[valid]))),
+        })
+    return path
+
+
+def search(X, y, c_values=C_VALUES, penalties=PENALTIES, class_weights=CLASS_WEIGHTS, folds=5, max_iter=1000,
+           n_jobs=-1, warm_start=True, random_state=42):
+    """Returns (selected, candidates, fold results).
+
+    selected: best mean validation AUC (ties -> smaller C, i.e. more regularized), candidates: mean/std
+    AUC and total fit time per configuration, fold results: one entry per (configuration, fold).
+    """
+    X = X.to_numpy() if hasattr(X, "to_numpy") else X
+    y = np.asarray(y)
+    splits = list(StratifiedKFold(folds, shuffle=True, random_state=random_state).split(np.zeros(len(y)), y))
+    tasks = [(penalty, class_weight, fold) for penalty in penalties for class_weight in class_weights
+             for fold in range(folds)]
+    paths = Parallel(n_jobs=n_jobs)(
+        delayed(regularization_path)(X, y, *splits[fold], penalty, class_weight, c_values, max_iter, warm_start)
+        for penalty, class_weight, fold in tasks
+    )
+
+    fold_results = []
+    by_config = {}
+    for (penalty, class_weight, fold), path in zip(tasks, paths):
+        for step in path:
+            fold_results.append({"penalty": penalty, "class_weight": class_weight, "fold": fold, **step})
+            by_config.setdefault((penalty, class_weight, step["C"]), []).append(step)
+
+    candidates = []
+    for (penalty, class_weight, C), steps in by_config.items():
+        aucs = [step["auc"] for step in steps]
+        candidates.append({
+            "penalty": penalty,
+            "class_weight": class_weight,
+            "C": C,
+            "mean_auc": round(float(np.mean(aucs)), 5),
+            "std_auc": round(float(np.std(aucs)), 5),
+            "seconds": round(sum(step["seconds"] for step in steps), 4),
+            "converged": all(step["converged"] for step in steps),
+        })
+    selected = max(candidates, key=lambda c: (c["mean_auc"], -c["C"]))
+    return selected, candidates, fold_results
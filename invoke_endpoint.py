@@ -19,10 +19,13 @@ response = runtime.invoke_endpoint(
 )
 
 # === Parse and display results ===
+# Also accepted: application/json (columnar), application/jsonlines, application/x-npy
+# (inference_io.encode_request builds them from the DataFrame, decode_response reads any Accept type)
 result = response["Body"].read().decode("utf-8")
-predictions = json.loads(result)  # Parse string like "[1, 0, 1]"
+predictions = json.loads(result)  # {"prediction": [1, 0, ...], "probability": [0.83, 0.41, ...]}
 
-df["prediction"] = predictions
+df["prediction"] = predictions["prediction"]
+df["probability"] = predictions["probability"]  # P(good risk)
 
 print("✅ Predictions:")
 print(df)
\ No newline at end of file
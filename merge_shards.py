@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+from sharding import merge_parts, shard_path
+
+# Reassembles the output parts of a sharded generation run (--shard k/N) into the single file the
+# unsharded run would have written, in original row order, after checking that every input row
+# is there exactly once. --allow-missing only tolerates rows that were not generated: duplicated
+# rows, rows in the wrong shard and missing parts always stop the merge.
+#
+#   python merge_shards.py data_files/credit_risk_with_descriptions_1000.csv 4
+#   python merge_shards.py data_files/credit_risk_with_targets_1000.csv 4 --allow-missing
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the output parts of a sharded generation run")
+    parser.add_argument("output", help="output file of the unsharded run (the parts are output.shard-k-of-N.ext)")
+    parser.add_argument("shards", type=int, help="N, number of shards the run used")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="write the merged file even if rows are missing (e.g. still dead-lettered); "
+                             "duplicated or misplaced rows and missing parts still fail")
+    args = parser.parse_args()
+
+    print(f"🧱 Merging {args.shards} parts: {shard_path(args.output, 0, args.shards)} ...")
+    df, problems, missing = merge_parts(args.output, args.shards)
+    for problem in problems:
+        print(f"❌ {problem}")
+    for problem in missing:
+        print(f"{'⚠️' if args.allow_missing else '❌'} {problem}")
+    if problems:
+        print("⛔ Inconsistent parts, nothing written (rerun or fix the listed shards)")
+        sys.exit(1)
+    if missing and not args.allow_missing:
+        print("⛔ Incomplete run, nothing written (repair the shards or use --allow-missing)")
+        sys.exit(1)
+
+    tmp_path = args.output + ".tmp"
+    if args.output.endswith(".parquet"):
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, args.output)
+    print(f"✅ Saved {args.output} ({len(df)} rows)")
+
+
+if __name__ == "__main__":
+    main()
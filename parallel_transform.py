@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+import warnings
+
+import numpy as np
+
+from training_data import clear_split, part_path, save_sparse
+
+# Process-parallel transform with an already fitted preprocessor. The preprocessor (and, for
+# in-memory frames, the rows themselves) are put in module globals *before* the pool forks, so
+# every worker inherits them copy-on-write: a task is just (partition, row range), nothing is
+# re-pickled per task. Each worker writes its own .npz partition (training_data.py format), which
+# train_logreg.py reads directly.
+
+_shared = {}  # inherited by the forked workers
+
+
+def _fork_context(workers):
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        warnings.warn("fork is not available on this platform, transforming in a single process")
+        return None
+    return multiprocessing.get_context("fork") if workers > 1 else None
+
+
+def _transform_rows(task):
+    part, start, stop, path = task
+    X_raw, y = _shared["X"], _shared["y"]
+    X = _shared["preprocessor"].transform(X_raw.iloc[start:stop])
+    save_sparse(path, X, y.iloc[start:stop])
+    return stop - start
+
+
+def _transform_chunk(task):
+    rows, target, path = task
+    save_sparse(path, _shared["preprocessor"].transform(rows), target)
+    return len(rows)
+
+
+def transform_frame(preprocessor, X_raw, y, directory, name, partitions, workers=None):
+    """Transform an in-memory frame into `partitions` .npz files using `workers` processes.
+
+    Returns the number of rows written. Partition i holds the i-th contiguous block of rows, so
+    reading the partitions in order gives back the original row order.
+    """
+    workers = workers or os.cpu_count()
+    os.makedirs(directory, exist_ok=True)
+    clear_split(directory, name)
+    bounds = np.linspace(0, len(X_raw), partitions + 1).astype(int)
+    tasks = [(i, bounds[i], bounds[i + 1], part_path(directory, name, i)) for i in range(partitions)]
+
+    _shared.update(preprocessor=preprocessor, X=X_raw, y=y)
+    try:
+        context = _fork_context(workers)
+        if context is None:
+            return sum(map(_transform_rows, tasks))
+        with context.Pool(min(workers, partitions)) as pool:
+            return sum(pool.imap_unordered(_transform_rows, tasks))
+    finally:
+        _shared.clear()
+
+
+def transform_chunks(preprocessor, tasks, workers=None, max_in_flight=None):
+    """Transform a stream of (rows, target, output path) tasks, e.g. chunks read from disk.
+
+    Only the chunk itself travels to the worker; at most `max_in_flight` chunks (default 2 per
+    worker) are pending at once, so memory stays bounded by the chunk size.
+    """
+    workers = workers or os.cpu_count()
+    _shared.update(preprocessor=preprocessor)
+    try:
+        context = _fork_context(workers)
+        if context is None:
+            return sum(map(_transform_chunk, tasks))
+        max_in_flight = max_in_flight or 2 * workers
+        total = 0
+        pending = []
+        with context.Pool(workers) as pool:
+            for task in tasks:
+                pending.append(pool.apply_async(_transform_chunk, (task,)))
+                while len(pending) >= max_in_flight:
+                    total += pending.pop(0).get()
+            total += sum(result.get() for result in pending)
+        return total
+    finally:
+        _shared.clear()
@@ -0,0 +1,142 @@
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+from data_access import iter_chunks
+from quantile_sketch import QuantileSketch
+from risk_features import BINS, TEXT_COLUMN, QuantileBinner, text_features
+from parallel_transform import transform_chunks
+from training_data import clear_split, part_path
+
+# Out-of-core version of preprocess_for_sagemaker.py for files that do not fit in memory.
+# Peak memory is one chunk (+ its one-hot matrix) plus the sketches and category domains.
+#
+#   Pass 1: stream the train rows -> quantile sketches of the binned columns + category domains
+#   Pass 2: stream again -> transform with the fitted preprocessor in --workers processes -> one .npz
+#           partition per chunk
+#
+# Differences with the in-memory script:
+#   - train/test split by a hash of the row id (TEST_PERCENT of rows, not stratified exactly)
+#   - bin edges from quantile_sketch.py: each edge is within +-eps of the exact qcut quantile, in
+#     rank (eps <= (log2(n/k) + 1) / k, printed per column); exact when n <= SKETCH_K
+#
+# --text-features adds the hashed description branch (risk_features.py): it is stateless, so pass 1
+# does not read the text at all and pass 2 only hashes each chunk.
+#
+#   python preprocess_chunked.py data_files/credit_risk_with_targets_cleaned_final.csv --chunk-size 200000
+
+OUTPUT_DIR = "dataset_for_sagemaker"
+PREPROCESSOR_FILE = "artifacts/tabular_preprocessor.joblib"
+COLUMNS = ["Age", "Sex", "Job", "Housing", "Saving accounts", "Checking account",
+           "Credit amount", "Duration", "Purpose", "target"]
+CATEGORICAL = ["Sex", "Job", "Housing", "Saving accounts", "Checking account", "Purpose"]
+TEST_PERCENT = 20
+SKETCH_K = 4096
+
+
+def is_test(row_ids):
+    """Deterministic hash split on the global row id (same rows end up in test on every run)"""
+    h = np.asarray(row_ids, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)  # Fibonacci hashing
+    return (h >> np.uint64(40)) % np.uint64(100) < np.uint64(TEST_PERCENT)
+
+
+def clean(chunk):
+    chunk[["Saving accounts", "Checking account"]] = chunk[["Saving accounts", "Checking account"]].fillna("unknown")
+    chunk["target"] = chunk["target"].map({"good risk": 1, "bad risk": 0})
+    return chunk
+
+
+def fit_pass(path, chunk_size):
+    sketches = {column: QuantileSketch(SKETCH_K) for column in BINS}
+    domains = {column: set() for column in CATEGORICAL}
+    rows = 0
+    for chunk in iter_chunks(path, chunk_size, COLUMNS):
+        train = clean(chunk)[~is_test(chunk.index)]
+        rows += len(train)
+        for column, sketch in sketches.items():
+            sketch.update(train[column].to_numpy())
+        for column, domain in domains.items():
+            domain.update(train[column].dropna().unique().tolist())
+    return sketches, domains, rows
+
+
+def build_preprocessor(sketches, domains, text=False):
+    """Same Pipeline as preprocess_for_sagemaker.py, fitted from the sketches/domains instead of the data"""
+    edges = {column: sketches[column].quantiles(np.linspace(0, 1, len(labels) + 1))
+             for column, (_, labels) in BINS.items()}
+    binner = QuantileBinner.from_edges(edges)
+    categorical_cols = CATEGORICAL + [binned for binned, _ in BINS.values()]
+    categories = [sorted(domains[column]) for column in CATEGORICAL] + [sorted(labels) for _, labels in BINS.values()]
+    transformers = [("cat", OneHotEncoder(categories=categories, handle_unknown="ignore"), categorical_cols)]
+    if text:
+        transformers.append(("text", text_features(), TEXT_COLUMN))
+    encoder = ColumnTransformer(transformers=transformers)
+    # the encoder only needs a frame with the right columns: one row per category is enough
+    size = max(len(c) for c in categories)
+    sample = {column: [values[i % len(values)] for i in range(size)] for column, values in zip(categorical_cols, categories)}
+    if text:
+        sample[TEXT_COLUMN] = [""] * size
+    encoder.fit(pd.DataFrame(sample))
+    return Pipeline([("bins", binner), ("onehot", encoder)])
+
+
+def transform_pass(path, chunk_size, preprocessor, workers=1, columns=COLUMNS):
+    """Chunks are read here and transformed by `workers` forked processes (parallel_transform.py)"""
+    counts = {"train": 0, "test": 0}
+    for split in counts:
+        os.makedirs(f"{OUTPUT_DIR}/{split}", exist_ok=True)
+        clear_split(f"{OUTPUT_DIR}/{split}", f"{split}_data_sagemaker")
+
+    def tasks(labels):
+        for part, chunk in enumerate(iter_chunks(path, chunk_size, columns)):
+            chunk = clean(chunk)
+            test = is_test(chunk.index)
+            for split, rows in (("train", chunk[~test]), ("test", chunk[test])):
+                if len(rows):
+                    counts[split] += len(rows)
+                    yield (rows.drop(columns="target"), rows["target"].to_numpy(),
+                           part_path(f"{OUTPUT_DIR}/{split}", f"{split}_data_sagemaker", part))
+            chunk.loc[test, "target"].to_csv(labels, index=False, header=False)
+
+    with open(f"{OUTPUT_DIR}/test/y_test_true_labels.csv", "w") as labels:
+        labels.write("target\n")
+        transform_chunks(preprocessor, tasks(labels), workers)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chunked (out-of-core) preprocessing for SageMaker")
+    parser.add_argument("input", nargs="?", default="data_files/credit_risk_with_targets_cleaned_final.csv")
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes for pass 2")
+    parser.add_argument("--text-features", action="store_true", help="add hashed description features")
+    args = parser.parse_args()
+    start_time = time.time()
+
+    sketches, domains, rows = fit_pass(args.input, args.chunk_size)
+    preprocessor = build_preprocessor(sketches, domains, args.text_features)
+    print(f"📏 Pass 1: {rows} train rows sketched")
+    for column, sketch in sketches.items():
+        edges = preprocessor.named_steps["bins"].edges_[column]
+        print(f"   {column}: edges {np.round(edges, 2).tolist()} (rank error <= {sketch.epsilon():.4%})")
+
+    os.makedirs(os.path.dirname(PREPROCESSOR_FILE), exist_ok=True)
+    with open(PREPROCESSOR_FILE, "wb") as f:
+        pickle.Pickler(f, protocol=4).dump(preprocessor)
+
+    columns = COLUMNS + [TEXT_COLUMN] if args.text_features else COLUMNS
+    counts = transform_pass(args.input, args.chunk_size, preprocessor, args.workers, columns)
+    print(f"✅ Pass 2: {counts['train']} train / {counts['test']} test rows written as partitions in {OUTPUT_DIR}/")
+    print(f"- {PREPROCESSOR_FILE}")
+    print(f"⚡ Total time: {round(time.time() - start_time, 2)} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,25 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
 from scipy.sparse import hstack
 import pickletools
 import pickle
 import joblib
 import os
+from data_access import load_dataset
+from risk_features import TEXT_COLUMN, QuantileBinner, text_features
+from training_data import clear_split, save_sparse
+from parallel_transform import transform_frame
 
 # Load data
 FILE = "data_files/credit_risk_with_targets_cleaned_final.csv"
-df = pd.read_csv(FILE)
+COLUMNS = ["Age", "Sex", "Job", "Housing", "Saving accounts", "Checking account",
+           "Credit amount", "Duration", "Purpose", "target"]
+# True: add hashed uni/bigrams of the Bedrock 'description' next to the one-hot block (risk_features.py).
+# Requests to the endpoint must then include the description column; export_scoring_kernel.py refuses it.
+TEXT_FEATURES = False
+df = load_dataset(FILE, columns=COLUMNS + [TEXT_COLUMN] if TEXT_FEATURES else COLUMNS)
 
 # Step 1: Fill missing values
 df["Saving accounts"].fillna("unknown", inplace=True)
@@ -26,29 +36,21 @@ X_train_raw, X_test_raw, y_train, y_test = train_test_split(
     random_state=42
 )
 
-# ✅ Step 3: Transform train and test separately
-def transform_raw_data(X):
-    X = X.copy()
-    X["Credit_bin"] = pd.qcut(X["Credit amount"], q=4, labels=["low", "mid-low", "mid-high", "high"])
-    X["Age_bin"] = pd.qcut(X["Age"], q=4, labels=["young", "mid-young", "mid-old", "old"])
-    X["Duration_bin"] = pd.qcut(X["Duration"], q=4, labels=["short", "mid-short", "mid-long", "long"])
-    X.drop(columns=["Credit amount", "Age", "Duration"], inplace=True)
-    return X[
-        ["Sex", "Job", "Housing", "Saving accounts", "Checking account", "Purpose", "Credit_bin", "Age_bin", "Duration_bin"]
-    ]
-
-X_train = transform_raw_data(X_train_raw)
-X_test = transform_raw_data(X_test_raw)
-
-# ✅ Step 4: Preprocessing (all categorical)
-categorical_cols = X_train.columns.tolist()
-
-preprocessor = ColumnTransformer(transformers=[
-    ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols),
+# ✅ Step 3 + 4: Quantile bins (edges fitted on train only, see risk_features.py) + one-hot (all categorical)
+categorical_cols = ["Sex", "Job", "Housing", "Saving accounts", "Checking account", "Purpose",
+                    "Credit_bin", "Age_bin", "Duration_bin"]
+
+transformers = [("cat", OneHotEncoder(handle_unknown="ignore"), categorical_cols)]
+if TEXT_FEATURES:
+    # stateless hashing: nothing learned from the text, output sparse-hstacked after the one-hot columns
+    transformers.append(("text", text_features(), TEXT_COLUMN))
+
+preprocessor = Pipeline([
+    ("bins", QuantileBinner()),
+    ("onehot", ColumnTransformer(transformers=transformers)),
 ])
 
-X_train_final = preprocessor.fit_transform(X_train)
-X_test_final = preprocessor.transform(X_test)
+preprocessor.fit(X_train_raw)  # test rows are binned with the train edges
 
 # ✅ Step 5: Save artifacts
 os.makedirs("artifacts", exist_ok=True)
@@ -64,22 +66,38 @@ with open("artifacts/tabular_preprocessor.joblib", "rb") as f:
 print(f"✅ Saved tabular_preprocessor.joblib using pickle protocol: {protocol_version}")
 
 # ✅ Step 6: Save train/test files
+# "npz": sparse CSR (one-hot matrix stays sparse end to end, train_logreg.py reads it as is)
+# "csv": old dense float text (every zero written out), kept for tools that need CSV (the built-in
+#        XGBoost job of train_model_sagemaker.py)
+OUTPUT_FORMAT = "npz"
+# PARTITIONS > 1 (npz only): rows split in .part-*.npz files transformed by WORKERS forked processes
+PARTITIONS = 1
+WORKERS = os.cpu_count()
+
+def save_dense(path, X, y):
+    df_out = pd.DataFrame(X.toarray() if hasattr(X, "toarray") else X)
+    df_out["target"] = y.values
+    df_out.to_csv(path, index=False, header=False)
+
 os.makedirs("dataset_for_sagemaker/train", exist_ok=True)
 os.makedirs("dataset_for_sagemaker/test", exist_ok=True)
 
-train_df = pd.DataFrame(X_train_final.toarray() if hasattr(X_train_final, "toarray") else X_train_final)
-train_df["target"] = y_train.values
-train_df.to_csv("dataset_for_sagemaker/train/train_data_sagemaker.csv", index=False, header=False)
-
-test_df = pd.DataFrame(X_test_final.toarray() if hasattr(X_test_final, "toarray") else X_test_final)
-test_df["target"] = y_test.values
-test_df.to_csv("dataset_for_sagemaker/test/test_data_sagemaker.csv", index=False, header=False)
+save = save_sparse if OUTPUT_FORMAT == "npz" else save_dense
+for split, X_raw, y in [("train", X_train_raw, y_train), ("test", X_test_raw, y_test)]:
+    if OUTPUT_FORMAT == "npz" and PARTITIONS > 1:
+        transform_frame(preprocessor, X_raw, y, f"dataset_for_sagemaker/{split}", f"{split}_data_sagemaker",
+                        PARTITIONS, WORKERS)
+        continue
+    # upload_dataset_to_s3.py uploads the whole folder: drop other formats/partitions so they are not uploaded too
+    clear_split(f"dataset_for_sagemaker/{split}", f"{split}_data_sagemaker")
+    save(f"dataset_for_sagemaker/{split}/{split}_data_sagemaker.{OUTPUT_FORMAT}", preprocessor.transform(X_raw), y)
 
 # Save true test labels for AUC
 y_test.to_csv("dataset_for_sagemaker/test/y_test_true_labels.csv", index=False)
 
 print("✅ Preprocessing complete. Saved:")
-print("- train/train_data_sagemaker.csv")
-print("- test/test_data_sagemaker.csv")
+suffix = f".part-*.{OUTPUT_FORMAT} ({PARTITIONS} partitions)" if OUTPUT_FORMAT == "npz" and PARTITIONS > 1 else f".{OUTPUT_FORMAT}"
+print(f"- train/train_data_sagemaker{suffix}")
+print(f"- test/test_data_sagemaker{suffix}")
 print("- test/y_test_true_labels.csv")
-print("- artifacts/tabular_preprocessor.joblib")
\ No newline at end of file
+print("- artifacts/tabular_preprocessor.joblib" + (" (with hashed description features)" if TEXT_FEATURES else ""))
\ No newline at end of file
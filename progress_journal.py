@@ -0,0 +1,130 @@
+import json
+import os
+
+import pandas as pd
+
+
+class ProgressJournal:
+    """Append-only JSONL journal with one fsync'd record per finished row id.
+
+    Replaces rewriting the whole output CSV every few rows: appending is O(1) per row, a crash
+    can at most lose the line being written, and resuming is exact by row id. `compact`
+    materializes the final CSV/Parquet once at the end.
+
+    Memory: only row id -> (file offset of its last record, template) is kept, ~170 B per row;
+    values stay on disk and are read back by offset (`value`, `values`, `compact`).
+    """
+
+    def __init__(self, path, key="row_id"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.key = key
+        self.index = {}
+        self._templates = {}  # one string per template, shared by the index entries
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None  # torn last line from a crash, that row is simply redone
+                    if record is not None:
+                        self._index(record, offset)
+                    offset += len(line)
+        self.file = open(path, "ab")
+        if self.file.tell() > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.file.write(b"\n")  # terminate the torn line so the next record stays parseable
+        self._reader = None
+
+    def _index(self, record, offset):
+        template = record.get("template")
+        self.index[record[self.key]] = (offset, self._templates.setdefault(template, template))
+
+    def __contains__(self, row_id):
+        return row_id in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def pending(self, row_ids, template=None):
+        """Row ids that still have no record, or whose record was made with another `template`.
+
+        e.g. pending(ids, template=DESCRIPTION.hash) also redoes rows made with another prompt template.
+        """
+        index = self.index
+        return [
+            row_id for row_id in row_ids
+            if row_id not in index or (template is not None and index[row_id][1] != template)
+        ]
+
+    def record(self, row_id, value, **extra):
+        record = {self.key: row_id, "value": value, **extra}
+        offset = self.file.tell()
+        self.file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self._index(record, offset)
+
+    def read(self, row_id):
+        """The last record of `row_id`, read back from the file"""
+        if self._reader is None:
+            self._reader = open(self.path, "rb")
+        self._reader.seek(self.index[row_id][0])
+        return json.loads(self._reader.readline())
+
+    def value(self, row_id):
+        return self.read(row_id)["value"]
+
+    def values(self, row_ids):
+        """Journaled value per row id (None for rows without a record)"""
+        return [self.value(row_id) if row_id in self.index else None for row_id in row_ids]
+
+    def compact(self, chunks, column, output_path, row_id_column=None):
+        """Write the journaled rows of `chunks` (in original order) with `column` filled in.
+
+        `chunks` is a DataFrame or an iterable of DataFrames (e.g. data_access.iter_dataset), written
+        one at a time: memory is bounded by the chunk, not the output. The file type follows the
+        extension (.parquet or .csv) and is written to a temp file first, so the previous output is
+        never left half-written. `row_id_column` also writes the row ids (e.g. for shard parts that
+        are merged later).
+        """
+        if isinstance(chunks, pd.DataFrame):
+            chunks = [chunks]
+        tmp_path = output_path + ".tmp"
+        parquet = output_path.endswith(".parquet")
+        writer = None
+        saved = 0
+        k = -1
+        try:
+            for k, chunk in enumerate(chunks):
+                done = chunk[[row_id in self.index for row_id in chunk.index]].copy()
+                done[column] = self.values(done.index)
+                if row_id_column:
+                    done.insert(0, row_id_column, done.index)
+                if parquet:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    table = pa.Table.from_pandas(done, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(tmp_path, table.schema)
+                    writer.write_table(table.cast(writer.schema))
+                else:
+                    done.to_csv(tmp_path, mode="a" if k else "w", header=not k, index=False)
+                saved += len(done)
+            if k < 0:  # no input rows
+                open(tmp_path, "wb").close()
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(tmp_path, output_path)
+        return saved
+
+    def close(self):
+        self.file.close()
+        if self._reader is not None:
+            self._reader.close()
@@ -0,0 +1,82 @@
+import hashlib
+import string
+
+
+class PromptTemplate:
+    """Versioned prompt template with `{column}` placeholders (str.format syntax).
+
+    `hash` identifies the exact template text; it is recorded with every generated output and
+    changes whenever the wording changes, so old and new outputs are never mixed up.
+    Rendering works on a whole DataFrame at once (`render_column`) or lazily in chunks
+    (`iter_render`) instead of building a pandas Series per row.
+    """
+
+    def __init__(self, name, version, text):
+        self.name = name
+        self.version = version
+        self.text = text
+        self.segments = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(text)
+        ]
+        self.fields = [field for _, field in self.segments if field]
+        digest = hashlib.sha256(f"{name}\n{version}\n{text}".encode("utf-8")).hexdigest()
+        self.hash = f"{name}-v{version}-{digest[:12]}"
+
+    def render(self, values):
+        """Render one prompt from a mapping (dict, pandas row, ...)"""
+        return self.text.format(**{field: values[field] for field in self.fields})
+
+    def render_column(self, df):
+        """Render one prompt per row, column-wise: one vectorized concat per template segment"""
+        columns = {field: df[field].astype(str) for field in set(self.fields)}
+        prompts = None
+        for literal, field in self.segments:
+            part = literal if field is None else literal + columns[field]
+            prompts = part if prompts is None else prompts + part
+        if isinstance(prompts, str):  # template without fields
+            prompts = df.index.to_series().map(lambda _: prompts)
+        return prompts
+
+    def iter_render(self, df, chunk_size=10_000):
+        """Yield (row_id, prompt) lazily, rendering `chunk_size` rows at a time"""
+        for start in range(0, len(df), chunk_size):
+            chunk = self.render_column(df.iloc[start:start + chunk_size])
+            yield from chunk.items()
+
+
+DESCRIPTION_V1 = PromptTemplate("description", 1, (
+    "Write a short, fluent sentence that assesses the applicant's creditworthiness. "
+    "Avoid starting with generic phrases like 'Based on the information'. "
+    "Be clear, direct, and sound like a human credit analyst.\n\n"
+    "Here are the applicant’s details:\n"
+    "- Age: {Age}\n"
+    "- Sex: {Sex}\n"
+    "- Job: {Job}\n"
+    "- Housing: {Housing}\n"
+    "- Saving accounts: {Saving accounts}\n"
+    "- Checking account: {Checking account}\n"
+    "- Credit amount: {Credit amount}\n"
+    "- Duration: {Duration}\n"
+    "- Purpose: {Purpose}"
+))
+
+LABEL_V1 = PromptTemplate("label", 1, (
+    "Read this creditworthiness assessment and classify it as either 'good risk' or 'bad risk'. "
+    "Respond with ONLY one of those two labels.\n\n"
+    "Be very critic, you are the most experienced risk evaluator in the world. Your decision is the final one."
+    "Assessment: \"{description}\"\n\n"
+    "Label:"
+))
+
+LABEL_BATCH_V1 = PromptTemplate("label_batch", 1, (
+    "Read each creditworthiness assessment below and classify it as either 'good risk' or 'bad risk'.\n\n"
+    "Be very critic, you are the most experienced risk evaluator in the world. Your decision is the final one.\n\n"
+    "Assessments:\n{items}\n\n"
+    "Respond with ONLY a JSON object mapping every item id to its label, e.g. "
+    "{{\"1\": \"good risk\", \"2\": \"bad risk\"}}."
+))
+
+# Templates in use (bump the version in a new constant instead of editing a released one)
+DESCRIPTION = DESCRIPTION_V1
+LABEL = LABEL_V1
+LABEL_BATCH = LABEL_BATCH_V1
@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+
+
+class QuantileSketch:
+    """Streaming quantile sketch with a deterministic rank-error bound (Manku-Rajagopalan-Lindsay style).
+
+    Values go into a level-0 buffer of `k` items. When a level fills up it is sorted and compacted:
+    every other item (alternating offset) moves up one level with twice the weight. Memory is
+    O(k log2(n/k)) whatever the number of values n.
+
+    Accuracy: a compaction at level h shifts the rank of any value by at most 2^h, and level h is
+    compacted at most n / (k 2^h) times, so compactions add at most n * log2(n/k) / k of rank
+    error; picking a stored item (weight <= n/k) adds at most one more item weight. As a fraction
+    of n: eps <= (log2(n/k) + 1) / k, i.e. the returned edge lies between the exact quantiles
+    q - eps and q + eps. `epsilon()` returns the bound actually accumulated for this stream, which
+    is usually lower. With k = 4096 and n = 10M: eps <= 12.3 / 4096 ~ 0.3% of the rows.
+    """
+
+    def __init__(self, k=4096):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.error = 0  # accumulated worst-case rank error (in rows)
+        self.compactions = 0
+        self.min = math.inf  # exact, kept aside from the compacted levels
+        self.max = -math.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            while len(self.levels[h]) >= self.k:
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(self.levels[h])
+                size = len(level) - len(level) % 2  # an odd item waits for the next compaction
+                offset = self.compactions % 2  # alternate to keep the error unbiased
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], level[offset:size:2]])
+                self.levels[h] = level[size:]
+                self.error += 2 ** h
+                self.compactions += 1
+            h += 1
+
+    def merge(self, other):
+        """Fold another sketch (e.g. from another partition/worker) into this one"""
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.error += other.error
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def epsilon(self):
+        """Guaranteed |rank(returned) - rank(exact)| / n for any quantile of this stream"""
+        if not self.count:
+            return 0.0
+        return (self.error + 2 ** (len(self.levels) - 1) - 1) / self.count
+
+    @staticmethod
+    def epsilon_bound(n, k):
+        """A priori bound for n values: (log2(n/k) + 1) / k (0 when everything fits in one buffer)"""
+        return (math.log2(n / k) + 1) / k if n > k else 0.0
+
+    def quantiles(self, qs):
+        """Approximate values at the quantiles `qs` (fractions in [0, 1]); min/max are exact"""
+        if len(self.levels) == 1:  # nothing compacted yet: exact, same interpolation as pd.qcut
+            return np.quantile(self.levels[0], qs)
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        values, cumulative = values[order], np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=float) * cumulative[-1]
+        result = values[np.minimum(np.searchsorted(cumulative, ranks, side="left"), len(values) - 1)]
+        result[np.asarray(qs) <= 0] = self.min
+        result[np.asarray(qs) >= 1] = self.max
+        return result
@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import time
+from bedrock_cache import PromptCache
+from bedrock_engine import BedrockEngine
+from bedrock_labeling import build_prompt, classify_all, TEMPLATE_HASH as LABEL_TEMPLATE
+from bedrock_metrics import BedrockMetrics
+from data_access import dataset_rows, load_dataset
+from bedrock_retry import DeadLetterStore, InvalidOutputError
+from progress_journal import ProgressJournal
+from prompt_templates import DESCRIPTION
+from sharding import add_shard_arguments, compact_shard, shard_path, shard_rows
+import generate_dataset_pipeline as pipeline
+
+# Reprocesses ONLY the dead-lettered row ids of a generation run (concurrently, with a fresh
+# retry budget), records the fixed rows in the run's journal and re-compacts its output.
+# Replaces auxiliar_scripts/regenerate_errors_descriptions.py / regenerate_errors_targets.py.
+#
+#   python repair_dead_letters.py descriptions   # generate_descriptions.py
+#   python repair_dead_letters.py targets        # generate_risk_targets.py
+#   python repair_dead_letters.py pipeline       # generate_dataset_pipeline.py
+#   python repair_dead_letters.py targets --shard 2/4   # dead letters of one shard
+
+NUM_ROWS = 1000
+REGION = "us-west-2"
+MODEL_ID = "anthropic.claude-3-5-haiku-20241022-v1:0"
+CACHE_FILE = "data_files/bedrock_cache.sqlite"
+REQUESTS_PER_MINUTE = 100
+TOKENS_PER_MINUTE = 200_000
+
+# Same files the generation scripts write
+RUNS = {
+    "descriptions": {
+        "input": "data_files/credir_risk_reto.xlsx",
+        "journal": f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.journal.jsonl",
+        "dead_letters": f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.dead_letters.jsonl",
+        "output": f"data_files/credit_risk_with_descriptions_{NUM_ROWS}.csv",
+    },
+    "targets": {
+        "input": "data_files/credit_risk_with_descriptions_cleaned.csv",
+        "journal": f"data_files/credit_risk_with_targets_{NUM_ROWS}.journal.jsonl",
+        "dead_letters": f"data_files/credit_risk_with_targets_{NUM_ROWS}.dead_letters.jsonl",
+        "output": f"data_files/credit_risk_with_targets_{NUM_ROWS}.csv",
+    },
+    "pipeline": {
+        "input": pipeline.INPUT_FILE,
+        "journal": pipeline.TARGETS_JOURNAL,
+        "dead_letters": pipeline.DEAD_LETTERS_FILE,
+        "output": pipeline.OUTPUT_FILE,
+        "descriptions_journal": pipeline.DESCRIPTIONS_JOURNAL,
+    },
+}
+
+
+def load_input(path):
+    df = load_dataset(path)
+    return df.head(NUM_ROWS) if NUM_ROWS < len(df) else df
+
+
+def report(i, value, error, journal, dead_letters, stage, template):
+    if error is None:
+        journal.record(i, value, template=template)
+        dead_letters.resolve(i)
+        print(f"[{i}] ✅ Fixed: {value}")
+    else:
+        dead_letters.add(i, stage, error)
+        print(f"[{i}] ❌ Still failing: {error}")
+
+
+def repair_descriptions(df, row_ids, engine, journal, dead_letters):
+    prompts = DESCRIPTION.render_column(df.loc[row_ids]).tolist()
+    asyncio.run(engine.run(
+        prompts,
+        on_result=lambda j, desc, error: report(row_ids[j], desc, error, journal, dead_letters, "description",
+                                                DESCRIPTION.hash)
+    ))
+
+
+def evict_invalid_outputs(df, row_ids, engine, dead_letters):
+    """Drop the cached answers of rows dead-lettered as invalid_output, so they are asked again.
+
+    At temperature 0 the cache would otherwise replay the very answer that failed ('moderate risk').
+    """
+    if not engine.cache:
+        return 0
+    invalid = [i for i in row_ids if dead_letters.records[i].get("error_class") == "invalid_output"]
+    for i in invalid:
+        engine.cache.delete(engine.model_id, build_prompt(df.at[i, "description"]), engine.temperature,
+                            engine.max_tokens)
+    return len(invalid)
+
+
+def repair_targets(df, row_ids, engine, journal, dead_letters, invalid_as, concurrency):
+    evicted = evict_invalid_outputs(df, row_ids, engine, dead_letters)
+    if evicted:
+        print(f"🗑️ Evicted the cached answers of {evicted} invalid_output rows")
+
+    def on_result(j, label, error):
+        if invalid_as and isinstance(error, InvalidOutputError):
+            # e.g. "moderate risk" twice in a row -> business rule: treat it as bad risk
+            print(f"[{row_ids[j]}] ⚠️ {error}. Labeling as {invalid_as}.")
+            label, error = invalid_as, None
+        report(row_ids[j], label, error, journal, dead_letters, "target", LABEL_TEMPLATE)
+
+    descriptions = df.loc[row_ids, "description"].tolist()
+    asyncio.run(classify_all(engine, descriptions, batch_size=1, concurrency=concurrency, on_result=on_result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reprocess dead-lettered rows of a Bedrock generation run")
+    add_shard_arguments(parser)
+    parser.add_argument("run", choices=sorted(RUNS))
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--invalid-as", default=None,
+                        help="label for targets that keep coming back invalid (the old repair used 'bad risk')")
+    args = parser.parse_args()
+
+    shard, shards = args.shard
+    region = args.region or REGION
+    model_id = args.model_id or MODEL_ID
+    paths = {name: path if name == "input" else shard_path(path, shard, shards) for name, path in RUNS[args.run].items()}
+    dead_letters = DeadLetterStore(paths["dead_letters"])
+    journal = ProgressJournal(paths["journal"])
+    row_ids = sorted(dead_letters.unresolved())
+    print(f"🔍 Found {len(row_ids)} dead-lettered rows in {paths['dead_letters']}")
+    if not row_ids:
+        return
+
+    import boto3  # only needed for the real client: the repair functions run on any engine
+    from botocore.config import Config
+    client = boto3.client(
+        "bedrock-runtime",
+        region_name=region,
+        config=Config(max_pool_connections=args.concurrency * 2, retries={"max_attempts": 1, "mode": "standard"})
+    )
+    cache = PromptCache(CACHE_FILE)
+    metrics = BedrockMetrics()
+    start_time = time.time()
+    if args.run != "pipeline":
+        df = load_input(paths["input"])
+        total_rows = len(df)
+        if shards > 1:
+            df = df.loc[shard_rows(df.index, shard, shards)]
+
+    if args.run == "descriptions":
+        engine = BedrockEngine(client, model_id, max_tokens=250, temperature=0.7,
+                               requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                               max_concurrency=args.concurrency, cache=cache, metrics=metrics, stage="descriptions")
+        repair_descriptions(df, row_ids, engine, journal, dead_letters)
+        engines = [engine]
+        column = "description"
+    elif args.run == "targets":
+        engine = BedrockEngine(client, model_id, max_tokens=10, temperature=0.0,
+                               requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+                               max_concurrency=args.concurrency * 2, cache=cache, metrics=metrics, stage="targets")
+        repair_targets(df, row_ids, engine, journal, dead_letters, args.invalid_as, args.concurrency)
+        engines = [engine]
+        column = "target"
+    else:
+        description_engine = BedrockEngine(
+            client, model_id, max_tokens=pipeline.DESCRIPTION_MAX_TOKENS, temperature=pipeline.DESCRIPTION_TEMPERATURE,
+            requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+            max_concurrency=args.concurrency, cache=cache, metrics=metrics, stage="descriptions"
+        )
+        label_engine = BedrockEngine(
+            client, model_id, max_tokens=pipeline.LABEL_MAX_TOKENS, temperature=pipeline.LABEL_TEMPERATURE,
+            requests_per_minute=REQUESTS_PER_MINUTE, tokens_per_minute=TOKENS_PER_MINUTE,
+            max_concurrency=args.concurrency, cache=cache, metrics=metrics, stage="targets"
+        )
+        # streamed in chunks like generate_dataset_pipeline.py, descriptions read back from their journal
+        total_rows = min(NUM_ROWS, dataset_rows(paths["input"]))
+        descriptions = ProgressJournal(paths["descriptions_journal"])
+        asyncio.run(pipeline.run_pipeline(pipeline.input_chunks(paths["input"], total_rows, shard, shards), total_rows,
+                                          description_engine, label_engine, descriptions, journal, dead_letters,
+                                          row_ids))
+        df = (chunk.assign(description=descriptions.values(chunk.index))
+              for chunk in pipeline.input_chunks(paths["input"], total_rows, shard, shards))
+        engines = [description_engine, label_engine]
+        column = "target"
+
+    for engine in engines:
+        engine.close()
+    saved = compact_shard(journal, df, column, paths["output"], shard, shards, total_rows)
+    if args.run == "pipeline":
+        descriptions.close()
+    journal.close()
+    remaining = len(dead_letters.unresolved())
+    dead_letters.close()
+    metrics.print_summary()
+    print(f"🗃️ Cache: {cache.stats()}")
+    cache.close()
+
+    print(f"\n✅ Repaired {len(row_ids) - remaining}/{len(row_ids)} rows. {paths['output']} has {saved} rows.")
+    print(f"⚡ Total time: {round((time.time() - start_time)/60, 2)} minutes")
+
+
+if __name__ == "__main__":
+    main()
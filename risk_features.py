@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+# Shipped next to train_logreg.py (SageMaker `dependencies`): the pickled preprocessor references
+# this module, so it has to be importable wherever tabular_preprocessor.joblib is loaded.
+
+# Numeric column -> (binned column, labels), as transform_raw_data in preprocess_for_sagemaker.py
+BINS = {
+    "Credit amount": ("Credit_bin", ["low", "mid-low", "mid-high", "high"]),
+    "Age": ("Age_bin", ["young", "mid-young", "mid-old", "old"]),
+    "Duration": ("Duration_bin", ["short", "mid-short", "mid-long", "long"]),
+}
+
+
+class QuantileBinner(BaseEstimator, TransformerMixin):
+    """Quantile bins fitted once on the training data (same edges as pd.qcut), applied with searchsorted.
+
+    `transform` replaces each numeric column by its labeled bin: O(log q) per value, independent of
+    the other rows in the batch (a single row gets the same bin it would get in any batch).
+    Values outside the training range go to the first/last bin. Missing values (NaN) get no bin:
+    the one-hot encoder sees an unknown category and gives them all zeros (ScoringKernel: weight 0).
+    """
+
+    def __init__(self, bins=None):
+        self.bins = bins
+
+    @classmethod
+    def from_edges(cls, edges, bins=None):
+        """Binner with precomputed edges (e.g. from quantile_sketch.py), no fit pass over the data"""
+        binner = cls(bins)
+        binner.edges_ = {column: np.asarray(column_edges, dtype=float) for column, column_edges in edges.items()}
+        return binner
+
+    def fit(self, X, y=None):
+        self.edges_ = {}
+        for column, (_, labels) in (self.bins or BINS).items():
+            _, edges = pd.qcut(X[column], q=len(labels), retbins=True)
+            self.edges_[column] = edges
+        return self
+
+    def transform(self, X):
+        X = X.copy()
+        for column, (binned, labels) in (self.bins or BINS).items():
+            inner_edges = self.edges_[column][1:-1]
+            # qcut intervals are right-closed: (e[i], e[i+1]] -> count of inner edges < value
+            values = X[column].to_numpy(dtype=float)
+            codes = np.searchsorted(inner_edges, values, side="left")
+            binned_values = np.asarray(labels, dtype=object)[codes]
+            binned_values[np.isnan(values)] = np.nan  # not the last bin (where searchsorted puts NaN)
+            X[binned] = binned_values
+        return X.drop(columns=list((self.bins or BINS).keys()))
+
+
+# Optional text branch on the Bedrock `description` (TEXT_FEATURES in preprocess_for_sagemaker.py)
+TEXT_COLUMN = "description"
+TEXT_HASH_FEATURES = 2 ** 16
+
+
+def fill_text(X):
+    """Missing descriptions -> empty text (HashingVectorizer rejects NaN)"""
+    return pd.Series(X).fillna("").astype(str)
+
+
+def text_features(n_features=TEXT_HASH_FEATURES):
+    """Hashed word uni/bigrams: stateless (no vocabulary to fit or store), fixed width `n_features`.
+
+    Use it as a ColumnTransformer branch on TEXT_COLUMN (a single column name, not a list: the
+    vectorizer expects one document per row); its sparse output is hstacked with the one-hot block.
+    """
+    return Pipeline([
+        ("fill", FunctionTransformer(fill_text)),
+        ("hash", HashingVectorizer(n_features=n_features, ngram_range=(1, 2), alternate_sign=False, norm="l2")),
+    ])
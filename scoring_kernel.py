@@ -0,0 +1,184 @@
+import hashlib
+import mmap
+import struct
+import zipfile
+
+import numpy as np
+
+# Additive scoring kernel for the one-hot logistic regression: every input is categorical (or a
+# quantile bin), so a score is intercept + one learned weight per feature. The kernel keeps, per
+# column, the sorted category values and their weights (per bin for the numeric columns) and sums
+# them with vectorized numpy lookups: no pandas, ColumnTransformer or sparse matrix per request.
+# Only numpy is needed to load and run it; export_scoring_kernel.py builds it from the artifacts.
+#
+# Serving artifact: one uncompressed .npz (intercept, vocabularies, bin edges, weights, and the
+# sha256 of the model.joblib it was exported from, so model_fn can tell it is current without
+# unpickling the model). load(path, mmap=True) maps the file once and every array is a read-only
+# view on it: nothing is copied or parsed beyond the .npy headers, and worker processes share the pages.
+
+KERNEL_FILE = "scoring_kernel.npz"
+_NPY_HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+
+def file_sha256(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _mapped_npz(path):
+    """{name: read-only array view} of an uncompressed .npz (np.savez) on one mmap of the file.
+    np.load(mmap_mode=...) does not map arrays inside .npz archives, hence the zip offsets by hand"""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    arrays = {}
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}: compressed member {info.filename} cannot be memory-mapped")
+            # local file header: 30 bytes, then the name and extra field, then the member (a .npy)
+            name_length, extra_length = struct.unpack("<HH", buffer[info.header_offset + 26:info.header_offset + 30])
+            buffer.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(buffer)
+            shape, fortran_order, dtype = _NPY_HEADER_READERS[version](buffer)
+            count = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=buffer.tell()) if count else np.empty(0, dtype)
+            arrays[info.filename[:-len(".npy")]] = array.reshape(shape, order="F" if fortran_order else "C")
+    return arrays
+
+
+def _lookup(sorted_values, weights, x, unknown=0.0):
+    """weights[value] for each x, `unknown` for values never seen in training (0.0: OneHotEncoder 'ignore')"""
+    if len(sorted_values) == 0:
+        return np.full(len(x), unknown)
+    idx = np.minimum(np.searchsorted(sorted_values, x), len(sorted_values) - 1)
+    return np.where(sorted_values[idx] == x, weights[idx], unknown)
+
+
+class ScoringKernel:
+    """intercept + sum of per-column weight lookups -> logistic probability"""
+
+    def __init__(self, intercept, categorical, binned, model_sha256=None):
+        # categorical: [(column, sorted values, weights)], binned: [(column, inner edges, weights per bin)]
+        self.intercept = float(intercept)
+        self.categorical = categorical
+        self.binned = binned
+        self.model_sha256 = model_sha256  # of the model.joblib this was exported from (file_sha256)
+
+    @classmethod
+    def from_artifacts(cls, preprocessor, model):
+        """Build from the fitted preprocessor Pipeline (QuantileBinner + one-hot) and the LogisticRegression"""
+        from risk_features import BINS  # only needed to export, not to score
+
+        binner = preprocessor.named_steps["bins"]
+        bins = binner.bins or BINS
+        _, encoder, columns = preprocessor.named_steps["onehot"].transformers_[0]
+        coef = model.coef_[0]
+        weights = {}
+        offset = 0
+        for column, categories in zip(columns, encoder.categories_):
+            weights[column] = dict(zip(categories.tolist(), coef[offset:offset + len(categories)]))
+            offset += len(categories)
+        if offset != len(coef):
+            raise ValueError(f"model has {len(coef)} features, the one-hot block {offset}: the scoring kernel "
+                             "only covers one-hot features (train without the text branch)")
+
+        bin_columns = {binned: column for column, (binned, _) in bins.items()}
+        categorical = []
+        for column in columns:
+            if column in bin_columns:
+                continue
+            values = sorted(weights[column])
+            numeric = all(isinstance(v, (int, float, np.number)) for v in values)  # e.g. Job
+            categorical.append((
+                column,
+                np.array(values, dtype=float if numeric else str),
+                np.array([weights[column][v] for v in values], dtype=float),
+            ))
+        binned = []
+        for column, (binned_column, labels) in bins.items():
+            extra = [category for category in weights[binned_column] if category not in labels]
+            if extra:  # e.g. NaN learned as a category: the kernel scores missing values as unknown (0)
+                raise ValueError(f"{binned_column} has categories {extra} besides its bin labels: not supported "
+                                 "by the scoring kernel")
+            binned.append((
+                column,
+                np.asarray(binner.edges_[column][1:-1], dtype=float),
+                np.array([weights[binned_column].get(label, 0.0) for label in labels], dtype=float),
+            ))
+        return cls(model.intercept_[0], categorical, binned)
+
+    def categorical_logit(self, columns, unknown=0.0):
+        """Sum of the categorical columns' weights per row, `unknown` for each value unseen in training"""
+        logit = 0.0
+        for column, values, weights in self.categorical:
+            # str columns: keep the request's own width (casting to values.dtype would truncate)
+            x = np.asarray(columns[column], dtype=values.dtype if values.dtype.kind != "U" else str)
+            logit = logit + _lookup(values, weights, x, unknown)
+        return logit
+
+    def binned_logit(self, columns, unknown=0.0):
+        """Sum of the binned numeric columns' weights per row (bin = searchsorted on the training edges;
+        NaN has no bin and adds `unknown`, as the unknown category it is for QuantileBinner + one-hot)"""
+        logit = 0.0
+        for column, edges, weights in self.binned:
+            x = np.asarray(columns[column], dtype=float)
+            part = weights[np.searchsorted(edges, x, side="left")]
+            missing = np.isnan(x)
+            logit = logit + (np.where(missing, unknown, part) if missing.any() else part)
+        return logit
+
+    def fill_unknown(self, logit, columns):
+        """(logit, unknown rows) from a categorical_logit + binned_logit summed with unknown=NaN: one isnan
+        finds the rows with a category unseen in training or a missing numeric (those the one-hot encoder
+        scores as all zeros), which are then summed again with 0"""
+        missing = np.isnan(logit)
+        unknown_rows = int(np.count_nonzero(missing))
+        if unknown_rows:  # rare: only those rows are looked up again
+            subset = {column: np.asarray(columns[column])[missing]
+                      for column, _, _ in self.categorical + self.binned}
+            logit[missing] = self.categorical_logit(subset) + self.binned_logit(subset)
+        return logit, unknown_rows
+
+    def decision_function(self, columns):
+        """Logit per row. `columns`: mapping column -> array-like (dict of arrays, DataFrame, ...)"""
+        return self.categorical_logit(columns) + self.binned_logit(columns) + self.intercept
+
+    def predict_proba(self, columns):
+        """P(good risk) per row (= model.predict_proba(X)[:, 1])"""
+        return 1.0 / (1.0 + np.exp(-self.decision_function(columns)))
+
+    def predict(self, columns):
+        return (self.decision_function(columns) > 0).astype(np.int64)
+
+    def save(self, path):
+        arrays = {"intercept": np.array([self.intercept])}
+        arrays["categorical"] = np.array([column for column, _, _ in self.categorical], dtype=str)
+        for i, (_, values, weights) in enumerate(self.categorical):
+            arrays[f"values_{i}"] = values
+            arrays[f"weights_{i}"] = weights
+        arrays["binned"] = np.array([column for column, _, _ in self.binned], dtype=str)
+        for i, (_, edges, weights) in enumerate(self.binned):
+            arrays[f"edges_{i}"] = edges
+            arrays[f"bin_weights_{i}"] = weights
+        if self.model_sha256:
+            arrays["model_sha256"] = np.array(self.model_sha256)
+        np.savez(path, **arrays)  # uncompressed: memory-mappable
+
+    @classmethod
+    def load(cls, path, mmap=False):
+        """mmap=True: arrays are read-only views on one memory map of the file (see _mapped_npz)"""
+        if mmap:
+            return cls._from_arrays(_mapped_npz(path))
+        with np.load(path, allow_pickle=False) as f:
+            return cls._from_arrays({name: f[name] for name in f.files})
+
+    @classmethod
+    def _from_arrays(cls, f):
+        categorical = [
+            (str(column), f[f"values_{i}"], f[f"weights_{i}"]) for i, column in enumerate(f["categorical"])
+        ]
+        binned = [
+            (str(column), f[f"edges_{i}"], f[f"bin_weights_{i}"]) for i, column in enumerate(f["binned"])
+        ]
+        model_sha256 = str(f["model_sha256"]) if "model_sha256" in f else None  # kernels exported before it: None
+        return cls(f["intercept"][0], categorical, binned, model_sha256)
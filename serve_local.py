@@ -0,0 +1,181 @@
+import argparse
+import http.server
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+import train_logreg
+from inference_io import num_rows
+from inference_metrics import METRICS
+
+# Local stand-in for the SageMaker sklearn serving container: GET /ping and POST /invocations on top
+# of train_logreg.py's model_fn/input_fn/predict_fn/output_fn, without deploying an endpoint.
+#
+# Micro-batching: each request is parsed in its own thread (input_fn), then queued. A single batcher
+# thread takes the first queued request plus whatever else is queued (up to --max-batch-rows rows;
+# --max-wait-ms > 0 also waits that long for more), concatenates the columns and scores them in ONE
+# predict_fn call, then hands each request its slice of the result for output_fn (if that call fails,
+# each request is scored again on its own, so only the bad one gets the error). Without a wait,
+# batches form only under load (requests queue up while the previous call runs), so a lone request
+# pays no extra latency. --max-batch-rows 0 scores every request on its own in its thread, as the
+# container does. benchmarks/serving_load.py compares both under concurrent clients.
+#
+#   python serve_local.py --model-dir downloaded_artifacts --port 8080
+#   curl -s localhost:8080/invocations -H "Content-Type: text/csv" --data-binary @test_data_for_inference.csv
+#   curl -s localhost:8080/metrics
+
+MAX_BATCH_ROWS = 256
+MAX_WAIT_MS = 0.0
+DEFAULT_ACCEPT = "application/json"
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests (dicts of column arrays) into one predict_fn call"""
+
+    def __init__(self, artifacts, max_batch_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS):
+        self.artifacts = artifacts
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, columns):
+        """Future of ({"prediction", "probability"} for the rows of `columns`, rows in the predict_fn call)"""
+        future = Future()
+        self.queue.put((columns, future))
+        return future
+
+    def _run(self):
+        while True:
+            items = [self.queue.get()]
+            rows = num_rows(items[0][0])
+            deadline = time.perf_counter() + self.max_wait
+            while rows < self.max_batch_rows:
+                timeout = deadline - time.perf_counter()
+                try:
+                    # max_wait 0: take only what queued up during the previous predict_fn call
+                    item = self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                items.append(item)
+                rows += num_rows(item[0])
+            self._predict(items)
+
+    def _predict(self, items):
+        groups = {}  # requests with the same columns share a predict_fn call
+        for columns, future in items:
+            groups.setdefault(tuple(columns), []).append((columns, future))
+        for names, group in groups.items():
+            sizes = [num_rows(columns) for columns, _ in group]
+            try:
+                merged = group[0][0] if len(group) == 1 else \
+                    {name: np.concatenate([columns[name] for columns, _ in group]) for name in names}
+                prediction = train_logreg.predict_fn(merged, self.artifacts)
+            except Exception as e:
+                if len(group) == 1:
+                    group[0][1].set_exception(e)
+                else:  # one bad request must not fail its neighbours: score each one on its own
+                    self._predict_each(group)
+                continue
+            bounds = np.cumsum([0] + sizes)
+            for (_, future), start, stop in zip(group, bounds[:-1], bounds[1:]):
+                future.set_result(({key: values[start:stop] for key, values in prediction.items()}, int(bounds[-1])))
+
+    def _predict_each(self, group):
+        for columns, future in group:
+            try:
+                future.set_result((train_logreg.predict_fn(columns, self.artifacts), num_rows(columns)))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class InvocationHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: clients reuse their connection
+    disable_nagle_algorithm = True  # headers and body are separate writes: no 40 ms delayed-ACK stall
+
+    def do_GET(self):
+        if self.path == "/ping":
+            self._send(200, b"")
+        elif self.path == "/metrics":  # stage timings and counters of the handlers (inference_metrics.py)
+            self._send(200, json.dumps(METRICS.snapshot()).encode())
+        else:
+            self._send(404, b"Not found", "text/plain")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/invocations":
+            return self._send(404, b"Not found", "text/plain")
+        content_type = self.headers.get("Content-Type", "text/csv")
+        accept = self.headers.get("Accept", DEFAULT_ACCEPT)
+        accept = DEFAULT_ACCEPT if accept in ("", "*/*") else accept
+        try:
+            columns = train_logreg.input_fn(body, content_type)
+            batcher = self.server.batcher
+            if batcher is None:
+                prediction, batch_rows = train_logreg.predict_fn(columns, self.server.artifacts), num_rows(columns)
+            else:
+                prediction, batch_rows = batcher.submit(columns).result()
+            response, response_type = train_logreg.output_fn(prediction, accept)
+        except ValueError as e:  # unsupported content type / malformed body
+            return self._send(415 if "Unsupported" in str(e) else 400, str(e).encode(), "text/plain")
+        except Exception as e:
+            return self._send(500, str(e).encode(), "text/plain")
+        self._send(200, response.encode() if isinstance(response, str) else response, response_type,
+                   {"X-Batch-Rows": str(batch_rows)})
+
+    def _send(self, status, body, content_type=DEFAULT_ACCEPT, headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class InferenceServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # listen backlog: concurrent clients connecting at once are not reset
+
+
+def make_server(model_dir, host="127.0.0.1", port=8080, max_batch_rows=MAX_BATCH_ROWS, max_wait_ms=MAX_WAIT_MS,
+                verbose=False):
+    """ThreadingHTTPServer with the artifacts of model_fn(model_dir); port 0 picks a free port"""
+    server = InferenceServer((host, port), InvocationHandler)
+    server.verbose = verbose
+    server.artifacts = train_logreg.model_fn(model_dir)
+    server.batcher = MicroBatcher(server.artifacts, max_batch_rows, max_wait_ms) if max_batch_rows > 0 else None
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local SageMaker-style inference server with micro-batching")
+    parser.add_argument("--model-dir", default="downloaded_artifacts", help="model.tar.gz contents (model_fn)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-rows", type=int, default=MAX_BATCH_ROWS, help="0 = no batching")
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.model_dir, args.host, args.port, args.max_batch_rows, args.max_wait_ms, args.verbose)
+    batching = f"batches of <= {args.max_batch_rows} rows / {args.max_wait_ms} ms" if args.max_batch_rows else "no batching"
+    print(f"🛰️ Serving {args.model_dir} on http://{args.host}:{server.server_address[1]} ({batching})")
+    print(f"   kernel: {'scoring_kernel.npz' if 'kernel' in server.artifacts else 'not packaged, using the preprocessor'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
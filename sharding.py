@@ -0,0 +1,136 @@
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Deterministic sharding of generation jobs by row id: `--shard k/N` (k = 0..N-1) processes only
+# the rows whose row-id hash falls in shard k, and writes its own output part + manifest.
+# merge_shards.py puts the parts back together in original row order.
+
+ROW_ID_COLUMN = "row_id"  # kept in the output parts so they can be merged in order
+MULTI_EXTENSIONS = (".journal.jsonl", ".dead_letters.jsonl", ".metrics.json")
+
+
+def parse_shard(text):
+    """'k/N' -> (k, N)"""
+    try:
+        k, n = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected k/N (e.g. 0/4), got {text!r}")
+    if n < 1 or not 0 <= k < n:
+        raise argparse.ArgumentTypeError(f"shard index must be in 0..{n - 1}, got {text!r}")
+    return k, n
+
+
+def shard_of(row_id, shards):
+    """Shard of a row id: stable across processes, machines and Python versions (unlike hash())"""
+    digest = hashlib.md5(str(row_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shards
+
+
+def shard_rows(row_ids, shard, shards):
+    return [row_id for row_id in row_ids if shard_of(row_id, shards) == shard]
+
+
+def shard_path(path, shard, shards):
+    """data.csv -> data.shard-0-of-4.csv, x.journal.jsonl -> x.shard-0-of-4.journal.jsonl (unchanged when not sharded)"""
+    if shards == 1:
+        return path
+    ext = next((e for e in MULTI_EXTENSIONS if path.endswith(e)), os.path.splitext(path)[1])
+    return f"{path[:len(path) - len(ext)]}.shard-{shard}-of-{shards}{ext}"
+
+
+def add_shard_arguments(parser):
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="k/N",
+                        help="only process the rows of shard k out of N (default 0/1: every row)")
+    parser.add_argument("--region", default=None, help="Bedrock region for this shard (default: REGION)")
+    parser.add_argument("--model-id", default=None, help="Bedrock model id for this shard (default: MODEL_ID)")
+    return parser
+
+
+def manifest_path(part_path):
+    return os.path.splitext(part_path)[0] + ".manifest.json"
+
+
+def write_manifest(part_path, shard, shards, total_rows, assigned, missing):
+    """Record how many rows shard k was assigned and which ones did not make it into its part"""
+    missing = [int(row_id) for row_id in missing]
+    manifest = {
+        "shard": shard,
+        "shards": shards,
+        "total_rows": total_rows,
+        "assigned": assigned,
+        "written": assigned - len(missing),
+        "missing": missing,
+    }
+    with open(manifest_path(part_path), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def compact_shard(journal, chunks, column, output_path, shard, shards, total_rows):
+    """journal.compact for one shard (`chunks`: the shard's rows, a DataFrame or DataFrames): adds the
+    row id column and the manifest merge_parts checks, tallied while the chunks stream through"""
+    if shards == 1:
+        return journal.compact(chunks, column, output_path)
+    tally = {"assigned": 0, "missing": []}
+
+    def counted(chunks):
+        for chunk in [chunks] if isinstance(chunks, pd.DataFrame) else chunks:
+            tally["assigned"] += len(chunk)
+            tally["missing"].extend(row_id for row_id in chunk.index if row_id not in journal)
+            yield chunk
+
+    saved = journal.compact(counted(chunks), column, output_path, row_id_column=ROW_ID_COLUMN)
+    write_manifest(output_path, shard, shards, total_rows, tally["assigned"], tally["missing"])
+    return saved
+
+
+def read_part(path):
+    return pd.read_parquet(path) if path.endswith(".parquet") else pd.read_csv(path)
+
+
+def merge_parts(output_path, shards):
+    """Concatenate the N parts of `output_path` in original row order and check completeness.
+
+    Returns (df, problems, missing): `missing` describes rows that were not generated (e.g. still
+    dead-lettered), `problems` everything else (missing parts, manifests of another run, rows in the
+    wrong shard, duplicated rows). Both are empty when every row of the input is present once.
+    """
+    problems = []
+    missing = []
+    parts = []
+    total_rows = None
+    for k in range(shards):
+        part_path = shard_path(output_path, k, shards)
+        if not os.path.exists(part_path) or not os.path.exists(manifest_path(part_path)):
+            problems.append(f"shard {k}/{shards}: missing part or manifest ({part_path})")
+            continue
+        with open(manifest_path(part_path)) as f:
+            manifest = json.load(f)
+        if manifest["shards"] != shards or manifest["shard"] != k:
+            problems.append(f"shard {k}/{shards}: manifest says {manifest['shard']}/{manifest['shards']}")
+        if total_rows is None:
+            total_rows = manifest["total_rows"]
+        elif manifest["total_rows"] != total_rows:
+            problems.append(f"shard {k}/{shards}: built from {manifest['total_rows']} input rows, not {total_rows}")
+        if manifest["missing"]:
+            missing.append(f"shard {k}/{shards}: {len(manifest['missing'])} rows not generated "
+                            f"(e.g. {manifest['missing'][:5]}), see its dead letters")
+        part = read_part(part_path)
+        wrong = [row_id for row_id in part[ROW_ID_COLUMN] if shard_of(row_id, shards) != k]
+        if wrong:
+            problems.append(f"shard {k}/{shards}: {len(wrong)} rows belong to other shards (e.g. {wrong[:5]})")
+        parts.append(part)
+
+    df = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[ROW_ID_COLUMN])
+    duplicated = df[ROW_ID_COLUMN][df[ROW_ID_COLUMN].duplicated()].tolist()
+    if duplicated:
+        problems.append(f"{len(duplicated)} duplicated row ids (e.g. {duplicated[:5]})")
+    present = df[ROW_ID_COLUMN].nunique()
+    if total_rows is not None and present != total_rows:
+        (missing if present < total_rows else problems).append(f"{present} of {total_rows} rows present")
+    df = df.drop_duplicates(ROW_ID_COLUMN).sort_values(ROW_ID_COLUMN, kind="stable")
+    return df.drop(columns=ROW_ID_COLUMN).reset_index(drop=True), problems, missing
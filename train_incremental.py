@@ -0,0 +1,161 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, recall_score, roc_auc_score
+
+from data_access import load_dataset, source_hash
+from hyperparameter_search import make_model
+from preprocess_chunked import clean
+from train_logreg import load_split
+
+# Incremental training for newly labeled rows (e.g. a new output of generate_risk_targets.py):
+# instead of preprocess + upload + a full SageMaker job, the batch is transformed with the fitted
+# preprocessor and an SGD logistic model is updated with partial_fit, in time proportional to the
+# batch. The feature space is fixed by the preprocessor (OneHotEncoder.categories_, bin edges):
+# categories never seen in training are ignored (counted and reported), the model width never changes.
+#
+#   python train_incremental.py data_files/new_labels.csv [more.csv ...] [--check]
+#
+# The first run (or --reset) initializes the model on the train split in dataset_for_sagemaker/.
+# Every applied batch is recorded in HISTORY_FILE (path, content hash, row count; not its rows, so the
+# file stays small however many batches are applied): a batch whose content was already applied is
+# skipped, and --check compares with a full LogisticRegression refit on the train split + every batch
+# applied since the initialization, re-read from its path (left out if the file changed or is gone).
+# The model is a drop-in model.joblib for train_logreg.py's model_fn/predict_fn (predict/predict_proba).
+
+PREPROCESSOR_FILE = "artifacts/tabular_preprocessor.joblib"
+MODEL_FILE = "artifacts/incremental_model.joblib"
+HISTORY_FILE = "artifacts/incremental_history.joblib"  # applied batches, saved with the model
+DATA_DIR = "dataset_for_sagemaker"
+ALPHA = 1e-3         # L2 penalty of the SGD model
+INIT_EPOCHS = 20     # passes over the train split when initializing
+UPDATE_EPOCHS = 5    # passes over each new batch
+CLASSES = np.array([0, 1])
+
+
+def balanced_weights(y):
+    """class_weight="balanced" of the initial data, frozen (partial_fit cannot recompute it per batch)"""
+    counts = np.bincount(np.asarray(y, dtype=int), minlength=len(CLASSES))
+    return {int(c): len(y) / (len(CLASSES) * counts[c]) for c in CLASSES}
+
+
+def new_model(class_weight):
+    return SGDClassifier(loss="log_loss", alpha=ALPHA, class_weight=class_weight, average=True, random_state=42)
+
+
+def partial_fit_epochs(model, X, y, epochs, seed=42):
+    rng = np.random.default_rng(seed)
+    y = np.asarray(y)
+    for _ in range(epochs):
+        order = rng.permutation(X.shape[0])
+        model.partial_fit(X[order], y[order], classes=CLASSES)
+    return model
+
+
+def unseen_categories(preprocessor, X_raw):
+    """Rows per column whose category is outside the fixed space (encoded as all zeros)"""
+    binned = preprocessor.named_steps["bins"].transform(X_raw)
+    _, encoder, columns = preprocessor.named_steps["onehot"].transformers_[0]
+    unseen = {}
+    for column, categories in zip(columns, encoder.categories_):
+        count = int((~binned[column].isin(categories)).sum())
+        if count:
+            unseen[column] = count
+    return unseen
+
+
+def load_batch(path, preprocessor):
+    batch = clean(load_dataset(path))
+    batch = batch[batch["target"].notna()]  # rows not labeled yet
+    X_raw = batch.drop(columns="target")
+    return preprocessor.transform(X_raw).tocsr(), batch["target"].to_numpy(dtype=int), unseen_categories(preprocessor, X_raw)
+
+
+def empty_history():
+    return {"batches": []}
+
+
+def metrics(model, X, y):
+    prob = model.predict_proba(X)[:, 1]
+    pred = (prob >= 0.5).astype(int)
+    return {
+        "auc": round(roc_auc_score(y, prob), 4),
+        "accuracy": round(accuracy_score(y, pred), 4),
+        "bad_risk_recall": round(recall_score(y, pred, pos_label=0), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update the SGD logistic model with newly labeled batches")
+    parser.add_argument("batches", nargs="*", help="CSV files with the raw columns + target")
+    parser.add_argument("--reset", action="store_true", help="re-initialize from the train split")
+    parser.add_argument("--check", action="store_true", help="compare with a full LogisticRegression refit")
+    args = parser.parse_args()
+
+    preprocessor = joblib.load(PREPROCESSOR_FILE)
+    X_train, y_train = load_split(f"{DATA_DIR}/train", "train_data_sagemaker")
+    if args.reset or not os.path.exists(MODEL_FILE):
+        start = time.time()
+        model = partial_fit_epochs(new_model(balanced_weights(y_train)), X_train, y_train, INIT_EPOCHS)
+        history = empty_history()
+        print(f"🆕 Initialized on {X_train.shape[0]} train rows ({X_train.shape[1]} features) "
+              f"in {time.time() - start:.2f}s")
+    else:
+        model = joblib.load(MODEL_FILE)
+        if os.path.exists(HISTORY_FILE):
+            history = {"batches": joblib.load(HISTORY_FILE)["batches"]}  # older files also kept the rows
+        else:
+            history = empty_history()
+            print(f"⚠️ {HISTORY_FILE} not found: batches applied before are unknown (--reset to start over)")
+        print(f"🔄 {len(history['batches'])} batches ({sum(b['rows'] for b in history['batches'])} rows) already applied")
+
+    applied = {batch["sha256"]: batch["path"] for batch in history["batches"]}
+    loaded = {}  # batches of this run, reused by --check
+    for path in args.batches:
+        digest = source_hash(path)
+        if digest in applied:
+            print(f"⛔ {path}: same content as {applied[digest]}, already applied, skipped")
+            continue
+        X, y, unseen = load_batch(path, preprocessor)
+        start = time.time()
+        partial_fit_epochs(model, X, y, UPDATE_EPOCHS)
+        print(f"➕ {path}: {len(y)} rows in {time.time() - start:.3f}s")
+        if unseen:
+            print(f"   ⚠️ categories outside the training space (ignored): {unseen}")
+        applied[digest] = path
+        loaded[digest] = X, y
+        history["batches"].append({"path": path, "sha256": digest, "rows": len(y), "applied_at": time.time()})
+
+    joblib.dump(model, MODEL_FILE, protocol=4)
+    joblib.dump(history, HISTORY_FILE, protocol=4)
+    print(f"💾 Model saved to: {MODEL_FILE} (applied batches: {HISTORY_FILE})")
+
+    if args.check:
+        X_test, y_test = load_split(f"{DATA_DIR}/test", "test_data_sagemaker")
+        X_parts, y_parts = [X_train], [np.asarray(y_train)]
+        for batch in history["batches"]:
+            if batch["sha256"] not in loaded:
+                if not os.path.exists(batch["path"]) or source_hash(batch["path"]) != batch["sha256"]:
+                    print(f"⚠️ {batch['path']}: missing or changed since it was applied, left out of the refit")
+                    continue
+                loaded[batch["sha256"]] = load_batch(batch["path"], preprocessor)[:2]
+            X, y = loaded[batch["sha256"]]
+            X_parts.append(X)
+            y_parts.append(y)
+        X_all = sp.vstack(X_parts, format="csr")
+        y_all = np.concatenate(y_parts)
+        start = time.time()
+        refit = make_model().fit(X_all, y_all)  # train_logreg.py's default LogisticRegression
+        refit_seconds = time.time() - start
+        print(f"🔍 Test metrics ({len(y_test)} rows), full refit on {len(y_all)} rows took {refit_seconds:.3f}s")
+        for name, m in (("incremental SGD", model), ("full refit", refit)):
+            print(f"   {name:>16}: " + ", ".join(f"{k} {v}" for k, v in metrics(m, X_test, y_test).items()))
+
+
+if __name__ == "__main__":
+    main()
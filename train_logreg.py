@@ -1,26 +1,118 @@
-import pandas as pd
-import joblib
+import numpy as np
+import argparse
+import glob
 import logging
 import os
 import shutil
 import json
-import io
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import classification_report, roc_auc_score
+import time
+
+from inference_io import format_response, num_rows, parse_request
+from inference_metrics import METRICS
+from scoring_kernel import KERNEL_FILE, ScoringKernel, file_sha256
+
+# pandas, scipy, joblib and sklearn are imported where they are used: a serving worker with a current
+# scoring_kernel.npz answers /ping and scores requests with numpy only (fast cold start), and loads the
+# sklearn artifacts the first time a request needs the preprocessor path.
+
+def load_npz(path):
+    import scipy.sparse as sp
+
+    with np.load(path) as f:
+        X = sp.csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+        y = f["target"]
+    return X, y
+
+
+def load_split(channel_dir, name):
+    """X, y of `name` from a channel (see training_data.py): sparse CSR `name`.npz, its partitions
+    `name`.part-*.npz (stacked in order), or else the dense `name`.csv"""
+    import pandas as pd
+    import scipy.sparse as sp
+
+    npz_path = os.path.join(channel_dir, f"{name}.npz")
+    parts = sorted(glob.glob(os.path.join(channel_dir, f"{name}.part-*.npz")))
+    if os.path.exists(npz_path):
+        parts = [npz_path]
+    if parts:
+        loaded = [load_npz(path) for path in parts]
+        X = loaded[0][0] if len(loaded) == 1 else sp.vstack([X for X, _ in loaded], format="csr")
+        return X, pd.Series(np.concatenate([y for _, y in loaded]))
+    df = pd.read_csv(os.path.join(channel_dir, f"{name}.csv"), header=None)
+    return df.iloc[:, :-1], df.iloc[:, -1]
+
+
+def _flag(value):
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def _list(cast):
+    return lambda value: [cast(v) for v in str(value).split(",")]
+
+
+def _class_weight(value):
+    return None if value in (None, "none", "None") else value
+
+
+def parse_hyperparameters(argv=None):
+    """SageMaker hyperparameters: passed as --name value, also in SM_HPS as JSON (used as defaults)"""
+    hps = json.loads(os.environ.get("SM_HPS", "{}"))
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max_iter", type=int, default=hps.get("max_iter", 1000))
+    # single fit (search false)
+    parser.add_argument("--C", type=float, default=hps.get("C", 1.0))
+    parser.add_argument("--penalty", default=hps.get("penalty", "l2"))
+    parser.add_argument("--class_weight", type=_class_weight, default=hps.get("class_weight", "balanced"))
+    # search (hyperparameter_search.py): comma-separated grids, "none" = no class weights
+    parser.add_argument("--search", type=_flag, default=hps.get("search", "false"))
+    parser.add_argument("--c_values", type=_list(float), default=hps.get("c_values"))
+    parser.add_argument("--penalties", type=_list(str), default=hps.get("penalties"))
+    parser.add_argument("--class_weights", type=_list(_class_weight), default=hps.get("class_weights"))
+    parser.add_argument("--cv_folds", type=int, default=hps.get("cv_folds", 5))
+    parser.add_argument("--n_jobs", type=int, default=hps.get("n_jobs", -1))
+    # evaluation.json (evaluation.py): bootstrap intervals + threshold sweep on the test channel
+    parser.add_argument("--bootstrap_resamples", type=int, default=hps.get("bootstrap_resamples", 10_000))
+    args, _ = parser.parse_known_args(argv)  # string defaults (SM_HPS) also go through `type`
+    return args
+
 
 if __name__ == "__main__":
+    import joblib
+    import pandas as pd
+    from sklearn.metrics import classification_report, roc_auc_score
+
+    from evaluation import evaluate, format_summary, save_report
+    from hyperparameter_search import C_VALUES, CLASS_WEIGHTS, PENALTIES, make_model, search
+
+    args = parse_hyperparameters()
+
     # Environment paths from SageMaker
     input_train_path = os.environ["SM_CHANNEL_TRAIN"]
     input_test_path = os.environ.get("SM_CHANNEL_TEST", None)
     output_path = os.environ["SM_MODEL_DIR"]
 
     # Load training data
-    train_df = pd.read_csv(f"{input_train_path}/train_data_sagemaker.csv", header=None)
-    X_train = train_df.iloc[:, :-1]
-    y_train = train_df.iloc[:, -1]
+    X_train, y_train = load_split(input_train_path, "train_data_sagemaker")
+
+    params = {"C": args.C, "penalty": args.penalty, "class_weight": args.class_weight}
+    if args.search:
+        # Stratified CV over C x penalty x class_weight, warm-started C paths in parallel
+        selected, candidates, folds = search(
+            X_train, y_train,
+            c_values=args.c_values or C_VALUES,
+            penalties=args.penalties or PENALTIES,
+            class_weights=args.class_weights or CLASS_WEIGHTS,
+            folds=args.cv_folds, max_iter=args.max_iter, n_jobs=args.n_jobs,
+        )
+        with open(f"{output_path}/hyperparameter_search.json", "w") as f:
+            json.dump({"selected": selected, "candidates": candidates, "folds": folds,
+                       "cv_folds": args.cv_folds, "max_iter": args.max_iter}, f, indent=2)
+        print(f"🔎 Selected C={selected['C']} penalty={selected['penalty']} class_weight={selected['class_weight']} "
+              f"(CV AUC {selected['mean_auc']:.4f} ± {selected['std_auc']:.4f}, {len(candidates)} candidates)")
+        params = {name: selected[name] for name in params}
 
     # Train logistic regression
-    model = LogisticRegression(max_iter=1000, class_weight="balanced")
+    model = make_model(max_iter=args.max_iter, **params)
     model.fit(X_train, y_train)
 
     # Save model
@@ -29,9 +121,7 @@ if __name__ == "__main__":
     # === Evaluate if test data is available ===
     if input_test_path:
         try:
-            test_df = pd.read_csv(f"{input_test_path}/test_data_sagemaker.csv", header=None)
-            X_test = test_df.iloc[:, :-1]
-            y_test = test_df.iloc[:, -1]
+            X_test, y_test = load_split(input_test_path, "test_data_sagemaker")
 
             y_pred = model.predict(X_test)
             y_prob = model.predict_proba(X_test)[:, 1]
@@ -46,6 +136,11 @@ if __name__ == "__main__":
                     f.write(f"{label}: {metrics}\n")
                 f.write(f"\nROC AUC Score: {auc:.4f}\n")
 
+            # Bootstrap confidence intervals (AUC, bad risk recall, good risk precision) + threshold sweep
+            bootstrap = evaluate(y_test, y_prob, resamples=args.bootstrap_resamples)
+            save_report(bootstrap, f"{output_path}/evaluation.json")
+            print(format_summary(bootstrap))
+
             # Save predictions to a temp location
             preds_df = pd.DataFrame({
                 "y_true": y_test,
@@ -66,70 +161,124 @@ if __name__ == "__main__":
 
 
 # Inference functions for SageMaker hosting
+def _load_sklearn_artifacts(artifacts):
+    """model.joblib + tabular_preprocessor.joblib into `artifacts` (first use of the preprocessor path)"""
+    if "model" not in artifacts:
+        import joblib
+
+        model_dir = artifacts["model_dir"]
+        preprocessor = joblib.load(os.path.join(model_dir, "tabular_preprocessor.joblib"))
+        if not hasattr(preprocessor, "steps"):
+            # the one-hot ColumnTransformer of older exports expects the *_bin columns, which requests do not carry
+            raise ValueError(f"{model_dir}/tabular_preprocessor.joblib is a bare {type(preprocessor).__name__}, "
+                             "not the binning + one-hot Pipeline: re-export the preprocessor with train_logreg.py "
+                             "and re-package model.tar.gz")
+        artifacts["preprocessor"] = preprocessor
+        artifacts["model"] = joblib.load(os.path.join(model_dir, "model.joblib"))
+    return artifacts["preprocessor"], artifacts["model"]
+
 def model_fn(model_dir="/opt/ml/model"):
-    """Load the trained model"""
-    model = joblib.load(os.path.join(model_dir, "model.joblib"))
-    preprocessor = joblib.load(os.path.join(model_dir, "tabular_preprocessor.joblib"))
-    return {"model": model, "preprocessor": preprocessor}
+    """Load the scoring kernel (memory-mapped) if packaged and exported from this model.joblib: the
+    sklearn artifacts are then only loaded if a request needs them. Otherwise load them now"""
+    artifacts = {"model_dir": model_dir}
+    logging.getLogger().setLevel(logging.INFO)  # once per process (sampled predict_fn logs), not per request
+    kernel_path = os.path.join(model_dir, KERNEL_FILE)
+    if os.path.exists(kernel_path):
+        kernel = ScoringKernel.load(kernel_path, mmap=True)
+        if kernel.model_sha256 is not None:
+            if kernel.model_sha256 == file_sha256(os.path.join(model_dir, "model.joblib")):
+                artifacts["kernel"] = kernel
+                return artifacts
+        else:  # exported before the fingerprint: compare with the unpickled model
+            _, model = _load_sklearn_artifacts(artifacts)
+            if np.isclose(kernel.intercept, model.intercept_[0]):
+                artifacts["kernel"] = kernel
+                return artifacts
+        # a stale kernel (export_scoring_kernel.py not rerun for this model.joblib) is not used
+        logging.getLogger().warning(f"⚠️ {KERNEL_FILE} does not match model.joblib, using the preprocessor")
+    _load_sklearn_artifacts(artifacts)
+    return artifacts
 
 def input_fn(request_body, request_content_type):
-    """Parse input data from the request"""
-    if request_content_type == "text/csv":
-        print("📥 Input data received:")
-        print(request_body[:200]) # log first 200 chars
-        return pd.read_csv(io.StringIO(request_body))
-    else:
-        raise ValueError(f"Unsupported content type: {request_content_type}")
+    """Parse input data from the request -> dict of typed column arrays (inference_io.py, no pandas).
+    text/csv, application/json (columnar), application/jsonlines, application/x-npy (structured array)"""
+    start = time.perf_counter_ns()
+    try:
+        columns = parse_request(request_body, request_content_type)
+    except Exception:
+        METRICS.error(request=True)
+        raise
+    METRICS.defer("parse", time.perf_counter_ns() - start)
+    return columns
 
-def predict_fn(input_data, loaded_artifacts):
-    
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+def _onehot_unknown_rows(onehot, X):
+    """Number of rows where a column got no one-hot feature: a category unseen in training
+    (handle_unknown='ignore') or a missing numeric (NaN bin), as ScoringKernel.fill_unknown counts them"""
+    import scipy.sparse as sp
 
-    preprocessor = loaded_artifacts["preprocessor"]
-    model = loaded_artifacts["model"]
+    _, encoder, columns = onehot.transformers_[0]
+    width = sum(len(categories) for categories in encoder.categories_)
+    block = X[:, :width]
+    active = block.getnnz(axis=1) if sp.issparse(block) else np.count_nonzero(block, axis=1)
+    return int(np.count_nonzero(active < len(columns)))
 
-    logger.info(f"📥 Input data received: {input_data.head()}")
-    logger.info(f"📑 Columns received: {input_data.columns.tolist()}")
+def predict_fn(input_data, loaded_artifacts):
+    """Predicted class and P(good risk) per row. Stage timings (bin, transform, predict), row / unknown
+    category counters and a sampled JSON log line go to inference_metrics.METRICS"""
+    kernel = loaded_artifacts.get("kernel")
+    rows = num_rows(input_data) if isinstance(input_data, dict) else len(input_data)
 
     try:
-        # Step 1: Add bins (must match training)
-        input_data = input_data.copy()
-        input_data["Credit_bin"] = pd.qcut(input_data["Credit amount"], q=4, labels=["low", "mid-low", "mid-high", "high"])
-        input_data["Age_bin"] = pd.qcut(input_data["Age"], q=4, labels=["young", "mid-young", "mid-old", "old"])
-        input_data["Duration_bin"] = pd.qcut(input_data["Duration"], q=4, labels=["short", "mid-short", "mid-long", "long"])
-
-        # Step 2: Select only the columns expected by the preprocessor
-        input_data = input_data[
-            ["Sex", "Job", "Housing", "Saving accounts", "Checking account",
-             "Purpose", "Credit_bin", "Age_bin", "Duration_bin"]
-        ]
-
-        # Step 3: Transform
-        input_transformed = preprocessor.transform(input_data)
-        logger.info(f"✅ Successfully transformed input")
+        start = time.perf_counter_ns()
+        if isinstance(input_data, dict) and kernel is not None:
+            # lookup-table scoring straight from the column arrays (scoring_kernel.py)
+            path = "kernel"
+            unknown = np.nan if METRICS.enabled else 0.0  # NaN: counted as unknown rows, then scored with 0
+            logit = kernel.binned_logit(input_data, unknown)
+            binned = time.perf_counter_ns()
+            logit = logit + kernel.categorical_logit(input_data, unknown)
+            logit, unknown_rows = kernel.fill_unknown(logit, input_data) if METRICS.enabled else (logit, 0)
+            logit = logit + kernel.intercept
+            transformed = time.perf_counter_ns()
+            prediction = {"prediction": (logit > 0).astype(np.int64), "probability": 1.0 / (1.0 + np.exp(-logit))}
+        else:
+            # Bins (training edges, searchsorted) + one-hot in one fitted pipeline, see risk_features.py
+            import pandas as pd
+
+            path = "preprocessor"
+            preprocessor, model = _load_sklearn_artifacts(loaded_artifacts)
+            if isinstance(input_data, dict):
+                input_data = pd.DataFrame(input_data)
+            input_binned, onehot = preprocessor[:-1].transform(input_data), preprocessor[-1]
+            binned = time.perf_counter_ns()
+            input_transformed = onehot.transform(input_binned)
+            unknown_rows = _onehot_unknown_rows(onehot, input_transformed) if METRICS.enabled else 0
+            transformed = time.perf_counter_ns()
+            probability = model.predict_proba(input_transformed)
+            prediction = {"prediction": model.classes_[probability.argmax(axis=1)], "probability": probability[:, 1]}
+        predicted = time.perf_counter_ns()
     except Exception as e:
-        logger.error(f"❌ Failed during preprocessing or transform: {e}")
-        raise e
+        METRICS.error()
+        logging.getLogger().error(f"❌ Failed during preprocessing or predict: {e}")
+        raise
 
-    # Step 4: Predict
-    return model.predict(input_transformed)
+    METRICS.record(binned - start, transformed - binned, predicted - transformed, rows, unknown_rows)
+    if METRICS.sampled():  # the log line is only built for the sampled requests
+        logging.getLogger().info(json.dumps({
+            "event": "predict", "path": path, "rows": rows, "unknown_category_rows": unknown_rows,
+            "bin_us": round((binned - start) / 1e3, 1), "transform_us": round((transformed - binned) / 1e3, 1),
+            "predict_us": round((predicted - transformed) / 1e3, 1),
+        }))
+    return prediction
 
 def output_fn(prediction, response_content_type):
-    if response_content_type == "application/json":
-        # If prediction is a NumPy array or pandas Series/DataFrame, convert it
-        if hasattr(prediction, "tolist"):
-            prediction = prediction.tolist()
-        return json.dumps(prediction), response_content_type
-
-    elif response_content_type == "text/csv":
-        import io
-        csv_buffer = io.StringIO()
-        if hasattr(prediction, "to_csv"):
-            prediction.to_csv(csv_buffer, index=False)
-            return csv_buffer.getvalue(), response_content_type
-        else:
-            raise ValueError("Prediction format not supported for CSV output")
-
-    else:
-        raise ValueError(f"Unsupported response type: {response_content_type}")
\ No newline at end of file
+    """Class + probability per row as text/csv, application/json (columnar), application/jsonlines
+    or application/x-npy (inference_io.py)"""
+    start = time.perf_counter_ns()
+    try:
+        response = format_response(prediction, response_content_type)
+    except Exception:
+        METRICS.error()
+        raise
+    METRICS.defer("serialize", time.perf_counter_ns() - start)
+    return response
@@ -9,24 +9,30 @@ session = sagemaker.Session()
 role = "arn:aws:iam::784608183649:role/SageMakerExecutionRole"
 bucket = 'reto-reevalua-s3-bucket'
 
-# S3 paths
-train_path = f"s3://{bucket}/data/train/train_data_sagemaker.csv"
-test_path = f"s3://{bucket}/data/test/test_data_sagemaker.csv"
+# S3 paths (folder prefixes: train_logreg.py reads *_data_sagemaker.npz, or the .csv fallback)
+train_path = f"s3://{bucket}/data/train/"
+test_path = f"s3://{bucket}/data/test/"
 
-# Input channels
-train_input = TrainingInput(train_path, content_type="text/csv")
-test_input = TrainingInput(test_path, content_type="text/csv")
+# Input channels (sparse CSR .npz written by preprocess_for_sagemaker.py)
+train_input = TrainingInput(train_path, content_type="application/x-npz")
+test_input = TrainingInput(test_path, content_type="application/x-npz")
 
 # Estimator
 sklearn_estimator = SKLearn(
     entry_point="train_logreg.py",
+    # QuantileBinner (referenced by the pickled preprocessor), the CV search used when search=true,
+    # the bootstrap evaluation (evaluation.json) and the inference helpers train_logreg.py imports
+    dependencies=["risk_features.py", "hyperparameter_search.py", "evaluation.py", "inference_io.py",
+                  "scoring_kernel.py", "inference_metrics.py"],
     role=role,
     instance_count=1,
     instance_type="ml.m5.large",
     framework_version="1.2-1",
     base_job_name="logreg-eval-job",
     py_version="py3",
-    hyperparameters={"max_iter": 1000},
+    # search=true: stratified CV over C x penalty x class_weight (grids: c_values, penalties, class_weights,
+    # comma-separated), refit with the best; selection + per-fold timings in hyperparameter_search.json
+    hyperparameters={"max_iter": 1000, "search": "false", "cv_folds": 5, "n_jobs": -1},
 )
 
 # Launch training job with both train and test channels
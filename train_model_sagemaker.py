@@ -2,6 +2,7 @@ import sagemaker
 from sagemaker.inputs import TrainingInput
 from sagemaker.estimator import Estimator
 import boto3
+from botocore.exceptions import ClientError
 
 # Step 1: Setup
 region = "us-west-2"
@@ -16,10 +17,20 @@ session = sagemaker.Session(boto_session=boto_session)
 role = "arn:aws:iam::784608183649:role/SageMakerExecutionRole"
 
 bucket = "reto-reevalua-s3-bucket"
+# Built-in XGBoost reads CSV/libsvm, not .npz: run preprocess_for_sagemaker.py with OUTPUT_FORMAT = "csv" first
 s3_train_path = f"s3://{bucket}/data/train/train_data_sagemaker.csv"
 s3_test_path = f"s3://{bucket}/data/test/test_data_sagemaker.csv"
 s3_output_path = f"s3://{bucket}/output"
 
+# Fail before creating the job if the CSV splits are not there (the default preprocessing writes .npz)
+s3 = boto_session.client("s3")
+for s3_path in (s3_train_path, s3_test_path):
+    try:
+        s3.head_object(Bucket=bucket, Key=s3_path.split(f"{bucket}/", 1)[1])
+    except ClientError:
+        raise SystemExit(f"⛔ {s3_path} not found: run preprocess_for_sagemaker.py with OUTPUT_FORMAT = \"csv\" "
+                         "and upload dataset_for_sagemaker/ before launching the XGBoost job")
+
 # Step 2: Get XGBoost container URI
 xgb_container = sagemaker.image_uris.retrieve("xgboost", region=region, version="1.5-1")
 
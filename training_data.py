@@ -0,0 +1,34 @@
+import glob
+import os
+
+import numpy as np
+
+# On-disk format of the SageMaker train/test channels: one-hot CSR arrays + target in a .npz,
+# either one file per split (name.npz) or partitions (name.part-00000.npz, ...) from the chunked
+# and parallel preprocessing. train_logreg.py reads both (and the old dense name.csv).
+
+
+def save_sparse(path, X, y):
+    """CSR arrays + labels in one .npz (also readable by scipy.sparse.load_npz)"""
+    X = X.tocsr()
+    np.savez_compressed(
+        path,
+        data=X.data.astype(np.float32),  # one-hot 0/1 (and hashed text weights, risk_features.py)
+        indices=X.indices.astype(np.int32),
+        indptr=X.indptr.astype(np.int64),
+        shape=np.array(X.shape),
+        format=np.array(b"csr"),
+        target=np.asarray(y, dtype=np.int8),
+    )
+
+
+def part_path(directory, name, part):
+    return os.path.join(directory, f"{name}.part-{part:05d}.npz")
+
+
+def clear_split(directory, name):
+    """Remove every previous output of a split (single file, partitions or dense CSV)"""
+    for path in [os.path.join(directory, f"{name}.npz"), os.path.join(directory, f"{name}.csv")] + \
+            glob.glob(os.path.join(directory, f"{name}.part-*.npz")):
+        if os.path.exists(path):
+            os.remove(path)